@@ -0,0 +1,401 @@
+import bisect
+import mmap
+import operator
+import struct
+import sys
+from array import array
+from itertools import groupby
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional; containers fall back to array('H') and array('Q')
+    numpy = None
+
+# Values are split into a 16-bit key (value >> 16) and a 16-bit low part.
+# Each key holds one container of low parts: a sorted array of uint16 while it
+# has at most ARRAY_LIMIT values (2 bytes each), otherwise a bitmap of
+# BITMAP_WORDS uint64 words (8 KB whatever the count). Containers are never
+# changed in place, so results share them freely and memory-mapped ones work as is.
+ARRAY_LIMIT = 4096
+BITMAP_WORDS = 1024
+MAX_VALUE = (1 << 32) - 1
+
+# File layout (little-endian): header, one directory entry per container, then
+# the containers themselves, each starting on an 8-byte boundary.
+MAGIC = b"BITMAPS1"
+HEADER = struct.Struct("<8sI4x")      # magic, container count
+ENTRY = struct.Struct("<HHIQ")        # key, kind (0 array, 1 bitmap), item count, offset
+ARRAY, BITMAP = 0, 1
+
+DIFFERENCE = lambda a, b: a & ~b      # Works on Python ints and NumPy words alike
+ARRAY_OPERATIONS = {                  # NumPy versions for two sorted arrays of unique values
+    operator.and_: lambda a, b: a[members(a, b)],
+    operator.or_: lambda a, b: numpy.sort(numpy.concatenate((a, b[~members(b, a)]))),
+    DIFFERENCE: lambda a, b: a[~members(a, b)],
+    operator.xor: lambda a, b: numpy.sort(numpy.concatenate((a[~members(a, b)], b[~members(b, a)]))),
+}
+
+
+def members(values, sorted_values):
+    """
+    Return a mask of which values are in sorted_values (both non-empty NumPy arrays).
+    A binary search per value beats numpy.intersect1d and friends on the small
+    arrays that most containers are.
+    """
+    positions = numpy.minimum(numpy.searchsorted(sorted_values, values), len(sorted_values) - 1)
+    return sorted_values[positions] == values
+
+
+def is_bitmap(container):
+    """Bitmaps hold uint64 words, arrays hold uint16 values."""
+    return container.itemsize == 8
+
+
+def to_bitmap(values):
+    """Build a bitmap container from a sorted array container."""
+    if numpy is not None:
+        bits = numpy.zeros(1 << 16, dtype=bool)
+        bits[values] = True
+        return numpy.packbits(bits, bitorder="little").view("<u8")
+    buffer = bytearray(BITMAP_WORDS * 8)
+    for value in values:
+        buffer[value >> 3] |= 1 << (value & 7)
+    return array("Q", buffer)
+
+
+def bitmap_values(bits):
+    """Return the sorted values set in a bitmap container."""
+    if numpy is not None:
+        return numpy.flatnonzero(numpy.unpackbits(bits.view(numpy.uint8), bitorder="little").view(bool)).astype("<u2")
+    return array("H", (index * 8 + bit for index, byte in enumerate(bits.tobytes()) if byte
+                       for bit in range(8) if byte >> bit & 1))
+
+
+def bitmap_count(bits):
+    """Count the values set in a bitmap container."""
+    if numpy is not None and hasattr(numpy, "bitwise_count"):  # NumPy 2.0 and later
+        return int(numpy.bitwise_count(bits).sum())
+    return int.from_bytes(bits.tobytes(), "little").bit_count()
+
+
+def normalize(container):
+    """
+    Return the container in its smallest form: None when empty, an array for
+    up to ARRAY_LIMIT values, otherwise a bitmap.
+    """
+    if is_bitmap(container):
+        count = bitmap_count(container)
+        if count == 0:
+            return None
+        return bitmap_values(container) if count <= ARRAY_LIMIT else container
+    if len(container) == 0:
+        return None
+    return to_bitmap(container) if len(container) > ARRAY_LIMIT else container
+
+
+def in_bitmap(values, bits, keep=True):
+    """Return the values of an array container that are (or with keep=False, are not) set in a bitmap."""
+    if numpy is not None:
+        found = (bits[values >> 6] >> (values & 63).astype("<u8")) & 1 == 1
+        return values[found if keep else ~found]
+    return array("H", (value for value in values if bool(bits[value >> 6] >> (value & 63) & 1) == keep))
+
+
+def combine(operation, a, b):
+    """Apply operation (and, or, xor or DIFFERENCE) to two containers; returns a container or None."""
+    if is_bitmap(a) and is_bitmap(b):
+        if numpy is not None:
+            return normalize(operation(a, b))
+        words = operation(int.from_bytes(a.tobytes(), "little"), int.from_bytes(b.tobytes(), "little"))
+        return normalize(array("Q", words.to_bytes(BITMAP_WORDS * 8, "little")))
+    if is_bitmap(a) or is_bitmap(b):
+        # An array against a bitmap only needs the array's values looked up
+        if operation is operator.and_:
+            return normalize(in_bitmap(b, a) if is_bitmap(a) else in_bitmap(a, b))
+        if operation is DIFFERENCE and is_bitmap(b):
+            return normalize(in_bitmap(a, b, keep=False))
+        return combine(operation, a if is_bitmap(a) else to_bitmap(a), b if is_bitmap(b) else to_bitmap(b))
+    if numpy is not None:
+        return normalize(ARRAY_OPERATIONS[operation](a, b))
+    operation = operator.sub if operation is DIFFERENCE else operation
+    return normalize(array("H", sorted(operation(set(a), set(b)))))
+
+
+def combine_arrays(operation, keys, lefts, rights):
+    """
+    Apply operation to many pairs of array containers at once (NumPy only).
+    Every container is widened to 32-bit values (key << 16 | low) and all pairs
+    are combined in one vectorized pass, instead of paying NumPy's per-call
+    overhead once per small container. Returns a dict of key -> container.
+    """
+    highs = numpy.array(keys, dtype=numpy.uint32) << 16
+
+    def widen(containers):
+        return numpy.repeat(highs, [len(container) for container in containers]) | numpy.concatenate(containers)
+
+    values = ARRAY_OPERATIONS[operation](widen(lefts), widen(rights))
+    if len(values) == 0:
+        return {}
+    starts = numpy.flatnonzero(numpy.diff(values >> 16)) + 1
+    keys = (values[numpy.concatenate(([0], starts))] >> 16).tolist()
+    return {key: normalize(group) for key, group in zip(keys, numpy.split((values & 0xFFFF).astype("<u2"), starts))}
+
+
+class BitmapSet:
+    """
+    A compressed set of integers from 0 to 2**32 - 1 (roaring-style bitmap) with
+    the operators of the built-in set: |, &, - and ^.
+    Dense ranges cost one bit per possible value and sparse ones 2 bytes per value.
+    """
+
+    def __init__(self, values=()):
+        self.containers = {}
+        if numpy is not None:
+            values = values if isinstance(values, numpy.ndarray) else numpy.fromiter(values, dtype=numpy.int64)
+            if len(values) == 0:
+                return
+            if values.min() < 0 or values.max() > MAX_VALUE:
+                raise ValueError(f"BitmapSet values must be between 0 and {MAX_VALUE}.")
+            # Sorting 32-bit values and dropping repeats is much faster than numpy.unique
+            values = numpy.sort(values.astype(numpy.uint32))
+            values = values[numpy.concatenate(([True], values[1:] != values[:-1]))]
+            starts = numpy.flatnonzero(numpy.diff(values >> 16)) + 1
+            for group in numpy.split(values, starts):
+                self.containers[int(group[0]) >> 16] = normalize((group & 0xFFFF).astype("<u2"))
+            return
+        values = sorted(set(values))
+        if values and (values[0] < 0 or values[-1] > MAX_VALUE):
+            raise ValueError(f"BitmapSet values must be between 0 and {MAX_VALUE}.")
+        for key, group in groupby(values, lambda value: value >> 16):
+            self.containers[key] = normalize(array("H", (value & 0xFFFF for value in group)))
+
+    @classmethod
+    def from_containers(cls, containers):
+        """Wrap a dict of key -> container without copying it."""
+        result = cls()
+        result.containers = containers
+        return result
+
+    def add(self, value):
+        """Add one value."""
+        if not 0 <= value <= MAX_VALUE:
+            raise ValueError(f"BitmapSet values must be between 0 and {MAX_VALUE}.")
+        key, low = value >> 16, value & 0xFFFF
+        container = self.containers.get(key)
+        if container is None:
+            self.containers[key] = numpy.array([low], dtype="<u2") if numpy is not None else array("H", [low])
+        elif is_bitmap(container):
+            if not int(container[low >> 6]) >> (low & 63) & 1:
+                bits = container.copy() if numpy is not None else array("Q", container)
+                bits[low >> 6] = int(bits[low >> 6]) | 1 << (low & 63)
+                self.containers[key] = bits
+        else:
+            position = bisect.bisect_left(container, low)
+            if position == len(container) or container[position] != low:
+                if numpy is not None:
+                    container = numpy.insert(container, position, low)
+                else:
+                    container = array("H", container)
+                    container.insert(position, low)
+                self.containers[key] = normalize(container)
+
+    def discard(self, value):
+        """Remove one value if it is present."""
+        key, low = value >> 16, value & 0xFFFF
+        container = self.containers.get(key) if 0 <= value <= MAX_VALUE else None
+        if container is None or value not in self:
+            return
+        if is_bitmap(container):
+            container = container.copy() if numpy is not None else array("Q", container)
+            container[low >> 6] = int(container[low >> 6]) & ~(1 << (low & 63))
+        elif numpy is not None:
+            container = numpy.delete(container, bisect.bisect_left(container, low))
+        else:
+            container = array("H", container)
+            del container[bisect.bisect_left(container, low)]
+        container = normalize(container)
+        if container is None:
+            del self.containers[key]
+        else:
+            self.containers[key] = container
+
+    def __contains__(self, value):
+        try:
+            value = operator.index(value)  # Accepts NumPy integers as well as int
+        except TypeError:
+            return False
+        if not 0 <= value <= MAX_VALUE:
+            return False
+        container = self.containers.get(value >> 16)
+        if container is None:
+            return False
+        low = value & 0xFFFF
+        if is_bitmap(container):
+            return bool(int(container[low >> 6]) >> (low & 63) & 1)
+        position = bisect.bisect_left(container, low)
+        return position < len(container) and container[position] == low
+
+    def __len__(self):
+        return sum(bitmap_count(container) if is_bitmap(container) else len(container)
+                   for container in self.containers.values())
+
+    def __bool__(self):
+        return bool(self.containers)
+
+    def __iter__(self):
+        for key in sorted(self.containers):
+            container = self.containers[key]
+            values = bitmap_values(container) if is_bitmap(container) else container
+            if numpy is not None:
+                yield from (values.astype(numpy.int64) + (key << 16)).tolist()
+            else:
+                yield from (key << 16 | value for value in values)
+
+    def __eq__(self, other):
+        if not isinstance(other, BitmapSet):
+            return NotImplemented
+        return (self.containers.keys() == other.containers.keys() and
+                all(container.tobytes() == other.containers[key].tobytes()
+                    for key, container in self.containers.items()))
+
+    __hash__ = None
+
+    def __repr__(self):
+        values = []
+        for value in self:
+            if len(values) == 10:
+                values.append("...")
+                break
+            values.append(str(value))
+        return f"BitmapSet({{{', '.join(values)}}})" if values else "BitmapSet()"
+
+    def combine(self, other, operation):
+        """Apply operation key by key; keys missing on one side reuse the other side's container."""
+        if isinstance(other, (set, frozenset)):
+            other = BitmapSet(other)
+        if not isinstance(other, BitmapSet):
+            return NotImplemented
+        mine, theirs = self.containers, other.containers
+        if operation is operator.and_:
+            keys = mine.keys() & theirs.keys()
+        elif operation is DIFFERENCE:
+            keys = mine.keys()
+        else:
+            keys = mine.keys() | theirs.keys()
+        containers, pairs = {}, []
+        for key in sorted(keys):
+            a, b = mine.get(key), theirs.get(key)
+            if a is None or b is None:
+                container = a if b is None else b
+            elif numpy is not None and not is_bitmap(a) and not is_bitmap(b):
+                pairs.append(key)  # Combined together below
+                continue
+            else:
+                container = combine(operation, a, b)
+            if container is not None:
+                containers[key] = container
+        if pairs:
+            containers.update(combine_arrays(operation, pairs, [mine[key] for key in pairs],
+                                             [theirs[key] for key in pairs]))
+        return BitmapSet.from_containers(containers)
+
+    def __or__(self, other):
+        return self.combine(other, operator.or_)
+
+    def __and__(self, other):
+        return self.combine(other, operator.and_)
+
+    def __sub__(self, other):
+        return self.combine(other, DIFFERENCE)
+
+    def __xor__(self, other):
+        return self.combine(other, operator.xor)
+
+    __ror__, __rand__, __rxor__ = __or__, __and__, __xor__
+
+    def __rsub__(self, other):
+        if isinstance(other, (set, frozenset)):
+            return BitmapSet(other) - self
+        return NotImplemented
+
+    def combine_all(self, others, operation):
+        """Apply operation with each of others in turn; like set's methods, any iterable of ints is accepted."""
+        result = BitmapSet.from_containers(dict(self.containers))
+        for other in others:
+            result = result.combine(other if isinstance(other, BitmapSet) else BitmapSet(other), operation)
+        return result
+
+    def union(self, *others):
+        """Return the values in this set or in any of others."""
+        return self.combine_all(others, operator.or_)
+
+    def intersection(self, *others):
+        """Return the values in this set and in all of others."""
+        return self.combine_all(others, operator.and_)
+
+    def difference(self, *others):
+        """Return the values in this set that are in none of others."""
+        return self.combine_all(others, DIFFERENCE)
+
+    def symmetric_difference(self, other):
+        """Return the values in exactly one of this set and other."""
+        return self.combine_all((other,), operator.xor)
+
+    def nbytes(self):
+        """Return the bytes held by the containers."""
+        return sum(len(container) * container.itemsize for container in self.containers.values())
+
+    def save(self, path):
+        """Write the set to a file that load() can memory-map. Returns the file size in bytes."""
+        offset = HEADER.size + ENTRY.size * len(self.containers)
+        entries, containers = [], []
+        for key in sorted(self.containers):
+            container = self.containers[key]
+            entries.append(ENTRY.pack(key, BITMAP if is_bitmap(container) else ARRAY, len(container), offset))
+            containers.append(container)
+            offset += -(-len(container) * container.itemsize // 8) * 8
+        with open(path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, len(entries)))
+            file.write(b"".join(entries))
+            for container in containers:
+                size = len(container) * container.itemsize
+                file.write(container)
+                file.write(b"\0" * (-size % 8))
+        return offset
+
+    @classmethod
+    def load(cls, path):
+        """
+        Memory-map a file written by save() without reading the containers.
+        Each container is a read-only view into the file, so the OS only reads
+        the pages that a lookup or set operation actually touches.
+        Raises ValueError if the file is not a saved BitmapSet.
+        """
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(mapped) < HEADER.size or mapped[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a saved BitmapSet.")
+        count = HEADER.unpack_from(mapped)[1]
+        containers = {}
+        for key, kind, items, offset in ENTRY.iter_unpack(mapped[HEADER.size:HEADER.size + ENTRY.size * count]):
+            if numpy is not None:
+                containers[key] = numpy.frombuffer(mapped, "<u8" if kind == BITMAP else "<u2", items, offset)
+            else:
+                size = items * (8 if kind == BITMAP else 2)
+                containers[key] = memoryview(mapped)[offset:offset + size].cast("Q" if kind == BITMAP else "H")
+        return cls.from_containers(containers)
+
+
+if __name__ == "__main__":
+    # python bitmap_set.py 8 16 24 32 44 -- 7 14 8 32 21   (the set_operations.py example by default)
+    args = sys.argv[1:]
+    if "--" in args:
+        set1 = BitmapSet(int(arg) for arg in args[:args.index("--")])
+        set2 = BitmapSet(int(arg) for arg in args[args.index("--") + 1:])
+    else:
+        set1, set2 = BitmapSet({8, 16, 24, 32, 44}), BitmapSet({7, 14, 8, 32, 21})
+    print("set1 - set2 : ", set1 - set2)
+    print("set2 - set1 : ", set2 - set1)
+    print("set1 | set2 : ", set1 | set2)
+    print("set1 ^ set2 : ", set1 ^ set2)
+    print("set1 & set2 : ", set1 & set2)
@@ -0,0 +1,124 @@
+"""Benchmarks for the Exercise Set 03 scripts.
+
+Run a single benchmark by name, e.g. `python exercise3_benchmarks.py vowels`.
+"""
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+
+import bitmap_set
+import vowels_list
+
+
+def timed(function, *args, repeat=3):
+    """Returns the best wall-clock time in seconds over `repeat` calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def traced_bytes(function):
+    """Returns what `function` returns and the bytes it left allocated."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = function()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def random_ids(count, universe):
+    """Returns `count` distinct random IDs below `universe` as a NumPy array, or an array('Q') without NumPy."""
+    if bitmap_set.numpy is not None:
+        return bitmap_set.numpy.random.default_rng().choice(universe, count, replace=False)
+    return array("Q", random.sample(range(universe), count))
+
+
+def write_text(path, size_mb, block=1 << 20):
+    """Writes about `size_mb` MB of random printable text, repeating one block to keep generation fast."""
+    text = "".join(random.choice(string.ascii_letters + string.digits + " .,;\n") for _ in range(block)).encode()
+    with open(path, "wb") as file:
+        for _ in range(size_mb * (1 << 20) // block):
+            file.write(text)
+
+
+def bench_vowels(size_mb=512, sample=2 * 10 ** 6):
+    """Reports MB/s for the list comprehension, the chunked translate/count scan and the process pool."""
+    handle, path = tempfile.mkstemp(suffix=".txt")
+    os.close(handle)
+    write_text(path, size_mb)
+    megabytes = os.path.getsize(path) / 2 ** 20
+    print(f"Character classes ({megabytes:.0f} MB file, {os.cpu_count()} CPU(s))")
+
+    with open(path, encoding="ascii") as file:
+        text = file.read(sample)
+    seconds = timed(vowels_list.find_vowels, text, repeat=1)
+    print(f"  find_vowels list comprehension {sample / 2 ** 20 / seconds:10.1f} MB/s")
+    seconds = timed(vowels_list.analyze_file, path, repeat=1)
+    print(f"  chunked translate/count        {megabytes / seconds:10.1f} MB/s")
+    for processes in sorted({1, 4, os.cpu_count()}):
+        if processes > 1:
+            seconds = timed(vowels_list.analyze_file, path, processes, repeat=1)
+            print(f"  process pool, {processes:>2} processes    {megabytes / seconds:10.1f} MB/s")
+    os.remove(path)
+
+
+def bench_bitmap(cases=((10 ** 7, 5 * 10 ** 7), (10 ** 6, 2 ** 32))):
+    """Compares memory and |, &, -, ^ speed of BitmapSet with the built-in set, plus save and mmap load."""
+    for count, universe in cases:
+        first, second = random_ids(count, universe), random_ids(count, universe)
+        print(f"Integer sets ({count} IDs each out of {universe}, "
+              f"{'NumPy' if bitmap_set.numpy is not None else 'array'} containers)")
+        # The set's int objects are created inside the traced call, so they are counted too
+        builtin, builtin_bytes = traced_bytes(lambda: set(first.tolist()))
+        bitmap, bitmap_bytes = traced_bytes(lambda: bitmap_set.BitmapSet(first))
+        print(f"  memory, set                    {builtin_bytes / count:8.1f} bytes/ID")
+        print(f"  memory, BitmapSet              {bitmap_bytes / count:8.1f} bytes/ID "
+              f"({len(bitmap.containers)} containers)")
+        seconds = timed(lambda: bitmap_set.BitmapSet(first), repeat=1)
+        print(f"  build BitmapSet                {count / seconds:12.0f} IDs/s")
+
+        other_builtin = set(second.tolist())
+        other_bitmap = bitmap_set.BitmapSet(second)
+        for symbol, operation in (("|", "__or__"), ("&", "__and__"), ("-", "__sub__"), ("^", "__xor__")):
+            builtin_seconds = timed(lambda: getattr(builtin, operation)(other_builtin), repeat=1)
+            bitmap_seconds = timed(lambda: getattr(bitmap, operation)(other_bitmap))
+            print(f"  {symbol}  set {builtin_seconds * 1000:9.1f} ms   BitmapSet {bitmap_seconds * 1000:9.1f} ms")
+        del builtin, other_builtin
+
+        handle, path = tempfile.mkstemp(suffix=".bitmap")
+        os.close(handle)
+        seconds = timed(bitmap.save, path, repeat=1)
+        print(f"  save                           {seconds * 1000:9.1f} ms ({os.path.getsize(path) / 2 ** 20:.1f} MB)")
+        seconds = timed(bitmap_set.BitmapSet.load, path)
+        print(f"  load (mmap)                    {seconds * 1000:9.1f} ms")
+        loaded = bitmap_set.BitmapSet.load(path)
+        seconds = timed(lambda: loaded & other_bitmap, repeat=1)
+        print(f"  &  on the loaded set (cold)    {seconds * 1000:9.1f} ms")
+        del loaded
+        os.remove(path)
+        print()
+
+
+BENCHMARKS = {
+    "vowels": bench_vowels,
+    "bitmap": bench_bitmap,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark '{name}'. Choose from: {', '.join(BENCHMARKS)}")
+            continue
+        BENCHMARKS[name]()
+        print()
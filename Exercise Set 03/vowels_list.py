@@ -1,8 +1,128 @@
+import os
+import string
+import sys
+from multiprocessing import Pool
+
+VOWELS = "aeiouAEIOU"
+CHUNK_SIZE = 1 << 22  # Bytes read at a time (4 MB)
+
+# Every byte is translated to the code of its class, so each class is counted
+# with one bytes.count instead of a Python-level loop over the characters.
+# The five vowels get a code each; bytes outside ASCII count as "other".
+CLASSES = ("a", "e", "i", "o", "u", "consonants", "digits", "whitespace", "punctuation", "other")
+
+
+def build_class_table():
+    """Build the 256-byte translation table from each byte to its class code."""
+    table = bytearray([CLASSES.index("other")]) * 256
+    for char in string.ascii_letters:
+        table[ord(char)] = CLASSES.index(char.lower()) if char in VOWELS else CLASSES.index("consonants")
+    for chars, name in ((string.digits, "digits"), (string.whitespace, "whitespace"),
+                        (string.punctuation, "punctuation")):
+        for char in chars:
+            table[ord(char)] = CLASSES.index(name)
+    return bytes(table)
+
+
+CLASS_TABLE = build_class_table()
+
+
 def find_vowels(input_string):
     vowels = "aeiouAEIOU"
     result = [char for char in input_string if char in vowels]
     return result
 
-input_string = input("Enter a string: ")
-vowel_list = find_vowels(input_string)
-print("Vowels in the string:", vowel_list)
+
+def count_block(data):
+    """
+    Count the character classes in a bytes or bytearray block.
+    Returns a dict with a count per class, plus "vowels" and "bytes" totals.
+    """
+    codes = data.translate(CLASS_TABLE)
+    # Consonants are whatever is left, which saves one full pass over the block
+    counts = {name: codes.count(code) for code, name in enumerate(CLASSES) if name != "consonants"}
+    counts["consonants"] = len(data) - sum(counts.values())
+    counts["vowels"] = sum(counts[vowel] for vowel in "aeiou")
+    counts["bytes"] = len(data)
+    return counts
+
+
+def merge_counts(total, counts):
+    """Add one block's counts into a running total and return it."""
+    for name, count in counts.items():
+        total[name] = total.get(name, 0) + count
+    return total
+
+
+def analyze_stream(stream, chunk_size=CHUNK_SIZE):
+    """
+    Count the character classes in a binary stream of any size.
+    Chunks are read with readinto through a memoryview into one reused buffer,
+    so only chunk_size bytes are held in memory at a time.
+    """
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    total = {}
+    while True:
+        size = stream.readinto(view)
+        if not size:
+            break
+        merge_counts(total, count_block(buffer if size == chunk_size else buffer[:size]))
+    return total or count_block(b"")
+
+
+def count_range(job):
+    """Count the character classes in bytes [offset, offset + length) of a file (runs in a worker process)."""
+    path, offset, length, chunk_size = job
+    with open(path, "rb") as file:
+        file.seek(offset)
+        total = {}
+        buffer = bytearray(min(chunk_size, length))
+        view = memoryview(buffer)
+        while length > 0:
+            size = file.readinto(view[:min(len(buffer), length)])
+            if not size:
+                break
+            merge_counts(total, count_block(buffer if size == len(buffer) else buffer[:size]))
+            length -= size
+    return total
+
+
+def analyze_file(path, processes=0, chunk_size=CHUNK_SIZE):
+    """
+    Count the character classes in a file. With processes > 1 the file is split
+    into ranges that a process pool counts independently; only the small count
+    dicts come back and are merged.
+    """
+    if processes <= 1:
+        with open(path, "rb") as file:
+            return analyze_stream(file, chunk_size)
+    size = os.path.getsize(path)
+    # A few ranges per process so an uneven split still keeps every process busy
+    step = max(chunk_size, -(-size // (processes * 4)))
+    jobs = [(path, offset, min(step, size - offset), chunk_size) for offset in range(0, size, step)]
+    total = {}
+    with Pool(processes) as pool:
+        for counts in pool.imap_unordered(count_range, jobs):
+            merge_counts(total, counts)
+    return total or count_block(b"")
+
+
+def format_counts(counts):
+    """Format the counts as one line per class."""
+    lines = [f"Bytes: {counts['bytes']}", f"Vowels: {counts['vowels']} "
+             f"({', '.join(f'{vowel}: {counts[vowel]}' for vowel in 'aeiou')})"]
+    for name in CLASSES[5:]:
+        lines.append(f"{name.capitalize()}: {counts[name]}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # python vowels_list.py big.txt [processes]
+        processes = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+        print(format_counts(analyze_file(sys.argv[1], processes)))
+    else:
+        input_string = input("Enter a string: ")
+        vowel_list = find_vowels(input_string)
+        print("Vowels in the string:", vowel_list)
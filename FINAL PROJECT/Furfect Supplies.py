@@ -1,19 +1,1102 @@
+import csv
+import json
+import math
+import operator
+import os
+import queue
+import re
+import shutil
 import sqlite3
-from datetime import datetime
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from contextlib import ExitStack, closing, contextmanager
+from datetime import datetime, timedelta
+from urllib.parse import quote
+
+from analytics import SalesAnalytics
+from metrics import InstrumentedConnection, Metrics
+from pricing import PricingEngine
+
+numpy = False  # Not imported yet; see load_numpy
+
+
+def load_numpy():
+    """Imports NumPy on first use and returns it, or None if it is not installed.
+
+    NumPy is optional (ProductTable falls back to the array module) and slow to
+    import, so it is only loaded once catalogue analytics actually need it.
+    """
+    global numpy
+    if numpy is False:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+    return numpy
+
+
+class CheckoutError(Exception):
+    """Raised when a cart cannot be checked out (unknown product or not enough stock)."""
+
+
+def continue_paging():
+    """Asks whether to show the next page of results."""
+    answer = input("\n\t\t\t\tPress Enter for more, or 'q' to stop: ").strip().lower()
+    return answer != 'q'
+
+
+PRODUCT_FIELDS = ("name", "category", "price", "stock", "reorder_level")
+SALE_FIELDS = ("id", "product", "quantity", "total_price", "sale_date")
+MAX_INTEGER = 2 ** 63 - 1  # Largest value a SQLite INTEGER column can hold
+
+
+def line_totals(pricing, lines, products):
+    """Returns the amount charged for each (product_id, name, quantity, price) line.
+
+    Without a pricing engine every line is charged quantity * price;
+    otherwise the engine prices the cart, looking up each line's category
+    in `products` ({product_id: product row}).
+    """
+    if pricing is None:
+        return [quantity * price for _, _, quantity, price in lines]
+    _, totals, _ = pricing.price_cart([(product_id, products[product_id][2], quantity, price)
+                                      for product_id, _, quantity, price in lines])
+    return totals
+
+
+def read_records(path):
+    """Yields (line number, record) pairs from a CSV or JSONL file, one at a time.
+
+    CSV records come back as dicts; JSONL records come back as the raw line
+    so that a malformed line is reported by validate_product like any other bad row.
+    """
+    with open(path, newline="", encoding="utf-8") as file:
+        if path.lower().endswith(".jsonl"):
+            for line_number, line in enumerate(file, 1):
+                if line.strip():
+                    yield line_number, line
+        else:
+            reader = csv.DictReader(file)
+            for record in reader:
+                yield reader.line_num, record
+
+
+def validate_product(record):
+    """Converts an imported record into a products row, raising ValueError if it is invalid."""
+    if isinstance(record, str):
+        record = json.loads(record)
+    if not isinstance(record, dict):
+        raise ValueError("record is not an object")
+    missing = [field for field in PRODUCT_FIELDS if record.get(field) in (None, "")]
+    if missing:
+        raise ValueError(f"missing {', '.join(missing)}")
+    name = str(record["name"]).strip()
+    category = str(record["category"]).strip()
+    price = float(record["price"])
+    stock = int(record["stock"])
+    reorder_level = int(record["reorder_level"])
+    if not math.isfinite(price):
+        raise ValueError("price must be a finite number")
+    if price < 0 or stock < 0 or reorder_level < 0:
+        raise ValueError("price, stock and reorder_level cannot be negative")
+    if stock > MAX_INTEGER or reorder_level > MAX_INTEGER:
+        raise ValueError(f"stock and reorder_level cannot be more than {MAX_INTEGER}")
+    return name, category, price, stock, reorder_level
+
+
+class ProductCache:
+    """LRU cache of product rows keyed by product ID.
+
+    Rows are (id, name, category, price, stock, reorder_level) tuples. The
+    managers write through it on every change, so repeated lookups of the
+    same products never go back to SQLite. A max_size of 0 disables caching.
+    The cache is safe to share between threads: every write-through bumps a
+    counter, and a row read through on a miss is only stored if no write
+    happened while it was being read, so a stale read can never overwrite a
+    newer row. Writers put rows after they commit.
+    """
+
+    def __init__(self, db, max_size=10000):
+        # Keep the Database so misses can be read through from SQLite
+        self.db = db
+        self.max_size = max_size
+        self.rows = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.writes = 0  # Bumped by every put and invalidate
+
+    def get(self, product_id):
+        """Returns the product row for an ID, or None if there is no such product."""
+        with self.lock:
+            row = self.rows.get(product_id)
+            if row is not None:
+                self.rows.move_to_end(product_id)
+                self.hits += 1
+                return row
+            self.misses += 1
+            since = self.writes
+        cursor = self.db.conn.cursor()
+        cursor.execute("""
+            SELECT id, name, category, price, stock, reorder_level
+            FROM products WHERE id = ?
+        """, (product_id,))
+        row = cursor.fetchone()
+        if row is not None:
+            self.fill([row], since)
+        return row
+
+    def get_many(self, product_ids):
+        """Returns a dict of ID to product row, reading every miss with one query."""
+        found, missing = {}, []
+        with self.lock:
+            for product_id in product_ids:
+                row = self.rows.get(product_id)
+                if row is not None:
+                    self.rows.move_to_end(product_id)
+                    found[product_id] = row
+                else:
+                    missing.append(product_id)
+            self.hits += len(found)
+            self.misses += len(missing)
+            since = self.writes
+        if missing:
+            placeholders = ", ".join("?" * len(missing))
+            cursor = self.db.conn.cursor()
+            cursor.execute(f"""
+                SELECT id, name, category, price, stock, reorder_level
+                FROM products WHERE id IN ({placeholders})
+            """, missing)
+            rows = cursor.fetchall()
+            for row in rows:
+                found[row[0]] = row
+            self.fill(rows, since)
+        return found
+
+    def put(self, row):
+        """Stores or replaces a product row, evicting the least recently used one if full."""
+        with self.lock:
+            self.writes += 1
+            self.store(row)
+
+    def fill(self, rows, since):
+        """Stores rows read through on a miss, unless a write happened since `since` made them possibly stale."""
+        with self.lock:
+            if self.writes == since:
+                for row in rows:
+                    self.store(row)
+
+    def store(self, row):
+        # Callers hold self.lock
+        if self.max_size <= 0:
+            return
+        self.rows[row[0]] = row
+        self.rows.move_to_end(row[0])
+        if len(self.rows) > self.max_size:
+            self.rows.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, product_id):
+        """Drops a product from the cache."""
+        with self.lock:
+            self.writes += 1
+            self.rows.pop(product_id, None)
+
+    def clear(self):
+        """Drops every cached product."""
+        with self.lock:
+            self.rows.clear()
+
+    def stats(self):
+        """Returns the cache counters as a dict."""
+        with self.lock:
+            return {"size": len(self.rows), "max_size": self.max_size, "hits": self.hits,
+                    "misses": self.misses, "evictions": self.evictions}
+
+
+class ReorderEngine:
+    """Keeps an urgency-ordered watch list of products at or below their reorder level.
+
+    The low-stock set itself is indexed in SQLite by a partial index on
+    products (stock <= reorder_level), so loading it never scans the whole
+    catalogue. In memory the watched products are kept in a list sorted by
+    urgency (days of stock left at the recent sales velocity), so the top-N
+    most urgent SKUs are a slice and each update is a bisect. The managers
+    call update() and discard() whenever stock changes or a product is removed.
+    """
+
+    def __init__(self, db, window_days=28, cover_days=14):
+        # Sales velocity is measured over the last window_days; suggested
+        # quantities aim to cover cover_days of demand above the reorder level
+        self.db = db
+        self.window_days = window_days
+        self.cover_days = cover_days
+        self.lock = threading.RLock()
+        self.loaded = False
+        self.day = None       # date the velocity window ends on
+        self.rows = {}        # product ID -> (id, name, category, price, stock, reorder_level)
+        self.velocity = {}    # product ID -> units sold per day over the window
+        self.keys = {}        # product ID -> its current key in self.ranking
+        self.ranking = []     # sorted (days of cover, stock - reorder_level, product ID)
+
+    def load(self):
+        """Reads the low-stock set and recent sales velocity from SQLite."""
+        with self.lock:
+            cursor = self.db.conn.cursor()
+            cursor.execute("""
+                SELECT id, name, category, price, stock, reorder_level
+                FROM products INDEXED BY idx_products_low_stock
+                WHERE stock <= reorder_level
+            """)
+            self.rows = {row[0]: row for row in cursor.fetchall()}
+            self.day = datetime.now().date()
+            cursor.execute("""
+                SELECT d.product_id, SUM(d.quantity)
+                FROM sales_daily d
+                JOIN products p ON d.product_id = p.id
+                WHERE d.day >= ? AND p.stock <= p.reorder_level
+                GROUP BY d.product_id
+            """, (self.window_start(),))
+            self.velocity = {product_id: sold / self.window_days for product_id, sold in cursor.fetchall()}
+            self.keys = {product_id: self.urgency(row) for product_id, row in self.rows.items()}
+            self.ranking = sorted(self.keys.values())
+            self.loaded = True
+
+    def window_start(self):
+        """First day of the velocity window: the last window_days days, today included."""
+        return (self.day - timedelta(days=self.window_days - 1)).isoformat()
+
+    def current(self):
+        """Loads the watch list if needed, and reloads it once the date changes so old sales age out."""
+        if not self.loaded or self.day != datetime.now().date():
+            self.load()
+
+    def recent_velocity(self, product_id):
+        """Reads one product's units sold per day over the window from sales_daily."""
+        cursor = self.db.conn.cursor()
+        cursor.execute("SELECT COALESCE(SUM(quantity), 0) FROM sales_daily WHERE product_id = ? AND day >= ?",
+                       (product_id, self.window_start()))
+        return cursor.fetchone()[0] / self.window_days
+
+    def reset(self):
+        """Forgets the watch list so it is reloaded on next use (e.g. after a bulk import)."""
+        with self.lock:
+            self.loaded = False
+            self.rows, self.velocity, self.keys, self.ranking = {}, {}, {}, []
+
+    def urgency(self, row):
+        """Sort key for a product row: fewest days of cover first, then furthest below its reorder level.
+
+        Products that are out of stock have no days of cover left at all.
+        """
+        product_id, _, _, _, stock, reorder_level = row
+        velocity = self.velocity.get(product_id, 0)
+        if stock <= 0:
+            days_left = 0.0
+        else:
+            days_left = stock / velocity if velocity else math.inf
+        return days_left, stock - reorder_level, product_id
+
+    def suggested_quantity(self, row):
+        """Units to order so stock covers cover_days of demand on top of the reorder level."""
+        product_id, _, _, _, stock, reorder_level = row
+        demand = math.ceil(self.velocity.get(product_id, 0) * self.cover_days)
+        return max(demand, reorder_level) + reorder_level - stock
+
+    def update(self, row, sold=0):
+        """Re-ranks a product after its stock changed, recording `sold` units toward its velocity.
+
+        A product joining the watch list has its velocity read from
+        sales_daily. In journal mode the sale is not in SQLite yet, so `sold`
+        is added on top.
+        """
+        with self.lock:
+            if not self.loaded:
+                return
+            if self.day != datetime.now().date():
+                self.load()
+                if self.db.journal is None:
+                    sold = 0  # Already in sales_daily, so the reload counted it
+            product_id, _, _, _, stock, reorder_level = row
+            if product_id in self.keys:
+                if sold:
+                    self.velocity[product_id] = self.velocity.get(product_id, 0) + sold / self.window_days
+            elif stock <= reorder_level:
+                pending = sold if self.db.journal is not None else 0
+                self.velocity[product_id] = self.recent_velocity(product_id) + pending / self.window_days
+            self._remove(product_id)
+            if stock <= reorder_level:
+                self.rows[product_id] = row
+                self.keys[product_id] = key = self.urgency(row)
+                insort(self.ranking, key)
+            else:
+                self.velocity.pop(product_id, None)
+
+    def discard(self, product_id):
+        """Stops watching a product (e.g. because it was removed)."""
+        with self.lock:
+            self._remove(product_id)
+            self.velocity.pop(product_id, None)
+
+    def _remove(self, product_id):
+        key = self.keys.pop(product_id, None)
+        if key is not None:
+            del self.ranking[bisect_left(self.ranking, key)]
+            del self.rows[product_id]
+
+    def most_urgent(self, count=10):
+        """Returns up to `count` (product row, days of cover, suggested quantity) tuples, most urgent first."""
+        with self.lock:
+            self.current()
+            return [(self.rows[product_id], days_left, self.suggested_quantity(self.rows[product_id]))
+                    for days_left, _, product_id in self.ranking[:count]]
+
+    def __len__(self):
+        with self.lock:
+            self.current()
+            return len(self.ranking)
+
+
+class SalesJournal:
+    """Append-only write-ahead log of completed sales with background group commit.
+
+    In journal mode a checkout reserves stock in memory and appends one JSON
+    line to the log instead of paying for its own SQLite commit. A background
+    thread fsyncs the log and applies all pending sales to the products and
+    sales tables in one transaction, every `interval` seconds or as soon as
+    `batch_size` sales are waiting. Every record carries a sequence number and
+    the last one applied is saved in journal_state in the same transaction,
+    so replaying the log on start-up after a crash never applies a sale twice.
+    """
+
+    def __init__(self, db, path, interval=0.2, batch_size=1000):
+        self.db = db
+        self.path = path
+        self.interval = interval
+        self.batch_size = batch_size
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.stopping = False
+        self.pending = []           # Records appended to the log but not yet applied
+        self.pending_segments = []  # Rotated log files whose records are not yet applied
+        self.unrotated = 0          # Records appended to the live log since it was last rotated
+        self.segment_number = 0     # Numbers rotated segments so a retried batch never reuses a name
+        self.reserved = {}          # Product ID -> units sold but not yet applied
+        self.oldest = None          # When the oldest not-yet-durable record was appended
+        self.max_lag = 0.0          # Longest a sale has waited to be fsynced, i.e. the data-loss window
+        # The writer gets its own connection so the tills never see half-applied batches
+        self.conn = db.connect(timeout=5, check_same_thread=False)
+        if not db.schema_ready:
+            db.initialize_database(self.conn)  # Replaying needs the tables to exist
+        self.seq = self.recover()
+        self.file = open(path, "a", encoding="utf-8")
+        self.thread = threading.Thread(target=self.run, name="sales-journal", daemon=True)
+        self.thread.start()
+
+    def segment_files(self):
+        """Lists rotated log segments left on disk, oldest first."""
+        folder = os.path.dirname(os.path.abspath(self.path))
+        prefix = os.path.basename(self.path) + "."
+        names = [name for name in os.listdir(folder) if name.startswith(prefix) and name[len(prefix):].isdigit()]
+        return [os.path.join(folder, name) for name in sorted(names, key=lambda name: int(name[len(prefix):]))]
+
+    def recover(self):
+        """Replays any sales a crash left in the log and returns the last sequence number used."""
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT last_seq FROM journal_state WHERE id = 1")
+        row = cursor.fetchone()
+        last_seq = row[0] if row else 0
+
+        files = self.segment_files() + ([self.path] if os.path.exists(self.path) else [])
+        records = []
+        for path in files:
+            with open(path, encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # A torn final write from the crash
+                    if record["seq"] > last_seq:
+                        records.append(record)
+        if records:
+            self.apply(records)
+            self.conn.commit()
+        for path in files:
+            os.remove(path)
+        return max([last_seq] + [record["seq"] for record in records])
+
+    def record(self, quantities, pricing=None):
+        """Reserves stock for a cart and appends it to the log.
+
+        Returns (lines, totals, rows), where lines are (product_id, name,
+        quantity, price) tuples, totals are the amounts charged per line
+        under `pricing`, and rows are the product rows with the reserved
+        stock taken off. Raises CheckoutError if any line cannot be filled.
+        """
+        with self.lock:
+            products = self.db.product_cache.get_many(quantities)
+            lines, rows = [], []
+            for product_id, quantity in quantities.items():
+                row = products.get(product_id)
+                if row is None:
+                    raise CheckoutError(f"Invalid product ID {product_id}.")
+                available = row[4] - self.reserved.get(product_id, 0)
+                if quantity > available:
+                    raise CheckoutError(f"Insufficient stock for '{row[1]}'.")
+                lines.append((product_id, row[1], quantity, row[3]))
+                rows.append(row[:4] + (available - quantity, row[5]))
+            totals = line_totals(pricing, lines, products)
+            for product_id, quantity in quantities.items():
+                self.reserved[product_id] = self.reserved.get(product_id, 0) + quantity
+
+            self.seq += 1
+            record = {"seq": self.seq, "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                      "lines": [[product_id, quantity, total] for (product_id, _, quantity, _), total in zip(lines, totals)]}
+            self.file.write(json.dumps(record) + "\n")
+            self.file.flush()
+            self.unrotated += 1
+            self.pending.append(record)
+            if self.oldest is None:
+                self.oldest = time.perf_counter()
+            if len(self.pending) >= self.batch_size:
+                self.wakeup.set()
+        return lines, totals, rows
+
+    def apply(self, records):
+        """Writes records to products and sales (without committing) and returns units sold per product."""
+        sold, sales = {}, []
+        for record in records:
+            for product_id, quantity, total_price in record["lines"]:
+                sold[product_id] = sold.get(product_id, 0) + quantity
+                sales.append((product_id, quantity, total_price, record["date"]))
+        cursor = self.conn.cursor()
+        cursor.executemany("UPDATE products SET stock = stock - ? WHERE id = ?",
+                           [(quantity, product_id) for product_id, quantity in sold.items()])
+        cursor.executemany("""
+            INSERT INTO sales (product_id, quantity, total_price, sale_date)
+            VALUES (?, ?, ?, ?)
+        """, sales)
+        cursor.execute("""
+            INSERT INTO journal_state (id, last_seq) VALUES (1, ?)
+            ON CONFLICT (id) DO UPDATE SET last_seq = excluded.last_seq
+        """, (records[-1]["seq"],))
+        return sold
+
+    def flush(self):
+        """Group-commits every pending sale and returns how many were applied."""
+        with self.lock:
+            if not self.pending:
+                return 0
+            records, self.pending = self.pending, []
+            segments, self.pending_segments = self.pending_segments, []
+            segment = None
+            if self.unrotated:
+                # Rotate the log so new sales keep appending while this batch is applied
+                self.file.close()
+                self.segment_number += 1
+                segment = f"{self.path}.{self.segment_number}"
+                os.replace(self.path, segment)
+                self.file = open(self.path, "a", encoding="utf-8")
+                self.unrotated = 0
+                segments.append(segment)
+            oldest, self.oldest = self.oldest, None
+
+        if segment is not None:
+            descriptor = os.open(segment, os.O_RDONLY)
+            try:
+                os.fsync(descriptor)
+            finally:
+                os.close(descriptor)
+        if oldest is not None:
+            self.max_lag = max(self.max_lag, time.perf_counter() - oldest)
+
+        try:
+            sold = self.apply(records)
+            with self.lock:
+                self.conn.commit()
+                # Stock is now in SQLite, so release the reservations and drop stale cached rows
+                for product_id, quantity in sold.items():
+                    self.reserved[product_id] -= quantity
+                    if not self.reserved[product_id]:
+                        del self.reserved[product_id]
+                    self.db.product_cache.invalidate(product_id)
+            self.db.sales_analytics.invalidate()
+        except sqlite3.Error:
+            self.conn.rollback()
+            # Keep the batch queued and try again on the next round
+            with self.lock:
+                self.pending[:0] = records
+                self.pending_segments[:0] = segments
+            raise
+        for path in dict.fromkeys(segments):
+            os.remove(path)
+        return len(records)
+
+    def run(self):
+        """Background loop that group-commits on the interval or when a batch fills up."""
+        while not self.stopping:
+            self.wakeup.wait(self.interval)
+            self.wakeup.clear()
+            try:
+                self.flush()
+            except (sqlite3.Error, OSError) as error:
+                # The batch stays queued for the next round; the thread must keep running
+                print(f"Sales journal: group commit failed, retrying: {error}", file=sys.stderr)
+        self.flush()
+
+    def close(self):
+        """Applies everything still pending and stops the background thread."""
+        self.stopping = True
+        self.wakeup.set()
+        self.thread.join()
+        self.file.close()
+        self.conn.close()
+
+
+def search_terms(text):
+    """Splits text into the lowercase words the search index is built from."""
+    return re.findall(r"\w+", text.lower())
+
+
+class ProductSearch:
+    """Ranked, paginated prefix search over product names and categories.
+
+    When SQLite has FTS5, products_fts indexes name and category with
+    prefix indexes and is kept in sync by triggers on products, so every
+    insert and delete path updates it. Otherwise a plain product_terms
+    table of (word, product ID) pairs is used, answered with indexed range
+    scans; the managers keep that one in sync through add() and remove().
+    """
+
+    # Ranking a broad query on every keystroke is too slow, so queries matching
+    # more products than this come back in ID order until the user types more
+    MAX_RANKED_MATCHES = 10000
+
+    def __init__(self, db):
+        self.db = db
+
+    def add(self, row):
+        """Indexes a new product row (only needed without FTS5)."""
+        if not self.db.fts_enabled:
+            terms = set(search_terms(f"{row[1]} {row[2]}"))
+            self.db.conn.executemany("INSERT OR IGNORE INTO product_terms (term, product_id) VALUES (?, ?)",
+                                     [(term, row[0]) for term in terms])
+
+    def add_after(self, last_id):
+        """Indexes every product with an ID above last_id, e.g. after a bulk import (only needed without FTS5)."""
+        if not self.db.fts_enabled:
+            cursor = self.db.conn.cursor()
+            cursor.execute("SELECT id, name, category FROM products WHERE id > ?", (last_id,))
+            while True:
+                rows = cursor.fetchmany(5000)
+                if not rows:
+                    break
+                for row in rows:
+                    self.add(row)
+
+    def remove(self, product_id):
+        """Drops a product from the index (only needed without FTS5)."""
+        if not self.db.fts_enabled:
+            self.db.conn.execute("DELETE FROM product_terms WHERE product_id = ?", (product_id,))
+
+    def search(self, query, page=1, page_size=20):
+        """Returns one page of product rows matching every word of the query as a prefix.
+
+        Results are ranked by relevance (name matches first) as long as the
+        query matches at most MAX_RANKED_MATCHES products, and by ID otherwise.
+        """
+        words = search_terms(query)
+        if not words:
+            return []
+        offset = (max(page, 1) - 1) * page_size
+        cursor = self.db.conn.cursor()
+        if self.db.fts_enabled:
+            source = "products_fts f JOIN products p ON p.id = f.rowid"
+            matches = "products_fts f"
+            where = "products_fts MATCH ?"
+            params = [" ".join(f'"{word}"*' for word in words)]
+            rank = "bm25(products_fts, 10.0, 1.0)"
+            rank_params = []
+            unranked = "f.rowid"
+        else:
+            source = matches = "products p"
+            where = " AND ".join(
+                "p.id IN (SELECT product_id FROM product_terms WHERE term >= ? AND term < ?)" for _ in words)
+            params = [bound for word in words for bound in (word, word + "\U0010ffff")]
+            rank = "(lower(p.name) LIKE ? || '%') DESC, length(p.name)"
+            rank_params = [query.strip().lower()]
+            unranked = "p.id"
+
+        # Cheap bounded count to decide whether ranking is affordable
+        cursor.execute(f"SELECT COUNT(*) FROM (SELECT 1 FROM {matches} WHERE {where} LIMIT ?)",
+                       params + [self.MAX_RANKED_MATCHES + 1])
+        ranked = cursor.fetchone()[0] <= self.MAX_RANKED_MATCHES
+        order = f"{rank}, p.id" if ranked else unranked
+        cursor.execute(f"""
+            SELECT p.id, p.name, p.category, p.price, p.stock, p.reorder_level
+            FROM {source}
+            WHERE {where}
+            ORDER BY {order}
+            LIMIT ? OFFSET ?
+        """, params + (rank_params if ranked else []) + [page_size, offset])
+        return cursor.fetchall()
+
+
+class SalesArchive:
+    """Monthly partitions of the sales history, archived as read-only SQLite files.
+
+    The live `sales` table keeps the recent months the tills write to.
+    archive_before() moves each older month into its own compacted file in
+    the archive folder, records it in sales_partitions, and deletes it from
+    `sales`, so the live database stays small however long the history
+    grows. Readers attach only the partitions a date range touches, and
+    backups copy an archived month once, since it never changes again.
+    The sales_daily rollup stays in the live database, so revenue reports
+    cover the full history without opening any partition.
+    """
+
+    def __init__(self, db, folder=None):
+        self.db = db
+        self.folder = folder or os.path.splitext(db.db_name)[0] + "_archive"
+
+    @staticmethod
+    def month_bounds(month):
+        """Returns the first day of a YYYY-MM month and of the month after it."""
+        start = datetime.strptime(month, "%Y-%m")
+        end = (start + timedelta(days=32)).replace(day=1)
+        return start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")
+
+    def path(self, month):
+        """The archive file for a month."""
+        return os.path.join(self.folder, f"sales_{month}.db")
+
+    def partitions(self, start_date=None, end_date=None, after_id=0):
+        """Returns (month, path, first_id, last_id, row_count) for each archived month overlapping a date range."""
+        conditions, params = ["last_id > ?"], [after_id]
+        if start_date:
+            conditions.append("month >= ?")
+            params.append(start_date[:7])
+        if end_date:
+            conditions.append("month <= ?")
+            params.append(end_date[:7])
+        cursor = self.db.conn.cursor()
+        cursor.execute(f"""
+            SELECT month, path, first_id, last_id, row_count
+            FROM sales_partitions
+            WHERE {' AND '.join(conditions)}
+            ORDER BY month
+        """, params)
+        return cursor.fetchall()
+
+    #FOR READING PARTITIONS
+    @contextmanager
+    def attached(self, partition, conn=None):
+        """Attaches an archived month read-only and yields its schema name."""
+        conn = conn or self.db.conn
+        month, path = partition[0], partition[1]
+        schema = "sales_" + month.replace("-", "_")
+        conn.execute("ATTACH DATABASE ? AS " + schema, (f"file:{quote(os.path.abspath(path))}?mode=ro",))
+        try:
+            yield schema
+        finally:
+            conn.execute("DETACH DATABASE " + schema)
+
+    def sales_tables(self, conn=None, start_date=None, end_date=None, after_id=0):
+        """Yields every sales table a date range touches: the archived months in order, then main.sales.
+
+        Each partition is attached only while the caller is on it, so any
+        number of months can be read without hitting SQLite's attach limit.
+        """
+        conn = conn or self.db.conn
+        for partition in self.partitions(start_date, end_date, after_id):
+            with self.attached(partition, conn) as schema:
+                yield f"{schema}.sales"
+        yield "main.sales"
+
+    @contextmanager
+    def sales_view(self, start_date=None, end_date=None, conn=None):
+        """Yields a temporary view named sales_range over every sales row a date range can touch.
+
+        Only the partitions overlapping the range are attached and unioned,
+        so ad-hoc reports prune whole months before SQLite reads a page.
+        """
+        conn = conn or self.db.conn
+        partitions = self.partitions(start_date, end_date)
+        with ExitStack() as stack:
+            schemas = [stack.enter_context(self.attached(partition, conn)) for partition in partitions]
+            tables = [f"{schema}.sales" for schema in schemas] + ["main.sales"]
+            conn.execute("CREATE TEMP VIEW sales_range AS "
+                         + " UNION ALL ".join(f"SELECT * FROM {table}" for table in tables))
+            try:
+                yield "sales_range"
+            finally:
+                conn.execute("DROP VIEW temp.sales_range")
+
+    #FOR ARCHIVING
+    def archive_month(self, month):
+        """Moves one closed month of sales into a compacted, read-only archive file.
+
+        The rows are copied into a new file first and only deleted from
+        `sales` once the file is complete, so a crash part-way leaves the
+        live table untouched. Returns the number of sales archived.
+        """
+        start, end = self.month_bounds(month)
+        if end > datetime.now().strftime("%Y-%m-%d"):
+            raise ValueError(f"Month {month} is not over yet.")
+        conn = self.db.conn
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1 FROM sales_partitions WHERE month = ?", (month,))
+        if cursor.fetchone() is not None:
+            raise ValueError(f"Month {month} is already archived.")
+        if conn.in_transaction:
+            conn.commit()
+
+        os.makedirs(self.folder, exist_ok=True)
+        path = self.path(month)
+        building = path + ".tmp"
+        if os.path.exists(building):
+            os.remove(building)
+        cursor.execute("ATTACH DATABASE ? AS archive_build", (building,))
+        try:
+            cursor.execute("""
+                CREATE TABLE archive_build.sales (
+                    id INTEGER PRIMARY KEY,
+                    product_id INTEGER,
+                    quantity INTEGER,
+                    total_price REAL,
+                    sale_date TEXT
+                )
+            """)
+            cursor.execute("""
+                INSERT INTO archive_build.sales
+                SELECT id, product_id, quantity, total_price, sale_date
+                FROM main.sales
+                WHERE sale_date >= ? AND sale_date < ?
+                ORDER BY id
+            """, (start, end))
+            cursor.execute("CREATE INDEX archive_build.idx_sales_sale_date ON sales (sale_date)")
+            cursor.execute("CREATE INDEX archive_build.idx_sales_product_id ON sales (product_id)")
+            cursor.execute("SELECT COUNT(*), MIN(id), MAX(id) FROM archive_build.sales")
+            count, first_id, last_id = cursor.fetchone()
+            conn.commit()
+        finally:
+            cursor.execute("DETACH DATABASE archive_build")
+        if not count:
+            os.remove(building)
+            return 0
+        with closing(sqlite3.connect(building)) as archive:
+            archive.execute("VACUUM")  # Drop the slack left by building the indexes
+        os.replace(building, path)
+        os.chmod(path, 0o444)
+
+        # Sales recorded for this month after the copy have higher IDs and stay live
+        self.db.retry_busy(cursor.execute, "BEGIN IMMEDIATE")
+        try:
+            cursor.execute("""
+                INSERT INTO sales_partitions (month, path, first_id, last_id, row_count, archived_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (month, path, first_id, last_id, count, datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+            cursor.execute("DELETE FROM sales WHERE sale_date >= ? AND sale_date < ? AND id <= ?",
+                           (start, end, last_id))
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        return count
+
+    def archive_before(self, keep_months=3):
+        """Archives every month older than the last `keep_months`, oldest first, then compacts the live file.
+
+        Returns a dict of month -> sales archived.
+        """
+        cutoff = datetime.now().replace(day=1)
+        for _ in range(keep_months - 1):
+            cutoff = (cutoff - timedelta(days=1)).replace(day=1)
+        cursor = self.db.conn.cursor()
+        # Walk the sale_date index one month at a time rather than grouping the whole table
+        months, bound = [], ""
+        while True:
+            cursor.execute("SELECT substr(MIN(sale_date), 1, 7) FROM sales WHERE sale_date >= ? AND sale_date < ?",
+                           (bound, cutoff.strftime("%Y-%m-%d")))
+            month = cursor.fetchone()[0]
+            if month is None:
+                break
+            months.append(month)
+            bound = self.month_bounds(month)[1]
+        cursor.execute("SELECT month FROM sales_partitions")
+        archived = {row[0] for row in cursor.fetchall()}
+        counts = {month: self.archive_month(month) for month in months if month not in archived}
+        if any(counts.values()):
+            self.compact()
+        return counts
+
+    def compact(self):
+        """Returns the pages freed by archiving to the filesystem so backups stop copying them.
+
+        The first call rebuilds the file with a full VACUUM (which holds the
+        write lock, so run it outside trading hours) and switches it to
+        incremental auto-vacuum; after that only the free pages are trimmed.
+        """
+        conn = self.db.conn
+        if conn.in_transaction:
+            conn.commit()
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            self.db.retry_busy(conn.execute, "VACUUM")
+        else:
+            self.db.retry_busy(conn.execute, "PRAGMA incremental_vacuum")
+
+    #FOR BACKING UP
+    def backup(self, target_dir, pages=None, sleep=0.001):
+        """Backs up the live database with the SQLite online backup API, plus any archive files not yet copied.
+
+        The live file is copied from a separate connection, `pages` pages at
+        a time. In WAL mode (pooled tills) the default copies one consistent
+        snapshot that never blocks writers; otherwise it copies 1024 pages
+        per step and sleeps in between so checkouts can take the write lock.
+        Archived months are immutable and only copied when missing from the
+        target. The live copy is built in a temporary file and renamed into
+        place, so an interrupted backup never damages the previous one.
+        Returns a dict of what was copied.
+        """
+        start = time.perf_counter()
+        os.makedirs(target_dir, exist_ok=True)
+        source = self.db.connect()
+        try:
+            if pages is None:
+                wal = source.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+                pages = -1 if wal else 1024
+            path = os.path.join(target_dir, os.path.basename(self.db.db_name))
+            if os.path.exists(path + ".tmp"):
+                os.remove(path + ".tmp")
+            with closing(sqlite3.connect(path + ".tmp")) as target:
+                source.backup(target, pages=pages, sleep=sleep)
+            os.replace(path + ".tmp", path)
+            partitions = source.execute("SELECT path FROM sales_partitions ORDER BY month").fetchall()
+        finally:
+            source.close()
+
+        copied = 0
+        folder = os.path.join(target_dir, os.path.basename(self.folder))
+        for (path,) in partitions:
+            target = os.path.join(folder, os.path.basename(path))
+            if os.path.exists(target) and os.path.getsize(target) == os.path.getsize(path):
+                continue
+            os.makedirs(folder, exist_ok=True)
+            shutil.copyfile(path, target)
+            copied += 1
+        return {"partitions": len(partitions), "partitions_copied": copied,
+                "seconds": time.perf_counter() - start}
+
+
+def is_busy_error(error):
+    """Tells whether an sqlite3 error means another connection holds the lock (SQLITE_BUSY)."""
+    message = str(error).lower()
+    return "locked" in message or "busy" in message
+
 
 class Database:
-    """Handles database connection and initialization."""
+    """Handles database connection and initialization.
+
+    By default a single connection is shared everywhere. With pool_size set,
+    the database runs in multi-till mode: WAL journaling and tuned pragmas
+    are switched on, and each thread is handed its own connection from a
+    bounded pool, so several tills or worker threads can work at once.
+    With journal_path set, checkouts are written to a SalesJournal and
+    group-committed in the background instead of committing one by one.
+    With metrics set (True, or a shared Metrics instance), every statement
+    and manager method is timed; see metrics.py. Old months of sales can be
+    moved out to read-only files in archive_dir; see SalesArchive.
+
+    Nothing is opened until the first query. The first connection then
+    checks PRAGMA user_version and runs only the schema migrations the file
+    is missing, so starting up against a current database does no schema work.
+    """
+
+    # Schema migrations in order: step i takes user_version from i to i + 1.
+    # Every step is idempotent, so databases made before versioning (user_version 0) upgrade cleanly.
+    MIGRATIONS = (
+        "create_base_tables",
+        "create_sales_rollup",
+        "create_journal_state",
+        "create_low_stock_index",
+        "create_search_index",
+        "create_sales_partitions",
+    )
+    SCHEMA_VERSION = len(MIGRATIONS)
+
+    # Pragmas applied to every pooled connection
+    POOL_PRAGMAS = (
+        "PRAGMA journal_mode = WAL",
+        "PRAGMA synchronous = NORMAL",
+        "PRAGMA cache_size = -65536",
+        "PRAGMA mmap_size = 268435456",
+        "PRAGMA busy_timeout = 5000",
+    )
 
-    def __init__(self, db_name="inventory_system.db"):
+    def __init__(self, db_name="inventory_system.db", cache_size=10000, pool_size=0, busy_retries=5,
+                 journal_path=None, journal_interval=0.2, journal_batch=1000, metrics=None,
+                 archive_dir=None):
         # Initialize database connection with the provided or default database name
         self.db_name = db_name
-        self.conn = sqlite3.connect(self.db_name)
-        self.initialize_database()
+        # Optional instrumentation; None keeps plain sqlite3 connections and unwrapped methods
+        self.metrics = Metrics() if metrics is True else metrics or None
+        self.pool_size = pool_size
+        self.busy_retries = busy_retries
+        self.busy_waits = 0  # Number of SQLITE_BUSY retries, a measure of lock contention
+        self.pool_lock = threading.Lock()
+        # Connections are opened lazily; the first one brings the schema up to date
+        self._conn = None
+        self.schema_ready = False
+        self._fts_enabled = None
+        if pool_size:
+            self.pool = queue.LifoQueue()
+            self.local = threading.local()
+            self.connections = []
+        # Product cache and reorder watch list shared by every manager that uses this database
+        self.product_cache = ProductCache(self, cache_size)
+        self.reorder_engine = ReorderEngine(self)
+        self.product_search = ProductSearch(self)
+        self.sales_archive = SalesArchive(self, archive_dir)
+        self.sales_analytics = SalesAnalytics(self)
+        # Optional sales journal; replays anything a crash left behind before the tills start
+        self.journal = None
+        if journal_path:
+            self.journal = SalesJournal(self, journal_path, journal_interval, journal_batch)
 
-    def initialize_database(self):
-        """Sets up the database tables if they don't exist."""
-        cursor = self.conn.cursor()
+    @property
+    def conn(self):
+        """The connection for the calling thread, opened on first use."""
+        if not self.pool_size:
+            if self._conn is None:
+                self._conn = self.connect()
+                if not self.schema_ready:
+                    self.initialize_database(self._conn)
+            return self._conn
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = self.local.conn = self.acquire_connection()
+        return conn
+
+    def connect(self, **options):
+        """Opens a connection to the database file, instrumented when metrics are on.
+
+        URI filenames are enabled so archived sales partitions can be attached read-only.
+        """
+        if self.metrics is None:
+            return sqlite3.connect(self.db_name, uri=True, **options)
+        conn = sqlite3.connect(self.db_name, factory=InstrumentedConnection, uri=True, **options)
+        conn.metrics = self.metrics
+        return conn
+
+    def open_connection(self):
+        """Opens a pooled connection with WAL mode and the tuned pragmas."""
+        conn = self.connect(timeout=5, check_same_thread=False)
+        for pragma in self.POOL_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def acquire_connection(self, timeout=30):
+        """Takes an idle connection from the pool, opening a new one while under pool_size."""
+        try:
+            return self.pool.get_nowait()
+        except queue.Empty:
+            pass
+        conn = None
+        with self.pool_lock:
+            if len(self.connections) < self.pool_size:
+                conn = self.open_connection()
+                self.connections.append(conn)
+        if conn is None:
+            # The pool is at its limit, so wait for another thread to release a connection
+            return self.pool.get(timeout=timeout)
+        if not self.schema_ready:
+            self.initialize_database(conn)
+        return conn
+
+    def release_connection(self):
+        """Returns the calling thread's connection to the pool (no-op without a pool)."""
+        if not self.pool_size:
+            return
+        conn = getattr(self.local, "conn", None)
+        if conn is not None:
+            if conn.in_transaction:
+                conn.rollback()
+            self.local.conn = None
+            self.pool.put(conn)
+
+    def retry_busy(self, function, *args):
+        """Calls function, retrying with exponential backoff while SQLite reports SQLITE_BUSY."""
+        for attempt in range(self.busy_retries + 1):
+            try:
+                return function(*args)
+            except sqlite3.OperationalError as error:
+                if attempt == self.busy_retries or not is_busy_error(error):
+                    raise
+                with self.pool_lock:
+                    self.busy_waits += 1
+                time.sleep(0.005 * 2 ** attempt)
+
+    def close(self):
+        """Closes every connection this database has opened."""
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+        if not self.pool_size:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            return
+        with self.pool_lock:
+            for conn in self.connections:
+                conn.close()
+            self.connections.clear()
 
+    def initialize_database(self, conn=None):
+        """Brings the schema up to SCHEMA_VERSION, running only the migrations it is missing.
+
+        The version is kept in PRAGMA user_version, so on a current database
+        this is one pragma read rather than a pass over every CREATE statement.
+        """
+        conn = conn or self.conn
+        cursor = conn.cursor()
+        version = cursor.execute("PRAGMA user_version").fetchone()[0]
+        if version > self.SCHEMA_VERSION:
+            raise sqlite3.DatabaseError(f"Database schema version {version} is newer than this program supports "
+                                        f"({self.SCHEMA_VERSION}).")
+        if version < self.SCHEMA_VERSION:
+            if conn.in_transaction:
+                conn.commit()
+            self.retry_busy(cursor.execute, "BEGIN IMMEDIATE")
+            try:
+                # Re-read under the write lock in case another process migrated first
+                version = cursor.execute("PRAGMA user_version").fetchone()[0]
+                for step in range(version, self.SCHEMA_VERSION):
+                    getattr(self, self.MIGRATIONS[step])(cursor)
+                    cursor.execute(f"PRAGMA user_version = {step + 1}")
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'products_fts'")
+        self._fts_enabled = cursor.fetchone() is not None
+        self.schema_ready = True
+
+    @property
+    def fts_enabled(self):
+        """True if product search uses FTS5 rather than the product_terms fallback."""
+        if self._fts_enabled is None:
+            self.conn  # Opening the first connection checks the schema
+        return self._fts_enabled
+
+    #SCHEMA MIGRATIONS
+    def create_base_tables(self, cursor):
+        """Version 1: the products and sales tables."""
         # Create products table to store product details
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS products (
@@ -37,7 +1120,137 @@ class Database:
                 FOREIGN KEY (product_id) REFERENCES products(id)
             )
         """)
-        self.conn.commit()
+
+    def create_sales_rollup(self, cursor):
+        """Version 2: sales indexes and the sales_daily rollup with its trigger."""
+        # Index sales by product and by date so joins and date-range reports avoid full scans
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_sales_product_id ON sales (product_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_sales_sale_date ON sales (sale_date)")
+
+        # Create sales_daily rollup table holding one pre-aggregated row per product per day
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sales_daily'")
+        rollup_exists = cursor.fetchone() is not None
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sales_daily (
+                product_id INTEGER NOT NULL,
+                day TEXT NOT NULL,
+                quantity INTEGER NOT NULL,
+                revenue REAL NOT NULL,
+                PRIMARY KEY (product_id, day)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_sales_daily_day ON sales_daily (day)")
+
+        # Keep the rollup up to date incrementally as each sale is recorded
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_sales_daily_insert AFTER INSERT ON sales
+            BEGIN
+                INSERT INTO sales_daily (product_id, day, quantity, revenue)
+                VALUES (NEW.product_id, substr(NEW.sale_date, 1, 10), NEW.quantity, NEW.total_price)
+                ON CONFLICT (product_id, day) DO UPDATE SET
+                    quantity = quantity + excluded.quantity,
+                    revenue = revenue + excluded.revenue;
+            END
+        """)
+        if not rollup_exists:
+            # Backfill the rollup from any sales recorded before it existed
+            cursor.execute("""
+                INSERT INTO sales_daily (product_id, day, quantity, revenue)
+                SELECT product_id, substr(sale_date, 1, 10), SUM(quantity), SUM(total_price)
+                FROM sales
+                GROUP BY product_id, substr(sale_date, 1, 10)
+            """)
+
+    def create_journal_state(self, cursor):
+        """Version 3: the sales journal's last applied sequence number."""
+        # Last sales journal record applied, so a replay after a crash can skip it
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS journal_state (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                last_seq INTEGER NOT NULL
+            )
+        """)
+
+    def create_low_stock_index(self, cursor):
+        """Version 4: the partial index behind the reorder watch list."""
+        # Partial index holding only the products at or below their reorder level
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_products_low_stock
+            ON products (stock - reorder_level) WHERE stock <= reorder_level
+        """)
+
+    def create_search_index(self, cursor):
+        """Version 5: the product search index, using FTS5 when this SQLite build has it.
+
+        Returns True if it uses FTS5.
+        """
+        cursor.execute("SELECT name FROM sqlite_master WHERE name IN ('products_fts', 'product_terms')")
+        existing = {row[0] for row in cursor.fetchall()}
+        if "product_terms" not in existing:
+            try:
+                cursor.execute("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+                        name, category, content='products', content_rowid='id', prefix='1 2 3'
+                    )
+                """)
+            except sqlite3.OperationalError:
+                pass  # This SQLite build has no FTS5
+            else:
+                # Keep the full-text index in sync with every change to products
+                cursor.execute("""
+                    CREATE TRIGGER IF NOT EXISTS trg_products_fts_insert AFTER INSERT ON products
+                    BEGIN
+                        INSERT INTO products_fts (rowid, name, category) VALUES (NEW.id, NEW.name, NEW.category);
+                    END
+                """)
+                cursor.execute("""
+                    CREATE TRIGGER IF NOT EXISTS trg_products_fts_delete AFTER DELETE ON products
+                    BEGIN
+                        INSERT INTO products_fts (products_fts, rowid, name, category)
+                        VALUES ('delete', OLD.id, OLD.name, OLD.category);
+                    END
+                """)
+                cursor.execute("""
+                    CREATE TRIGGER IF NOT EXISTS trg_products_fts_update AFTER UPDATE OF name, category ON products
+                    BEGIN
+                        INSERT INTO products_fts (products_fts, rowid, name, category)
+                        VALUES ('delete', OLD.id, OLD.name, OLD.category);
+                        INSERT INTO products_fts (rowid, name, category) VALUES (NEW.id, NEW.name, NEW.category);
+                    END
+                """)
+                if "products_fts" not in existing:
+                    # Index any products that were added before the search index existed
+                    cursor.execute("INSERT INTO products_fts (products_fts) VALUES ('rebuild')")
+                return True
+
+        # Fallback: one row per (word, product), searched with indexed prefix ranges
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS product_terms (
+                term TEXT NOT NULL,
+                product_id INTEGER NOT NULL,
+                PRIMARY KEY (term, product_id)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_product_terms_product_id ON product_terms (product_id)")
+        if "product_terms" not in existing:
+            cursor.execute("SELECT id, name, category FROM products")
+            rows = cursor.fetchall()
+            cursor.executemany("INSERT OR IGNORE INTO product_terms (term, product_id) VALUES (?, ?)",
+                               [(term, row[0]) for row in rows for term in set(search_terms(f"{row[1]} {row[2]}"))])
+        return False
+
+    def create_sales_partitions(self, cursor):
+        """Version 6: the catalogue of archived monthly sales partitions."""
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sales_partitions (
+                month TEXT PRIMARY KEY,
+                path TEXT NOT NULL,
+                first_id INTEGER NOT NULL,
+                last_id INTEGER NOT NULL,
+                row_count INTEGER NOT NULL,
+                archived_at TEXT NOT NULL
+            )
+        """)
 
     def get_connection(self):
         """Returns the active database connection."""
@@ -47,6 +1260,8 @@ class Database:
 class Product:
     """Represents a single product."""
 
+    __slots__ = ("name", "category", "price", "stock", "reorder_level")
+
     def __init__(self, name, category, price, stock, reorder_level):
         # Initialize product details
         self.name = name
@@ -56,71 +1271,402 @@ class Product:
         self.reorder_level = reorder_level
 
 
+class ProductTable:
+    """Column-oriented, in-memory copy of the products table for bulk analytics.
+
+    Each column is a typed array (ids, prices, stocks, reorder levels and
+    category codes), so a product costs a few dozen bytes instead of a tuple
+    or object per row. Valuation, filtering, sorting and per-category
+    aggregates run over whole columns, using NumPy when it is installed.
+    """
+
+    def __init__(self, ids=None, names=None, category_codes=None, categories=None,
+                 prices=None, stocks=None, reorder_levels=None):
+        self.ids = ids if ids is not None else array("q")
+        self.names = names if names is not None else []
+        self.category_codes = category_codes if category_codes is not None else array("i")
+        self.categories = categories if categories is not None else []  # code -> category name
+        self.prices = prices if prices is not None else array("d")
+        self.stocks = stocks if stocks is not None else array("q")
+        self.reorder_levels = reorder_levels if reorder_levels is not None else array("q")
+
+    @classmethod
+    def load(cls, db, page_size=10000):
+        """Loads every product from the database, streaming it in pages."""
+        table = cls()
+        codes = {}
+        cursor = db.conn.cursor()
+        cursor.execute("SELECT id, name, category, price, stock, reorder_level FROM products ORDER BY id")
+        while True:
+            rows = cursor.fetchmany(page_size)
+            if not rows:
+                break
+            for product_id, name, category, price, stock, reorder_level in rows:
+                code = codes.get(category)
+                if code is None:
+                    code = codes[category] = len(table.categories)
+                    table.categories.append(category)
+                table.ids.append(product_id)
+                table.names.append(name)
+                table.category_codes.append(code)
+                table.prices.append(price)
+                table.stocks.append(stock)
+                table.reorder_levels.append(reorder_level)
+        return table
+
+    def __len__(self):
+        return len(self.ids)
+
+    def row(self, index):
+        """Returns the product at a position as a products-table row tuple."""
+        return (self.ids[index], self.names[index], self.categories[self.category_codes[index]],
+                self.prices[index], self.stocks[index], self.reorder_levels[index])
+
+    def column(self, name):
+        """Returns a column as a NumPy view (no copy) when NumPy is available, else the array itself."""
+        numpy = load_numpy()
+        values = getattr(self, name)
+        if numpy is not None and isinstance(values, array):
+            return numpy.frombuffer(values, dtype=numpy.float64 if values.typecode == "d" else
+                                    numpy.int64 if values.typecode == "q" else numpy.int32)
+        return values
+
+    def valuation(self):
+        """Total inventory value, the sum of stock x price."""
+        numpy = load_numpy()
+        if numpy is not None:
+            return float(numpy.dot(self.column("stocks").astype(numpy.float64), self.column("prices")))
+        return sum(map(operator.mul, self.stocks, self.prices))
+
+    def select(self, indexes):
+        """Returns a new table holding the products at the given positions, in that order."""
+        numpy = load_numpy()
+        columns = ("ids", "category_codes", "prices", "stocks", "reorder_levels")
+        if numpy is not None:
+            indexes = numpy.asarray(indexes, dtype=numpy.intp)
+            picked = {}
+            for name in columns:
+                picked[name] = array(getattr(self, name).typecode)
+                picked[name].frombytes(self.column(name)[indexes].tobytes())
+        else:
+            indexes = list(indexes)
+            if len(indexes) > 1:
+                pick = operator.itemgetter(*indexes)
+            else:
+                pick = lambda values: [values[i] for i in indexes]
+            picked = {name: array(getattr(self, name).typecode, pick(getattr(self, name))) for name in columns}
+        names = list(map(self.names.__getitem__, indexes.tolist() if numpy is not None else indexes))
+        return ProductTable(picked["ids"], names, picked["category_codes"], self.categories,
+                            picked["prices"], picked["stocks"], picked["reorder_levels"])
+
+    def filter(self, category=None, low_stock_only=False, min_price=None, max_price=None):
+        """Returns a new table with only the products that match every given condition."""
+        numpy = load_numpy()
+        if numpy is not None:
+            mask = numpy.ones(len(self), dtype=bool)
+            if category is not None:
+                code = self.categories.index(category) if category in self.categories else -1
+                mask &= self.column("category_codes") == code
+            if low_stock_only:
+                mask &= self.column("stocks") <= self.column("reorder_levels")
+            if min_price is not None:
+                mask &= self.column("prices") >= min_price
+            if max_price is not None:
+                mask &= self.column("prices") <= max_price
+            return self.select(numpy.flatnonzero(mask))
+        # Without NumPy, narrow the candidate positions one condition at a time
+        indexes = range(len(self))
+        if category is not None:
+            code = self.categories.index(category) if category in self.categories else -1
+            codes = self.category_codes
+            indexes = [i for i in indexes if codes[i] == code]
+        if low_stock_only:
+            stocks, reorder_levels = self.stocks, self.reorder_levels
+            indexes = [i for i in indexes if stocks[i] <= reorder_levels[i]]
+        if min_price is not None:
+            prices = self.prices
+            indexes = [i for i in indexes if prices[i] >= min_price]
+        if max_price is not None:
+            prices = self.prices
+            indexes = [i for i in indexes if prices[i] <= max_price]
+        return self.select(indexes)
+
+    def sort(self, column="price", descending=False):
+        """Returns a new table sorted by 'price', 'stock', 'reorder_level', 'value' or 'id'."""
+        numpy = load_numpy()
+        names = {"price": "prices", "stock": "stocks", "reorder_level": "reorder_levels", "id": "ids"}
+        if numpy is not None:
+            if column == "value":
+                keys = self.column("stocks") * self.column("prices")
+            else:
+                keys = self.column(names[column])
+            order = numpy.argsort(-keys if descending else keys, kind="stable")
+            return self.select(order)
+        if column == "value":
+            keys = array("d", map(operator.mul, self.stocks, self.prices))
+        else:
+            keys = getattr(self, names[column])
+        return self.select(sorted(range(len(self)), key=keys.__getitem__, reverse=descending))
+
+    def by_category(self):
+        """Returns {category: (products, units in stock, stock value)} aggregated over whole columns."""
+        numpy = load_numpy()
+        if numpy is not None:
+            codes = self.column("category_codes")
+            stocks = self.column("stocks").astype(numpy.float64)
+            size = len(self.categories)
+            counts = numpy.bincount(codes, minlength=size)
+            units = numpy.bincount(codes, weights=stocks, minlength=size)
+            values = numpy.bincount(codes, weights=stocks * self.column("prices"), minlength=size)
+            return {category: (int(counts[code]), int(units[code]), float(values[code]))
+                    for code, category in enumerate(self.categories)}
+        counts = [0] * len(self.categories)
+        units = [0] * len(self.categories)
+        values = [0.0] * len(self.categories)
+        for code, stock, price in zip(self.category_codes, self.stocks, self.prices):
+            counts[code] += 1
+            units[code] += stock
+            values[code] += stock * price
+        return {category: (counts[code], units[code], values[code]) for code, category in enumerate(self.categories)}
+
+
 class InventoryManager:
     """Manages inventory-related operations."""
 
     def __init__(self, db):
         # Accept a Database instance for executing queries
         self.db = db
+        if db.metrics is not None:
+            db.metrics.instrument(self)
 
     #FOR ADDING PRODUCT/S
-    def add_product(self, product):
-        """Adds a new product to the inventory."""
+    def create_product(self, product):
+        """Inserts a new product without printing anything and returns its ID."""
         cursor = self.db.conn.cursor()
         cursor.execute("""
             INSERT INTO products (name, category, price, stock, reorder_level)
             VALUES (?, ?, ?, ?, ?)
         """, (product.name, product.category, product.price, product.stock, product.reorder_level))
+        row = (cursor.lastrowid, product.name, product.category, product.price, product.stock, product.reorder_level)
+        self.db.product_search.add(row)
         self.db.conn.commit()
+        self.db.product_cache.put(row)
+        self.db.reorder_engine.update(row)
+        return cursor.lastrowid
+
+    def add_product(self, product):
+        """Adds a new product to the inventory."""
+        self.create_product(product)
         print(f"\n\t\t\t\tProduct '{product.name}' added successfully!")
         print("\t\t\t\t------------------------------------------")
 
-    #FOR VIEWING INVENTORY
-    def view_inventory(self):
-        """Displays all products in the inventory."""
+    #FOR IMPORTING PRODUCT/S
+    def import_products(self, path, chunk_size=5000):
+        """Streams products from a CSV or JSONL file into the inventory.
+
+        Rows are inserted with executemany in chunks of `chunk_size`, with
+        one commit per chunk. Invalid rows are skipped and reported instead
+        of aborting the import.
+
+        Returns a tuple of (rows imported, list of (line number, error message)).
+        """
         cursor = self.db.conn.cursor()
-        cursor.execute("SELECT * FROM products")
-        products = cursor.fetchall()
+        imported, errors, chunk, line_numbers = 0, [], [], []
+        insert = """
+            INSERT INTO products (name, category, price, stock, reorder_level)
+            VALUES (?, ?, ?, ?, ?)
+        """
+
+        def flush():
+            """Inserts the chunk and returns how many rows went in.
+
+            If SQLite rejects the chunk, it is rolled back and retried row by
+            row so only the failing rows are skipped and reported.
+            """
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM products")
+            last_id = cursor.fetchone()[0]
+            try:
+                cursor.executemany(insert, chunk)
+                inserted = len(chunk)
+            except (sqlite3.Error, OverflowError):
+                self.db.conn.rollback()
+                inserted = 0
+                for line_number, row in zip(line_numbers, chunk):
+                    try:
+                        cursor.execute(insert, row)
+                        inserted += 1
+                    except (sqlite3.Error, OverflowError) as error:
+                        errors.append((line_number, str(error)))
+            self.db.product_search.add_after(last_id)
+            self.db.conn.commit()
+            chunk.clear()
+            line_numbers.clear()
+            return inserted
+
+        try:
+            for line_number, record in read_records(path):
+                try:
+                    chunk.append(validate_product(record))
+                except (TypeError, ValueError, OverflowError) as error:
+                    errors.append((line_number, str(error)))
+                    continue
+                line_numbers.append(line_number)
+                if len(chunk) >= chunk_size:
+                    imported += flush()
+            if chunk:
+                imported += flush()
+        except BaseException:
+            # Never leave half a chunk in an open transaction for the next commit to save
+            if self.db.conn.in_transaction:
+                self.db.conn.rollback()
+            raise
+        if imported:
+            self.db.reorder_engine.reset()
+        return imported, errors
+
+    #FOR ITERATING OVER PRODUCT/S
+    def iter_products(self, page_size=500, category=None, low_stock_only=False, limit=None, after_id=0):
+        """Yields product rows in ID order, one page at a time.
+
+        Pages are fetched with keyset pagination on `id`, so memory use stays
+        flat no matter how many products there are. Rows can be filtered by
+        category or to low-stock items only, capped with `limit`, and resumed
+        after the last ID a caller has already seen with `after_id`.
+        """
+        conditions, params = ["id > ?"], []
+        if category is not None:
+            conditions.append("category = ?")
+            params.append(category)
+        if low_stock_only:
+            conditions.append("stock <= reorder_level")
+        query = f"""
+            SELECT id, name, category, price, stock, reorder_level
+            FROM products
+            WHERE {' AND '.join(conditions)}
+            ORDER BY id
+            LIMIT ?
+        """
+        cursor = self.db.conn.cursor()
+        last_id, remaining = after_id, limit
+        while remaining is None or remaining > 0:
+            size = page_size if remaining is None else min(page_size, remaining)
+            cursor.execute(query, (last_id, *params, size))
+            page = cursor.fetchall()
+            yield from page
+            if len(page) < size:
+                return
+            last_id = page[-1][0]
+            if remaining is not None:
+                remaining -= len(page)
+
+    #FOR VIEWING INVENTORY
+    def view_inventory(self, page_size=20, category=None, low_stock_only=False, limit=None):
+        """Displays the products in the inventory, pausing after every page."""
         print("\n\n\t\t\t\t\t-------------------")
         print("\t\t\t\t\t     INVENTORY     ")
         print("\t\t\t\t\t-------------------")
-        for product in products:
+        products = self.iter_products(page_size, category, low_stock_only, limit)
+        for count, product in enumerate(products, 1):
             id, name, category, price, stock, reorder_level = product
             low_stock = " (Low Stock)" if stock <= reorder_level else ""
             print(f"\t\tID: {id} | Name: {name} | Category: {category} | Price: P{price:.2f} | Stock: {stock}{low_stock}")
+            if page_size and count % page_size == 0 and not continue_paging():
+                products.close()
+                break
+
+    #FOR SEARCHING PRODUCT/S
+    def search_products(self, query, page=1, page_size=20):
+        """Returns one page of products whose name or category words start with the query words."""
+        return self.db.product_search.search(query, page, page_size)
+
+    def view_search_results(self, query, page_size=10):
+        """Displays ranked search results, one page at a time."""
+        print("\n\n\t\t\t\t\t-------------------")
+        print("\t\t\t\t\t      SEARCH     ")
+        print("\t\t\t\t\t-------------------")
+        page = 1
+        while True:
+            products = self.search_products(query, page, page_size)
+            if not products and page == 1:
+                print(f"\t\t\t\tNo products match '{query}'.")
+            for id, name, category, price, stock, reorder_level in products:
+                low_stock = " (Low Stock)" if stock <= reorder_level else ""
+                print(f"\t\tID: {id} | Name: {name} | Category: {category} | Price: P{price:.2f} | Stock: {stock}{low_stock}")
+            if len(products) < page_size or not continue_paging():
+                break
+            page += 1
+
+    #FOR VIEWING REORDER SUGGESTIONS
+    def view_reorder_suggestions(self, count=20):
+        """Displays the most urgent low-stock products with suggested reorder quantities."""
+        print("\n\n\t\t\t\t\t-------------------")
+        print("\t\t\t\t\t      REORDER     ")
+        print("\t\t\t\t\t-------------------")
+        suggestions = self.db.reorder_engine.most_urgent(count)
+        if not suggestions:
+            print("\t\t\t\tNo products are at or below their reorder level.")
+        for (id, name, category, _, stock, reorder_level), days_left, quantity in suggestions:
+            cover = "no recent sales" if days_left == math.inf else f"{days_left:.1f} day(s) left"
+            print(f"\t\tID: {id} | Name: {name} | Category: {category} | Stock: {stock}/{reorder_level} "
+                  f"| {cover} | Reorder: {quantity}")
 
     #FOR REMOVING PRODUCT/S
+    def delete_product(self, product_id):
+        """Deletes a product without asking for confirmation.
+
+        Returns True if the product existed and was deleted.
+        """
+        cursor = self.db.conn.cursor()
+        cursor.execute("DELETE FROM products WHERE id = ?", (product_id,))
+        self.db.product_search.remove(product_id)
+        self.db.conn.commit()
+        self.db.product_cache.invalidate(product_id)
+        self.db.reorder_engine.discard(product_id)
+        return cursor.rowcount > 0
+
     def remove_product(self, product_id):
         """Removes a product by ID."""
-        cursor = self.db.conn.cursor()
-        cursor.execute("SELECT name FROM products WHERE id = ?", (product_id,))
-        product = cursor.fetchone()
+        product = self.db.product_cache.get(product_id)
         if not product:
             print("\n\t\t\t\tInvalid product ID.")
         else:
-            confirm = input(f"\t\t\t\tSure to remove '{product[0]}'? (y/n): ").lower()
+            name = product[1]
+            confirm = input(f"\t\t\t\tSure to remove '{name}'? (y/n): ").lower()
             if confirm == 'y':
-                cursor.execute("DELETE FROM products WHERE id = ?", (product_id,))
-                self.db.conn.commit()
-                print(f"\n\t\t\t\tProduct '{product[0]}' has been ")
+                self.delete_product(product_id)
+                print(f"\n\t\t\t\tProduct '{name}' has been ")
                 print("\t\t\t\tremoved from inventory.")
             else:
                 print("\n\t\t\t\tOperation canceled.")
         print("\t\t\t\t------------------------------------------")
 
     #FOR UPDATING PRODUCT STOCK/S
+    def adjust_stock(self, product_id, quantity):
+        """Adds `quantity` to a product's stock without printing anything.
+
+        Returns the updated product row, or None if there is no such product.
+        """
+        product = self.db.product_cache.get(product_id)
+        if not product:
+            return None
+        _, name, category, price, _, reorder_level = product
+        cursor = self.db.conn.cursor()
+        # Add relative to the stored value so concurrent updates are never lost
+        cursor.execute("UPDATE products SET stock = stock + ? WHERE id = ?", (quantity, product_id))
+        cursor.execute("SELECT stock FROM products WHERE id = ?", (product_id,))
+        row = (product_id, name, category, price, cursor.fetchone()[0], reorder_level)
+        self.db.conn.commit()
+        self.db.product_cache.put(row)
+        self.db.reorder_engine.update(row)
+        return row
+
     def update_stock(self, product_id, quantity):
         """Updates the stock of a product."""
-        cursor = self.db.conn.cursor()
-        cursor.execute("SELECT name, stock FROM products WHERE id = ?", (product_id,))
-        product = cursor.fetchone()
+        product = self.adjust_stock(product_id, quantity)
         if not product:
             print("\n\t\t\t\tInvalid product ID.")
         else:
-            name, current_stock = product
-            new_stock = current_stock + quantity
-            cursor.execute("UPDATE products SET stock = ? WHERE id = ?", (new_stock, product_id))
-            self.db.conn.commit()
+            _, name, _, _, new_stock, _ = product
             print(f"\n\t\t\t\tStock for '{name}' updated to {new_stock}.")
             print("\t\t\t\t------------------------------------------")
 
@@ -128,15 +1674,17 @@ class InventoryManager:
 class SalesManager:
     """Handles sales operations."""
 
-    def __init__(self, db):
+    def __init__(self, db, pricing=None):
         # Accept a Database instance for executing queries
         self.db = db
+        # Optional PricingEngine; without one every line is charged at list price
+        self.pricing = pricing
+        if db.metrics is not None:
+            db.metrics.instrument(self)
 
     #FOR PURCHASING PRODUCT/S
     def purchase_products(self):
         """Facilitates the purchase process for customers."""
-        cursor = self.db.conn.cursor()
-
         # Show inventory to the customer
         print("\n\n\t\t\t\t\tAvailable Products:")
         InventoryManager(self.db).view_inventory()
@@ -150,14 +1698,13 @@ class SalesManager:
             if product_id == 0:  # Exit the loop when the customer finishes adding items
                 break
 
-            cursor.execute("SELECT name, stock, price FROM products WHERE id = ?", (product_id,))
-            product = cursor.fetchone()
+            product = self.db.product_cache.get(product_id)
 
             if not product:
                 print("\n\t\t\t\tInvalid product ID.")
                 print("\t\t\t\t------------------------------------------")
             else:
-                name, stock, price = product
+                _, name, _, price, stock, _ = product
                 quantity = int(input(f"\t\t\t\tQuantity for '{name}': "))
 
                 if quantity > stock:
@@ -178,16 +1725,17 @@ class SalesManager:
         print("\n\n\t\t\t\t\t-----------------")
         print("\t\t\t\t\t      CART     ")
         print("\t\t\t\t\t-----------------")
-        total_price = 0
+        subtotal, total_price = self.quote(cart)
         for item in cart:
             product_id, name, quantity, price = item
-            item_total = quantity * price
-            total_price += item_total
             print(f"\t\t\t\t\t'{name}'")
             print(f"\t\t\t\t\tQuantity: {quantity}x")
             print(f"\t\t\t\t\tUnit Price: P{price:.2f}")
-            print(f"\t\t\t\t\tItem Total: P{item_total:.2f}")
+            print(f"\t\t\t\t\tItem Total: P{quantity * price:.2f}")
 
+        if total_price < subtotal:
+            print(f"\n\t\t\t\t\tSubtotal: P{subtotal:.2f}")
+            print(f"\t\t\t\t\tDiscount: P{subtotal - total_price:.2f}")
         print(f"\n\t\t\t\t\tTotal Amount: P{total_price:.2f}")
         print("\n\n\t\t\t\t1. Proceed to Checkout") # Display checkout option
         print("\t\t\t\t2. Cancel Transaction") # Display cancel option
@@ -201,52 +1749,288 @@ class SalesManager:
                 print("\t\t\t\tReturning to the main menu...")
                 print("\t\t\t\t------------------------------------------")
             else:
+                # Update stock levels and record sales in a single transaction
+                try:
+                    _, total_price = self.checkout([(product_id, quantity) for product_id, _, quantity, _ in cart])
+                except CheckoutError as error:
+                    print(f"\n\t\t\t\t{error} Transaction canceled.")
+                    print("\t\t\t\tReturning to the main menu...")
+                    print("\t\t\t\t------------------------------------------")
+                    return
+
                 # Calculate and display change
                 change = payment - total_price
                 print(f"\n\t\t\t\tPurchase successful! Change: P{change:.2f}")
                 print("\t\t\t\tAll items purchased successfully!")
                 print("\t\t\t\t------------------------------------------")
-
-                # Update stock levels and record sales
-                for item in cart:
-                    product_id, _, quantity, price = item
-                    cursor.execute("UPDATE products SET stock = stock - ? WHERE id = ?", (quantity, product_id))
-                    sale_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    cursor.execute("""
-                        INSERT INTO sales (product_id, quantity, total_price, sale_date)
-                        VALUES (?, ?, ?, ?)
-                    """, (product_id, quantity, quantity * price, sale_date))
-
-                self.db.conn.commit()
         else:
             print("\n\t\t\t\tTransaction canceled.")
             print("\t\t\t\tReturning to the main menu...")
             print("\t\t\t\t------------------------------------------")
 
+    #FOR QUOTING A CART
+    def quote(self, cart):
+        """Returns (subtotal, total) for a cart of (product_id, name, quantity, price) lines at cached prices."""
+        subtotal = sum(quantity * price for _, _, quantity, price in cart)
+        if self.pricing is None:
+            return subtotal, subtotal
+        products = self.db.product_cache.get_many({product_id for product_id, _, _, _ in cart})
+        return subtotal, sum(line_totals(self.pricing, cart, products))
+
+    #FOR CHECKING OUT A WHOLE CART
+    def checkout(self, cart):
+        """Checks out a cart of (product_id, quantity) pairs in one transaction.
+
+        Product rows come from the product cache, with any misses fetched in
+        a single query, then every stock decrement and sales record is
+        written with executemany inside one BEGIN IMMEDIATE transaction. The
+        stock update is guarded by `stock >= ?`, so if any line cannot be
+        filled the whole checkout is rolled back and a CheckoutError is raised.
+
+        In journal mode the stock is reserved and the sale appended to the
+        sales journal instead, and SQLite is updated on the next group commit.
+
+        Each line is charged through the pricing engine, if one is set, and
+        the discounted amounts are what the sales records hold.
+
+        Returns a tuple of (lines, total_price), where lines is a list of
+        (product_id, name, quantity, price) tuples.
+        """
+        # Merge repeated products so each row is checked and updated once
+        quantities = {}
+        for product_id, quantity in cart:
+            if quantity <= 0:
+                raise CheckoutError(f"Invalid quantity {quantity} for product ID {product_id}.")
+            quantities[product_id] = quantities.get(product_id, 0) + quantity
+        if not quantities:
+            raise CheckoutError("Your cart is empty.")
+
+        if self.db.journal is not None:
+            # Journal mode: reserve the stock and log the sale; it reaches SQLite on the next group commit
+            lines, totals, updated = self.db.journal.record(quantities, self.pricing)
+        else:
+            lines, totals, updated = self.commit_cart(quantities)
+
+        for row, (_, _, quantity, _) in zip(updated, lines):
+            self.db.reorder_engine.update(row, sold=quantity)
+        self.db.sales_analytics.invalidate()
+
+        return lines, sum(totals)
+
+    def commit_cart(self, quantities):
+        """Applies a merged {product_id: quantity} cart in one BEGIN IMMEDIATE transaction.
+
+        Returns (lines, totals, rows), where totals are the amounts charged per
+        line and rows are the product rows after the stock decrement.
+        """
+        conn = self.db.conn
+        cache = self.db.product_cache
+        if conn.in_transaction:
+            conn.commit()
+        cursor = conn.cursor()
+        self.db.retry_busy(cursor.execute, "BEGIN IMMEDIATE")
+        try:
+            products = cache.get_many(quantities)
+
+            lines = []
+            for product_id, quantity in quantities.items():
+                if product_id not in products:
+                    raise CheckoutError(f"Invalid product ID {product_id}.")
+                _, name, _, price, stock, _ = products[product_id]
+                if quantity > stock:
+                    # Re-read the row in case the cached stock is out of date
+                    cache.invalidate(product_id)
+                    products[product_id] = cache.get(product_id)
+                    if products[product_id] is None:
+                        raise CheckoutError(f"Invalid product ID {product_id}.")
+                    _, name, _, price, stock, _ = products[product_id]
+                if quantity > stock:
+                    raise CheckoutError(f"Insufficient stock for '{name}'.")
+                lines.append((product_id, name, quantity, price))
+
+            cursor.executemany("UPDATE products SET stock = stock - ? WHERE id = ? AND stock >= ?",
+                               [(quantity, product_id, quantity) for product_id, _, quantity, _ in lines])
+            if cursor.rowcount != len(lines):
+                # The cached stock was stale, so drop it and let the next read go to SQLite
+                for product_id in quantities:
+                    cache.invalidate(product_id)
+                raise CheckoutError("Insufficient stock for this purchase.")
+
+            totals = line_totals(self.pricing, lines, products)
+            sale_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            cursor.executemany("""
+                INSERT INTO sales (product_id, quantity, total_price, sale_date)
+                VALUES (?, ?, ?, ?)
+            """, [(product_id, quantity, total, sale_date)
+                  for (product_id, _, quantity, _), total in zip(lines, totals)])
+
+            # Re-read the rows inside the transaction: cached rows may be older than another till's write
+            placeholders = ", ".join("?" * len(lines))
+            cursor.execute(f"""
+                SELECT id, name, category, price, stock, reorder_level
+                FROM products WHERE id IN ({placeholders})
+            """, [product_id for product_id, _, _, _ in lines])
+            current = {row[0]: row for row in cursor.fetchall()}
+            updated = [current[product_id] for product_id, _, _, _ in lines]
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            for product_id in quantities:
+                cache.invalidate(product_id)
+            raise
+        # Written through after the commit, so a concurrent miss cannot fill in the old stock afterwards
+        for row in updated:
+            cache.put(row)
+        return lines, totals, updated
+
+    #FOR ITERATING OVER SALES
+    def iter_sales(self, page_size=500, start_date=None, end_date=None, limit=None, after_id=0):
+        """Yields (id, product name, quantity, total_price, sale_date) rows in sale ID order.
+
+        Pages are fetched with keyset pagination on `sales.id`, so memory use
+        stays flat however long the sales history is. `start_date` and
+        `end_date` (YYYY-MM-DD, inclusive) restrict the date range, and
+        `after_id` resumes after the last sale ID a caller has already seen.
+        Archived months are read first, and only those inside the date range
+        are opened.
+        """
+        conditions, params = ["s.id > ?"], []
+        if start_date:
+            conditions.append("s.sale_date >= ?")
+            params.append(start_date)
+        if end_date:
+            conditions.append("s.sale_date < date(?, '+1 day')")
+            params.append(end_date)
+        conn = self.db.conn
+        cursor = conn.cursor()
+        remaining = limit
+        tables = self.db.sales_archive.sales_tables(conn, start_date, end_date, after_id)
+        with closing(tables):
+            for table in tables:
+                query = f"""
+                    SELECT s.id, p.name, s.quantity, s.total_price, s.sale_date
+                    FROM {table} s
+                    JOIN main.products p ON s.product_id = p.id
+                    WHERE {' AND '.join(conditions)}
+                    ORDER BY s.id
+                    LIMIT ?
+                """
+                last_id = after_id
+                while remaining is None or remaining > 0:
+                    size = page_size if remaining is None else min(page_size, remaining)
+                    cursor.execute(query, (last_id, *params, size))
+                    page = cursor.fetchall()
+                    yield from page
+                    if remaining is not None:
+                        remaining -= len(page)
+                    if len(page) < size:
+                        break
+                    last_id = page[-1][0]
+                if remaining == 0:
+                    return
+
     #FOR VIEWING SALES OF SOLD PRODUCT/S
-    def view_sales(self):
-        """Displays all recorded sales."""
-        cursor = self.db.conn.cursor()
-        cursor.execute("""
-            SELECT s.id, p.name, s.quantity, s.total_price, s.sale_date
-            FROM sales s
-            JOIN products p ON s.product_id = p.id
-        """)
-        sales = cursor.fetchall()
+    def view_sales(self, page_size=20, start_date=None, end_date=None, limit=None):
+        """Displays the recorded sales, pausing after every page."""
         print("\n\n\t\t\t\t\t-------------------")
         print("\t\t\t\t\t       SALES      ")
         print("\t\t\t\t\t-------------------")
-        for sale in sales:
+        sales = self.iter_sales(page_size, start_date, end_date, limit)
+        for count, sale in enumerate(sales, 1):
             id, name, quantity, total_price, sale_date = sale
             print(f"\tSale ID: {id} | Product: {name} | Quantity: {quantity} | Total: P{total_price:.2f} | Date: {sale_date}")
+            if page_size and count % page_size == 0 and not continue_paging():
+                sales.close()
+                break
+
+    #FOR EXPORTING SALES
+    def export_sales(self, path, start_date=None, end_date=None, page_size=5000):
+        """Streams sales in an optional date range to a CSV or JSONL file.
+
+        Returns the number of sales written.
+        """
+        count = 0
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            if path.lower().endswith(".jsonl"):
+                for sale in self.iter_sales(page_size, start_date, end_date):
+                    file.write(json.dumps(dict(zip(SALE_FIELDS, sale))) + "\n")
+                    count += 1
+            else:
+                writer = csv.writer(file)
+                writer.writerow(SALE_FIELDS)
+                for sale in self.iter_sales(page_size, start_date, end_date):
+                    writer.writerow(sale)
+                    count += 1
+        return count
+
+    #FOR SALES REPORTS
+    def _rollup_range(self, start_date, end_date):
+        """Builds the WHERE clause that limits sales_daily to a date range (YYYY-MM-DD, inclusive)."""
+        conditions, params = [], []
+        if start_date:
+            conditions.append("d.day >= ?")
+            params.append(start_date)
+        if end_date:
+            conditions.append("d.day <= ?")
+            params.append(end_date)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, params
+
+    def revenue_by_product(self, start_date=None, end_date=None):
+        """Returns (product_id, name, quantity, revenue) rows from the daily rollup, highest revenue first."""
+        where, params = self._rollup_range(start_date, end_date)
+        cursor = self.db.conn.cursor()
+        cursor.execute(f"""
+            SELECT d.product_id, p.name, SUM(d.quantity), SUM(d.revenue)
+            FROM sales_daily d
+            LEFT JOIN products p ON d.product_id = p.id
+            {where}
+            GROUP BY d.product_id
+            ORDER BY SUM(d.revenue) DESC
+        """, params)
+        return cursor.fetchall()
+
+    def revenue_by_category(self, start_date=None, end_date=None):
+        """Returns (category, quantity, revenue) rows from the daily rollup, highest revenue first."""
+        where, params = self._rollup_range(start_date, end_date)
+        cursor = self.db.conn.cursor()
+        cursor.execute(f"""
+            SELECT p.category, SUM(d.quantity), SUM(d.revenue)
+            FROM sales_daily d
+            JOIN products p ON d.product_id = p.id
+            {where}
+            GROUP BY p.category
+            ORDER BY SUM(d.revenue) DESC
+        """, params)
+        return cursor.fetchall()
+
+    def revenue_by_date(self, start_date=None, end_date=None):
+        """Returns (day, quantity, revenue) rows from the daily rollup in date order."""
+        where, params = self._rollup_range(start_date, end_date)
+        cursor = self.db.conn.cursor()
+        cursor.execute(f"""
+            SELECT d.day, SUM(d.quantity), SUM(d.revenue)
+            FROM sales_daily d
+            {where}
+            GROUP BY d.day
+            ORDER BY d.day
+        """, params)
+        return cursor.fetchall()
+
+
+PRICING_RULES = "pricing_rules.json"
+# Set FURFECT_METRICS to a .json or .prom file to time every query and operation and dump the numbers there on exit
+METRICS_PATH = os.environ.get("FURFECT_METRICS")
 
 
 # Main Menu
 def main_menu():
     """Provides the main user interface for the inventory and sales system."""
-    db = Database()  # Initialize the database connection
+    db = Database(metrics=bool(METRICS_PATH))  # Initialize the database connection
     inventory = InventoryManager(db)  # Manage inventory operations
-    sales = SalesManager(db)  # Manage sales operations
+    # Discount rules are optional; without pricing_rules.json carts are charged at list price
+    pricing = PricingEngine.from_file(PRICING_RULES) if os.path.exists(PRICING_RULES) else None
+    sales = SalesManager(db, pricing)  # Manage sales operations
 
     print("\n\n\t\t\t\t******************************************")
     print("\t\t\t\t     Hi! Welcome to Furfect Supplies")
@@ -266,7 +2050,11 @@ def main_menu():
         print("\t\t\t\t\t4. Update Stock")
         print("\t\t\t\t\t5. Purchase Products")
         print("\t\t\t\t\t6. View Sales")
-        print("\t\t\t\t\t7. Exit")
+        print("\t\t\t\t\t7. Import Products")
+        print("\t\t\t\t\t8. Export Sales")
+        print("\t\t\t\t\t9. Reorder Suggestions")
+        print("\t\t\t\t\t10. Search Products")
+        print("\t\t\t\t\t11. Exit")
         print("\n\t\t\t\t==========================================")
 
         # Prompt the user for their choice
@@ -311,9 +2099,45 @@ def main_menu():
             sales.view_sales()
 
         elif choice == "7":
+            # Import products from a CSV or JSONL file
+            print("\n\t\t\t\t------------------------------------------")
+            path = input("\t\t\t\tEnter the CSV or JSONL file to import: ").strip()
+            if not os.path.isfile(path):
+                print("\n\t\t\t\tFile not found.")
+            else:
+                imported, errors = inventory.import_products(path)
+                print(f"\n\t\t\t\t{imported} product(s) imported successfully!")
+                for line_number, message in errors[:20]:
+                    print(f"\t\t\t\tLine {line_number}: {message}")
+                if len(errors) > 20:
+                    print(f"\t\t\t\t...and {len(errors) - 20} more invalid row(s).")
+            print("\t\t\t\t------------------------------------------")
+
+        elif choice == "8":
+            # Export sales to a CSV or JSONL file
+            print("\n\t\t\t\t------------------------------------------")
+            path = input("\t\t\t\tEnter the CSV or JSONL file to export to: ").strip()
+            start_date = input("\t\t\t\tStart date (YYYY-MM-DD, blank for all): ").strip() or None
+            end_date = input("\t\t\t\tEnd date (YYYY-MM-DD, blank for all): ").strip() or None
+            count = sales.export_sales(path, start_date, end_date)
+            print(f"\n\t\t\t\t{count} sale(s) exported to '{path}'.")
+            print("\t\t\t\t------------------------------------------")
+
+        elif choice == "9":
+            # Show the most urgent products to reorder
+            inventory.view_reorder_suggestions()
+
+        elif choice == "10":
+            # Search products by name or category
+            query = input("\n\t\t\t\tSearch for: ").strip()
+            inventory.view_search_results(query)
+
+        elif choice == "11":
             # Exit the program
             print("\n\t\t\t\tExiting the system. Goodbye!")
-            db.conn.close()
+            db.close()
+            if db.metrics is not None:
+                db.metrics.dump(METRICS_PATH)
             break
         else:
             print("\n\t\t\t\tInvalid choice! Please try again.")
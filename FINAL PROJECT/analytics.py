@@ -0,0 +1,253 @@
+"""Cached sales analytics for Furfect Supplies: best sellers, sales velocity and stock-out forecasts.
+
+SalesAnalytics materializes per-product totals for each window it is asked
+about (e.g. the last 7 days, or the 7 full days before today). A window is
+first aggregated by SQLite from the sales_daily rollup; after that every
+refresh reads only the sales whose ID is above the last one the cache has
+seen (the watermark) and adds them to the windows that cover their day, so
+keeping the cache current is one primary-key range scan over the new rows
+instead of a GROUP BY over the sales history. Query results are kept until
+new sales arrive, and every window is rebuilt once the date changes.
+
+The cache refreshes when it is older than `ttl` seconds, or on the next
+query after invalidate(), which SalesManager calls whenever it records
+sales. The TTL covers sales written by other processes.
+"""
+import heapq
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+
+def days_after(day, days):
+    """Returns the YYYY-MM-DD date `days` days after `day`, or None if that is past the calendar's end."""
+    if days >= (date.max - day).days:
+        return None
+    return (day + timedelta(days=int(days))).isoformat()
+
+
+class SalesAnalytics:
+    """Materialized sales aggregates, refreshed incrementally from a sales.id watermark."""
+
+    def __init__(self, db, ttl=60):
+        self.db = db
+        self.ttl = ttl
+        self.lock = threading.RLock()
+        self.stale = False
+        self.watermark = 0      # Highest sales.id folded into the windows
+        self.refreshed_at = 0.0
+        self.today = None
+        self.windows = {}       # (first day, day after the last or None) -> {product ID: [quantity, revenue]}
+        self.results = {}       # memoized query results, dropped whenever the totals change
+        self.builds = 0
+        self.refreshes = 0
+
+    #FOR KEEPING THE CACHE CURRENT
+    def window(self, first_day, end_day=None):
+        """Returns {product ID: [quantity, revenue]} for sales from first_day up to (not including) end_day.
+
+        A window is aggregated from sales_daily the first time it is asked
+        for, in the same read transaction that brings the other windows up
+        to the watermark, so every window counts exactly the same sales.
+        """
+        key = (first_day, end_day)
+        window = self.windows.get(key)
+        if window is not None:
+            return window
+        conn = self.db.conn
+        if conn.in_transaction:
+            conn.commit()
+        cursor = conn.cursor()
+        cursor.execute("BEGIN")
+        try:
+            self.fold(cursor)
+            conditions, params = ["day >= ?"], [first_day]
+            if end_day:
+                conditions.append("day < ?")
+                params.append(end_day)
+            cursor.execute(f"""
+                SELECT product_id, SUM(quantity), SUM(revenue)
+                FROM sales_daily
+                WHERE {' AND '.join(conditions)}
+                GROUP BY product_id
+            """, params)
+            window = {product_id: [quantity, revenue] for product_id, quantity, revenue in cursor.fetchall()}
+        finally:
+            conn.commit()
+        self.windows[key] = window
+        self.builds += 1
+        return window
+
+    def fold(self, cursor):
+        """Adds the sales recorded since the watermark to every window and returns how many were read."""
+        if not self.windows:
+            # Nothing to update yet, so just remember where the history ends
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM sales")
+            self.watermark = max(self.watermark, cursor.fetchone()[0])
+            return 0
+        cursor.execute("""
+            SELECT id, product_id, quantity, total_price, substr(sale_date, 1, 10)
+            FROM sales
+            WHERE id > ?
+            ORDER BY id
+        """, (self.watermark,))
+        windows = list(self.windows.items())
+        count = 0
+        while True:
+            rows = cursor.fetchmany(5000)
+            if not rows:
+                break
+            for _, product_id, quantity, revenue, day in rows:
+                for (first_day, end_day), window in windows:
+                    if day >= first_day and (end_day is None or day < end_day):
+                        totals = window.setdefault(product_id, [0, 0.0])
+                        totals[0] += quantity
+                        totals[1] += revenue
+            self.watermark = rows[-1][0]
+            count += len(rows)
+        if count:
+            self.results.clear()
+        return count
+
+    def refresh(self):
+        """Brings every window up to date and returns how many new sales were read."""
+        with self.lock:
+            self.roll_over()
+            self.stale = False
+            count = self.fold(self.db.conn.cursor())
+            self.refreshed_at = time.monotonic()
+            self.refreshes += 1
+            return count
+
+    def current(self):
+        """Refreshes the cache if it was invalidated or is older than ttl, and returns today's date."""
+        if self.stale or time.monotonic() - self.refreshed_at >= self.ttl:
+            self.refresh()
+        else:
+            self.roll_over()
+        return self.today
+
+    def invalidate(self):
+        """Marks the cache stale so the next query picks up new sales."""
+        self.stale = True
+
+    def reset(self):
+        """Drops every window so each is aggregated again on next use."""
+        with self.lock:
+            self.windows, self.results = {}, {}
+
+    def roll_over(self):
+        """Drops every window once the date changes, since their day ranges moved."""
+        today = datetime.now().date()
+        if today != self.today:
+            self.today = today
+            self.windows, self.results = {}, {}
+
+    def last_days(self, days):
+        """Returns {product ID: [quantity, revenue]} over the last `days` days, today included."""
+        if days < 1:
+            raise ValueError(f"Window must be at least 1 day, got {days}.")
+        return self.window((self.today - timedelta(days=days - 1)).isoformat())
+
+    def full_days(self, days):
+        """Returns {product ID: [quantity, revenue]} over the `days` full days before today."""
+        if days < 1:
+            raise ValueError(f"Window must be at least 1 day, got {days}.")
+        return self.window((self.today - timedelta(days=days)).isoformat(), self.today.isoformat())
+
+    #FOR QUERYING
+    def top_sellers(self, days=7, count=10, by="quantity"):
+        """Returns up to `count` (product ID, name, quantity, revenue) tuples for the best sellers of the last `days` days.
+
+        `by` is "quantity" or "revenue". Products removed since have no name.
+        """
+        if by not in ("quantity", "revenue"):
+            raise ValueError(f"Rank by 'quantity' or 'revenue', not {by!r}.")
+        column = 0 if by == "quantity" else 1
+        with self.lock:
+            self.current()
+            key = ("top", days, count, column)
+            best = self.results.get(key)
+            if best is None:
+                best = self.results[key] = [(product_id, quantity, revenue) for product_id, (quantity, revenue) in
+                                            heapq.nlargest(count, self.last_days(days).items(),
+                                                           key=lambda item: (item[1][column], -item[0]))]
+        rows = self.db.product_cache.get_many([product_id for product_id, _, _ in best])
+        return [(product_id, rows[product_id][1] if product_id in rows else None, quantity, revenue)
+                for product_id, quantity, revenue in best]
+
+    def velocity(self, product_id, days=28):
+        """Units of a product sold per day over the last `days` days."""
+        with self.lock:
+            self.current()
+            return self.last_days(days).get(product_id, (0, 0.0))[0] / days
+
+    def velocities(self, days=28):
+        """Returns {product ID: units sold per day} over the last `days` days for every product that sold."""
+        with self.lock:
+            self.current()
+            key = ("velocities", days)
+            if key not in self.results:
+                self.results[key] = {product_id: quantity / days
+                                     for product_id, (quantity, _) in self.last_days(days).items()}
+            return self.results[key]
+
+    def moving_average(self, product_id, window=7):
+        """Simple moving average of a product's daily units over the last `window` full days."""
+        with self.lock:
+            self.current()
+            return self.full_days(window).get(product_id, (0, 0.0))[0] / window
+
+    def forecast(self, product_id, horizon=14, window=7):
+        """Forecasts daily units for the next `horizon` days, starting today, with a simple moving average.
+
+        Each day's forecast is the mean of the `window` days before it,
+        using earlier forecasts once the actual history runs out. Returns a
+        list of (day, units) tuples.
+        """
+        with self.lock:
+            today = self.current()
+        # One product's daily series is a primary-key range read of the rollup
+        cursor = self.db.conn.cursor()
+        cursor.execute("SELECT day, quantity FROM sales_daily WHERE product_id = ? AND day >= ? AND day < ?",
+                       (product_id, (today - timedelta(days=window)).isoformat(), today.isoformat()))
+        sold = dict(cursor.fetchall())
+        history = [sold.get((today - timedelta(days=offset)).isoformat(), 0) for offset in range(window, 0, -1)]
+        forecast = []
+        for offset in range(horizon):
+            units = sum(history[-window:]) / window
+            history.append(units)
+            forecast.append(((today + timedelta(days=offset)).isoformat(), units))
+        return forecast
+
+    def stockout_date(self, product_id, window=7):
+        """Expected stock-out day (YYYY-MM-DD) at the moving-average demand, or None if the product is not selling."""
+        row = self.db.product_cache.get(product_id)
+        if row is None:
+            return None
+        average = self.moving_average(product_id, window)
+        if row[4] <= 0:
+            return self.today.isoformat()
+        if not average:
+            return None
+        return days_after(self.today, row[4] / average)
+
+    def stockouts(self, count=10, window=7):
+        """Returns up to `count` (product row, days of stock left, stock-out day) tuples, soonest first.
+
+        Only products that sold in the last `window` full days are considered.
+        """
+        with self.lock:
+            today = self.current()
+            units = {product_id: quantity for product_id, (quantity, _) in self.full_days(window).items() if quantity}
+        rows = self.db.product_cache.get_many(list(units))
+        candidates = ((max(row[4], 0) * window / units[product_id], product_id, row)
+                      for product_id, row in rows.items())
+        return [(row, days_left, days_after(today, days_left))
+                for days_left, _, row in heapq.nsmallest(count, candidates)]
+
+    def stats(self):
+        """Returns the cache counters as a dict."""
+        with self.lock:
+            return {"watermark": self.watermark, "windows": sorted(self.windows), "builds": self.builds,
+                    "refreshes": self.refreshes}
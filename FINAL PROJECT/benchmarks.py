@@ -0,0 +1,876 @@
+"""Benchmarks for the Furfect Supplies inventory and sales code paths.
+
+Run a single benchmark by name, e.g. `python benchmarks.py checkout`.
+Every benchmark works on a throwaway database so inventory_system.db is never touched.
+
+`python benchmarks.py suite` runs the hot-path regression suite on a synthetic
+catalogue and sales history (--products/--sales, 1k to 10M rows). Save a
+baseline with `--save baseline.json`, then `--baseline baseline.json` exits
+with status 1 if any case is slower, or peaks at more traced memory, than the
+baseline by more than --threshold.
+"""
+import argparse
+import asyncio
+import contextlib
+import csv
+import json
+import os
+import random
+import resource
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+
+def load_system():
+    """Imports the Furfect Supplies module."""
+    import furfect_supplies
+    return furfect_supplies
+
+
+def temp_database(system):
+    """Creates a Database on a fresh temporary file."""
+    handle, path = tempfile.mkstemp(suffix=".db")
+    os.close(handle)
+    os.remove(path)
+    return system.Database(path)
+
+
+def seed_products(db, count, stock=10**9):
+    """Inserts `count` synthetic products with plenty of stock."""
+    categories = ["Food", "Toys", "Grooming", "Bedding", "Health"]
+    # A generator keeps memory flat even for multi-million row catalogues
+    rows = ((f"Product {i}", categories[i % len(categories)], round(random.uniform(10, 1000), 2), stock, 10)
+            for i in range(1, count + 1))
+    db.conn.executemany("""
+        INSERT INTO products (name, category, price, stock, reorder_level)
+        VALUES (?, ?, ?, ?, ?)
+    """, rows)
+    db.conn.commit()
+
+
+def seed_sales(db, count, products, days=365):
+    """Inserts `count` synthetic sales spread over the last `days` days."""
+    start = time.time() - days * 86400
+    batch = []
+    for _ in range(count):
+        quantity = random.randint(1, 5)
+        sale_date = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(start + random.random() * days * 86400))
+        batch.append((random.randint(1, products), quantity, quantity * 100.0, sale_date))
+        if len(batch) == 50000:
+            db.conn.executemany("INSERT INTO sales (product_id, quantity, total_price, sale_date) VALUES (?, ?, ?, ?)", batch)
+            batch.clear()
+    db.conn.executemany("INSERT INTO sales (product_id, quantity, total_price, sale_date) VALUES (?, ?, ?, ?)", batch)
+    db.conn.commit()
+
+
+def timed(function, *args, repeat=5):
+    """Returns the best wall-clock time in milliseconds over `repeat` calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def bench_checkout(products=10000, seconds=2.0):
+    """Reports checkouts/second for 1, 10 and 100-line carts."""
+    system = load_system()
+    db = temp_database(system)
+    seed_products(db, products)
+    sales = system.SalesManager(db)
+
+    print("Checkout throughput")
+    for lines in (1, 10, 100):
+        count = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            cart = [(random.randint(1, products), 1) for _ in range(lines)]
+            sales.checkout(cart)
+            count += 1
+        elapsed = time.perf_counter() - start
+        print(f"  {lines:>3}-line carts: {count / elapsed:10.1f} checkouts/s")
+    db.close()
+    os.remove(db.db_name)
+
+
+def bench_reports(products=1000, sizes=(10000, 100000, 1000000)):
+    """Compares rollup-backed revenue reports with the same report scanned from raw sales."""
+    system = load_system()
+    print("Revenue report latency (ms)")
+    for size in sizes:
+        db = temp_database(system)
+        seed_products(db, products)
+        seed_sales(db, size, products)
+        sales = system.SalesManager(db)
+        end = time.strftime("%Y-%m-%d")
+        start = time.strftime("%Y-%m-%d", time.localtime(time.time() - 30 * 86400))
+
+        def raw_by_product():
+            db.conn.execute("""
+                SELECT s.product_id, p.name, SUM(s.quantity), SUM(s.total_price)
+                FROM sales s JOIN products p ON s.product_id = p.id
+                WHERE s.sale_date >= ? AND s.sale_date < date(?, '+1 day')
+                GROUP BY s.product_id
+            """, (start, end)).fetchall()
+
+        print(f"  {size:>9} sales | raw scan: {timed(raw_by_product):8.2f} | "
+              f"by product: {timed(sales.revenue_by_product, start, end):7.2f} | "
+              f"by category: {timed(sales.revenue_by_category, start, end):7.2f} | "
+              f"by date: {timed(sales.revenue_by_date, start, end):7.2f}")
+        db.close()
+        os.remove(db.db_name)
+
+
+def peak_memory(function):
+    """Runs `function` and returns (peak traced MB, process max RSS in MB afterwards)."""
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2**20, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def bench_paging(rows=1000000):
+    """Shows that keyset-paged iteration keeps memory flat where fetchall grows with the table."""
+    system = load_system()
+    db = temp_database(system)
+    seed_products(db, rows)
+    seed_sales(db, rows, rows)
+    inventory = system.InventoryManager(db)
+    sales = system.SalesManager(db)
+
+    def drain(iterator):
+        for _ in iterator:
+            pass
+
+    print(f"Peak memory while reading {rows} rows (traced MB / max RSS MB)")
+    # Streaming runs first because max RSS never goes back down
+    for label, function in (
+        ("iter_products", lambda: drain(inventory.iter_products())),
+        ("iter_sales", lambda: drain(sales.iter_sales())),
+        ("products fetchall", lambda: db.conn.execute("SELECT * FROM products").fetchall()),
+        ("sales fetchall", lambda: db.conn.execute("""
+            SELECT s.id, p.name, s.quantity, s.total_price, s.sale_date
+            FROM sales s JOIN products p ON s.product_id = p.id
+        """).fetchall()),
+    ):
+        traced, rss = peak_memory(function)
+        print(f"  {label:<18} {traced:9.1f} / {rss:9.1f}")
+    db.close()
+    os.remove(db.db_name)
+
+
+def bench_cache(products=100000, lookups=200000, hot=1000):
+    """Compares cached and uncached product lookups on a hot set of SKUs."""
+    system = load_system()
+    print(f"Product lookups ({lookups} lookups over {hot} hot SKUs)")
+    ids = [random.randint(1, hot) for _ in range(lookups)]
+    for label, cache_size in (("uncached", 0), ("cached", 10000)):
+        db = temp_database(system)
+        db.product_cache.max_size = cache_size
+        seed_products(db, products)
+        cache = db.product_cache
+        start = time.perf_counter()
+        for product_id in ids:
+            cache.get(product_id)
+        elapsed = time.perf_counter() - start
+        print(f"  {label:<9} {lookups / elapsed:12.0f} lookups/s | {cache.stats()}")
+        db.close()
+        os.remove(db.db_name)
+
+
+def write_catalogue(path, rows):
+    """Writes a synthetic supplier catalogue as CSV or JSONL."""
+    categories = ["Food", "Toys", "Grooming", "Bedding", "Health"]
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        if path.endswith(".jsonl"):
+            for i in range(rows):
+                file.write(json.dumps({"name": f"SKU {i}", "category": categories[i % 5], "price": 99.5,
+                                       "stock": 100, "reorder_level": 10}) + "\n")
+        else:
+            writer = csv.writer(file)
+            writer.writerow(("name", "category", "price", "stock", "reorder_level"))
+            for i in range(rows):
+                writer.writerow((f"SKU {i}", categories[i % 5], 99.5, 100, 10))
+
+
+def bench_import_export(rows=100000):
+    """Reports bulk product import and sales export throughput in rows/second."""
+    system = load_system()
+    print(f"Import/export throughput ({rows} rows)")
+    with tempfile.TemporaryDirectory() as folder:
+        for extension in ("csv", "jsonl"):
+            db = temp_database(system)
+            source = os.path.join(folder, f"catalogue.{extension}")
+            write_catalogue(source, rows)
+            start = time.perf_counter()
+            imported, errors = system.InventoryManager(db).import_products(source)
+            elapsed = time.perf_counter() - start
+            print(f"  import {extension:<5} {imported / elapsed:12.0f} rows/s ({len(errors)} errors)")
+
+            seed_sales(db, rows, imported)
+            target = os.path.join(folder, f"sales.{extension}")
+            start = time.perf_counter()
+            exported = system.SalesManager(db).export_sales(target)
+            elapsed = time.perf_counter() - start
+            print(f"  export {extension:<5} {exported / elapsed:12.0f} rows/s")
+            db.close()
+            os.remove(db.db_name)
+
+
+def percentile(samples, fraction):
+    """Returns the given percentile (0-1) of a list of samples."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def bench_load(products=10000, threads=(1, 2, 4, 8), seconds=3.0, lines=5):
+    """Drives N threads of concurrent checkouts against a pooled Database."""
+    system = load_system()
+    print(f"Concurrent checkouts ({lines}-line carts, pooled WAL database)")
+    for count in threads:
+        db = temp_database(system)
+        seed_products(db, products)
+        db.close()
+        db = system.Database(db.db_name, pool_size=count)
+        sales = system.SalesManager(db)
+        latencies = []
+        deadline = time.perf_counter() + seconds
+
+        def till():
+            local = []
+            while time.perf_counter() < deadline:
+                cart = [(random.randint(1, products), 1) for _ in range(lines)]
+                start = time.perf_counter()
+                sales.checkout(cart)
+                local.append(time.perf_counter() - start)
+            db.release_connection()
+            latencies.extend(local)
+
+        workers = [threading.Thread(target=till) for _ in range(count)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        print(f"  {count:>2} threads: {len(latencies) / seconds:8.1f} checkouts/s | "
+              f"p50 {percentile(latencies, 0.50) * 1000:6.2f} ms | p99 {percentile(latencies, 0.99) * 1000:7.2f} ms | "
+              f"busy retries {db.busy_waits}")
+        db.close()
+        os.remove(db.db_name)
+
+
+async def http_request(reader, writer, method, path, body=None):
+    """Sends one keep-alive HTTP request and returns (status, decoded JSON body)."""
+    data = json.dumps(body).encode() if body is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(data)}\r\n\r\n".encode() + data)
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line == b"\r\n":
+            break
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":")[1])
+    return status, json.loads(await reader.readexactly(length))
+
+
+def bench_service(products=10000, clients=(1, 16, 64), seconds=3.0):
+    """Measures requests/second and tail latency against the asyncio HTTP service."""
+    from service import InventoryService
+
+    db = temp_database(load_system())
+    seed_products(db, products)
+    db.close()
+
+    async def run():
+        service = InventoryService(db.db_name, workers=4)
+        port = await service.start("127.0.0.1", 0)
+        print("HTTP service (alternating GET /products/<id> and 2-line POST /checkout)")
+        for count in clients:
+            latencies, errors = [], 0
+            deadline = time.perf_counter() + seconds
+
+            async def client():
+                nonlocal errors
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                turn = 0
+                while time.perf_counter() < deadline:
+                    start = time.perf_counter()
+                    if turn % 2:
+                        cart = [[random.randint(1, products), 1] for _ in range(2)]
+                        status, _ = await http_request(reader, writer, "POST", "/checkout", {"items": cart})
+                    else:
+                        status, _ = await http_request(reader, writer, "GET", f"/products/{random.randint(1, products)}")
+                    latencies.append(time.perf_counter() - start)
+                    errors += status >= 400
+                    turn += 1
+                writer.close()
+
+            await asyncio.gather(*(client() for _ in range(count)))
+            print(f"  {count:>3} clients: {len(latencies) / seconds:8.0f} req/s | "
+                  f"p50 {percentile(latencies, 0.50) * 1000:6.2f} ms | p99 {percentile(latencies, 0.99) * 1000:7.2f} ms | "
+                  f"errors {errors}")
+        await service.stop()
+
+    asyncio.run(run())
+    os.remove(db.db_name)
+
+
+def bench_reorder(products=1000000, low_share=0.02, top=20, updates=20000):
+    """Times the reorder watch list at catalogue scale: load, top-N queries and stock updates."""
+    system = load_system()
+    db = temp_database(system)
+    seed_products(db, products, stock=100)
+    low = int(products * low_share)
+    db.conn.execute("UPDATE products SET stock = abs(random()) % 11 WHERE id <= ?", (low,))
+    db.conn.commit()
+    seed_sales(db, low * 5, low, days=28)
+    engine = db.reorder_engine
+    inventory = system.InventoryManager(db)
+
+    print(f"Reorder engine ({products} products, {low} below reorder level)")
+    start = time.perf_counter()
+    engine.load()
+    print(f"  load watch list:      {(time.perf_counter() - start) * 1000:10.1f} ms ({len(engine)} SKUs)")
+    print(f"  top-{top} query:         {timed(engine.most_urgent, top, repeat=1000):10.4f} ms")
+    start = time.perf_counter()
+    for _ in range(updates):
+        inventory.adjust_stock(random.randint(1, low * 2), random.choice((-1, 1)))
+    print(f"  adjust_stock + rerank:{(time.perf_counter() - start) / updates * 1000:10.4f} ms per update")
+    watched = list(engine.rows)
+    start = time.perf_counter()
+    for _ in range(updates):
+        engine.update(engine.rows[random.choice(watched)])
+    print(f"  rerank only:          {(time.perf_counter() - start) / updates * 1000:10.4f} ms per update")
+    start = time.perf_counter()
+    db.conn.execute("SELECT id FROM products WHERE stock <= reorder_level").fetchall()
+    print(f"  indexed low-stock set:{(time.perf_counter() - start) * 1000:10.1f} ms")
+    start = time.perf_counter()
+    db.conn.execute("SELECT id FROM products NOT INDEXED WHERE stock <= reorder_level").fetchall()
+    print(f"  full-scan low stock:  {(time.perf_counter() - start) * 1000:10.1f} ms")
+    db.close()
+    os.remove(db.db_name)
+
+
+def bench_journal(products=10000, seconds=3.0, intervals=(0.05, 0.2, 1.0)):
+    """Compares per-sale commits with the group-committed sales journal."""
+    system = load_system()
+    print("Sales write rate (1-line carts)")
+    for interval in (None,) + intervals:
+        db = temp_database(system)
+        seed_products(db, products)
+        db.close()
+        journal = db.db_name + ".journal" if interval else None
+        db = system.Database(db.db_name, journal_path=journal, journal_interval=interval or 0.2)
+        sales = system.SalesManager(db)
+        count = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            sales.checkout([(random.randint(1, products), 1)])
+            count += 1
+        elapsed = time.perf_counter() - start
+        if journal:
+            lag = db.journal.max_lag
+            db.close()
+            label = f"journal {interval * 1000:.0f} ms"
+            window = f"worst-case loss window {lag * 1000:7.1f} ms"
+        else:
+            db.close()
+            label = "per-sale commit"
+            window = "worst-case loss window     0.0 ms"
+        print(f"  {label:<17} {count / elapsed:10.0f} sales/s | {window}")
+        os.remove(db.db_name)
+        if journal and os.path.exists(journal):
+            os.remove(journal)
+
+
+def bench_product_table(products=1000000):
+    """Compares the columnar ProductTable with per-row objects for memory and catalogue aggregates."""
+    system = load_system()
+    db = temp_database(system)
+    seed_products(db, products, stock=100)
+    print(f"Catalogue analytics ({products} products, NumPy {'on' if system.load_numpy() is not None else 'off'})")
+
+    tracemalloc.start()
+    rows = db.conn.execute("SELECT id, name, category, price, stock, reorder_level FROM products").fetchall()
+    objects = [system.Product(*row[1:]) for row in rows]
+    row_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    tracemalloc.start()
+    table = system.ProductTable.load(db)
+    table_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"  memory per product: rows + Product objects {row_bytes / products:6.1f} B | "
+          f"ProductTable {table_bytes / products:6.1f} B")
+
+    def loop_valuation():
+        return sum(product.stock * product.price for product in objects)
+
+    def loop_by_category():
+        totals = {}
+        for product in objects:
+            count, units, value = totals.get(product.category, (0, 0, 0.0))
+            totals[product.category] = (count + 1, units + product.stock, value + product.stock * product.price)
+        return totals
+
+    print(f"  valuation:     row loop {timed(loop_valuation):8.2f} ms | ProductTable {timed(table.valuation):8.2f} ms")
+    print(f"  by category:   row loop {timed(loop_by_category):8.2f} ms | ProductTable {timed(table.by_category):8.2f} ms")
+    print(f"  filter + sort: row loop "
+          f"{timed(lambda: sorted((p for p in objects if p.category == 'Food'), key=lambda p: p.price)):8.2f} ms | "
+          f"ProductTable {timed(lambda: table.filter(category='Food').sort('price')):8.2f} ms")
+    del rows, objects
+    db.close()
+    os.remove(db.db_name)
+
+
+def bench_search(products=1000000, query="premium dog kibble"):
+    """Measures per-keystroke type-ahead latency against the product search index."""
+    system = load_system()
+    db = temp_database(system)
+    brands = ["Happy", "Premium", "Royal", "Tasty", "Fluffy", "Golden", "Natural", "Wild", "Pure", "Purr"]
+    animals = ["Dog", "Cat", "Puppy", "Kitten", "Bird", "Fish", "Hamster", "Rabbit"]
+    items = ["Kibble", "Treats", "Leash", "Collar", "Shampoo", "Bed", "Toy", "Litter", "Brush", "Bowl"]
+    categories = ["Food", "Toys", "Grooming", "Bedding", "Health"]
+    start = time.perf_counter()
+    batch = []
+    for i in range(products):
+        batch.append((f"{random.choice(brands)} {random.choice(animals)} {random.choice(items)} {i}",
+                      random.choice(categories), 99.0, 50, 10))
+        if len(batch) == 50000:
+            db.conn.executemany("INSERT INTO products (name, category, price, stock, reorder_level) "
+                                "VALUES (?, ?, ?, ?, ?)", batch)
+            batch.clear()
+    db.conn.commit()
+    print(f"Type-ahead search ({products} products, {'FTS5' if db.fts_enabled else 'prefix table'}, "
+          f"indexed in {time.perf_counter() - start:.1f} s)")
+    for length in range(1, len(query) + 1):
+        typed = query[:length]
+        if typed.endswith(" "):
+            continue
+        latency = timed(db.product_search.search, typed, 1, 10, repeat=5)
+        print(f"  {typed!r:<22} {latency:8.2f} ms")
+    db.close()
+    os.remove(db.db_name)
+
+
+def bench_pricing(products=10000, rules=1000, carts=100000, lines=5):
+    """Reports carts priced per second with `rules` active discount rules, one cart at a time and batched."""
+    import pricing
+    categories = ["Food", "Toys", "Grooming", "Bedding", "Health"]
+    rule_list = [{"type": "tier", "threshold": threshold, "rate": rate}
+                 for threshold, rate in ((1000, 0.02), (2500, 0.04), (5000, 0.06), (10000, 0.08), (20000, 0.10))]
+    rule_list += [{"type": "category", "category": category, "min_quantity": quantity, "rate": quantity / 100}
+                  for category in categories for quantity in (2, 3, 5, 8, 10, 15, 20)]
+    while len(rule_list) < rules:
+        rule_list.append({"type": "product", "product_id": random.randint(1, products),
+                          "min_quantity": random.randint(1, 10), "rate": round(random.uniform(0.01, 0.3), 2)})
+
+    start = time.perf_counter()
+    engine = pricing.PricingEngine(rule_list)
+    compile_ms = (time.perf_counter() - start) * 1000
+    batch = [[(product_id, categories[product_id % len(categories)], random.randint(1, 10), 100.0)
+              for product_id in random.sample(range(1, products + 1), lines)] for _ in range(carts)]
+
+    print(f"Cart pricing ({engine.rule_count} rules compiled in {compile_ms:.1f} ms, {lines}-line carts, "
+          f"{'NumPy' if pricing.load_numpy() is not None else 'pure Python'} batch path)")
+    one_by_one = timed(lambda: [engine.price_cart(cart) for cart in batch], repeat=3)
+    print(f"  price_cart, one at a time  {carts / one_by_one * 1000:12.0f} carts/s")
+    batched = timed(engine.price_carts, batch, repeat=3)
+    print(f"  price_carts, whole batch   {carts / batched * 1000:12.0f} carts/s")
+
+    single = [engine.price_cart(cart)[2] for cart in batch[:1000]]
+    _, totals = engine.price_carts(batch[:1000])
+    print(f"  max difference between paths: {max(abs(a - b) for a, b in zip(single, totals)):.2e}")
+
+
+def bench_metrics(products=10000, lookups=200000, checkouts=2000):
+    """Measures the instrumentation overhead with metrics off and on, against a bare sqlite3 connection."""
+    system = load_system()
+    db = temp_database(system)
+    seed_products(db, products)
+    db.close()
+    ids = [random.randint(1, products) for _ in range(lookups)]
+    carts = [[(random.randint(1, products), 1) for _ in range(5)] for _ in range(checkouts)]
+
+    def lookup_all(conn):
+        for product_id in ids:
+            conn.execute("SELECT * FROM products WHERE id = ?", (product_id,)).fetchone()
+
+    def checkout_all(sales):
+        for cart in carts:
+            sales.checkout(cart)
+
+    print(f"Instrumentation overhead ({lookups} primary-key lookups, {checkouts} 5-line checkouts)")
+    bare = sqlite3.connect(db.db_name)
+    base = timed(lookup_all, bare)
+    bare.close()
+    print(f"  bare sqlite3 connection  {lookups / base * 1000:10.0f} lookups/s")
+    for label, metrics in (("metrics off", None), ("metrics on", True)):
+        db = system.Database(db.db_name, metrics=metrics)
+        lookup = timed(lookup_all, db.conn)
+        checkout = timed(checkout_all, system.SalesManager(db), repeat=1)
+        print(f"  {label:<24} {lookups / lookup * 1000:10.0f} lookups/s ({(lookup / base - 1) * 100:+5.1f}% time), "
+              f"{checkouts / checkout * 1000:8.0f} checkouts/s")
+        if db.metrics is not None:
+            stats = db.metrics.snapshot()["method"]["SalesManager.checkout"]
+            print(f"  {'':<24} checkout: {stats['count']} calls, {stats['seconds'] / stats['count'] * 1000:.3f} ms mean")
+        db.close()
+    os.remove(db.db_name)
+
+
+def suite_cases(system, db, products, sales):
+    """Returns the hot-path operations the regression suite drives, keyed by name.
+
+    Each case is a function running one operation; the interactive paths
+    (add_product, update_stock) run with their output discarded, and
+    purchase_products and view_sales are driven through checkout and the
+    page reads they are built on, so nothing waits on input().
+    """
+    inventory = system.InventoryManager(db)
+    sales_manager = system.SalesManager(db)
+
+    def add_product():
+        inventory.add_product(system.Product("Benchmark Kibble", "Food", 99.0, 100, 10))
+
+    def update_stock():
+        inventory.update_stock(random.randint(1, products), 1)
+
+    def purchase_products():
+        sales_manager.checkout([(random.randint(1, products), 1) for _ in range(3)])
+
+    def view_sales():
+        list(sales_manager.iter_sales(20, limit=20, after_id=random.randint(0, max(sales - 20, 0))))
+
+    def view_inventory():
+        list(inventory.iter_products(20, limit=20, after_id=random.randint(0, max(products - 20, 0))))
+
+    return {"add_product": add_product, "update_stock": update_stock, "purchase_products": purchase_products,
+            "view_sales": view_sales, "view_inventory": view_inventory}
+
+
+def run_case(operation, ops):
+    """Runs an operation `ops` times and returns throughput, latency percentiles and peak memory."""
+    samples = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(ops):
+            start = time.perf_counter()
+            operation()
+            samples.append(time.perf_counter() - start)
+        # Memory is traced on a shorter second run so tracemalloc does not skew the timings
+        traced, _ = peak_memory(lambda: [operation() for _ in range(min(ops, 200))])
+    return {"ops": ops, "ops_per_sec": ops / sum(samples),
+            "p50_ms": percentile(samples, 0.50) * 1000, "p95_ms": percentile(samples, 0.95) * 1000,
+            "p99_ms": percentile(samples, 0.99) * 1000, "peak_mb": traced}
+
+
+MEMORY_SLACK_MB = 0.1  # Peak memory growth below this is noise, however large in relative terms
+
+
+def find_regressions(results, baseline, threshold):
+    """Compares results with a baseline and returns a message for each case that got worse by more than threshold.
+
+    Throughput, p95 latency and peak traced memory are all checked.
+    """
+    regressions = []
+    for name, result in results.items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        if result["ops_per_sec"] < before["ops_per_sec"] * (1 - threshold):
+            regressions.append(f"{name}: throughput {before['ops_per_sec']:.0f} -> {result['ops_per_sec']:.0f} ops/s")
+        if result["p95_ms"] > before["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 latency {before['p95_ms']:.3f} -> {result['p95_ms']:.3f} ms")
+        if "peak_mb" in before and result["peak_mb"] > before["peak_mb"] * (1 + threshold) + MEMORY_SLACK_MB:
+            regressions.append(f"{name}: peak memory {before['peak_mb']:.2f} -> {result['peak_mb']:.2f} MB")
+    return regressions
+
+
+DATASET_MARKER = "benchmark_dataset"  # Table that marks a database file as seeded by this script
+
+
+def seeded_dataset(system, path, products, sales):
+    """Returns a database file holding the synthetic dataset, seeding `path` only if it does not match.
+
+    Seeding goes through the real schema and its triggers, which takes minutes
+    at 10M rows, so a dataset kept with --dataset is reused across runs.
+    Only files carrying the marker table are ever rebuilt; any other existing
+    file is left alone and the run stops with an error.
+    """
+    if path and os.path.exists(path):
+        conn = sqlite3.connect(path)
+        try:
+            marker = conn.execute(f"SELECT products, sales FROM {DATASET_MARKER}").fetchone()
+            sizes = conn.execute("SELECT (SELECT MAX(id) FROM products), (SELECT MAX(id) FROM sales)").fetchone()
+        except sqlite3.DatabaseError:
+            marker = None
+        finally:
+            conn.close()
+        if marker is None:
+            print(f"{path} was not created by this script; choose a new --dataset file instead of overwriting it.")
+            sys.exit(1)
+        if marker == sizes == (products, sales):
+            return path, False
+        for leftover in (path, path + "-wal", path + "-shm"):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+    db = system.Database(path) if path else temp_database(system)
+    # The marker goes in first, so an interrupted seed is still recognised and rebuilt next time
+    db.conn.execute(f"CREATE TABLE {DATASET_MARKER} (products INTEGER, sales INTEGER)")
+    db.conn.execute(f"INSERT INTO {DATASET_MARKER} VALUES (?, ?)", (products, sales))
+    db.conn.commit()
+    seed_products(db, products)
+    seed_sales(db, sales, products)
+    db.close()
+    return db.db_name, True
+
+
+def bench_suite(products=10000, sales=100000, ops=2000, save=None, baseline=None, threshold=0.2, dataset=None):
+    """Runs the hot-path regression suite; returns 1 if any case regressed past the baseline, else 0."""
+    system = load_system()
+    start = time.perf_counter()
+    source, seeded = seeded_dataset(system, dataset, products, sales)
+    if source == dataset:
+        # The suite writes to the database, so it runs on a copy and the kept dataset stays pristine
+        handle, path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        shutil.copyfile(dataset, path)
+    else:
+        path = source
+    db = system.Database(path)
+    print(f"Regression suite ({products} products, {sales} sales, {ops} ops per case, "
+          f"{'seeded' if seeded else 'dataset copied'} in {time.perf_counter() - start:.1f} s)")
+    print(f"  {'case':<20} {'ops/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'peak MB':>9}")
+    results = {}
+    for name, operation in suite_cases(system, db, products, sales).items():
+        result = results[name] = run_case(operation, ops)
+        print(f"  {name:<20} {result['ops_per_sec']:10.0f} {result['p50_ms']:9.3f} {result['p95_ms']:9.3f} "
+              f"{result['p99_ms']:9.3f} {result['peak_mb']:9.2f}")
+    db.close()
+    os.remove(db.db_name)
+
+    report = {"products": products, "sales": sales, "ops": ops, "python": sys.version.split()[0],
+              "created": time.strftime("%Y-%m-%d %H:%M:%S"), "results": results}
+    status = 0
+    if baseline:
+        with open(baseline, encoding="utf-8") as file:
+            previous = json.load(file)
+        if (previous["products"], previous["sales"]) != (products, sales):
+            print(f"  Note: baseline was recorded with {previous['products']} products and {previous['sales']} sales")
+        regressions = find_regressions(results, previous, threshold)
+        for message in regressions:
+            print(f"  REGRESSION {message}")
+        if regressions:
+            status = 1
+        else:
+            print(f"  No regressions past {threshold:.0%} against {baseline}")
+    if save:
+        with open(save, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        print(f"  Results saved to {save}")
+    return status
+
+
+STARTUP_PROBE = """
+import sys, time
+start = time.perf_counter()
+import furfect_supplies
+imported = time.perf_counter()
+db = furfect_supplies.Database(sys.argv[1])
+opened = time.perf_counter()
+db.product_cache.get(1)
+queried = time.perf_counter()
+db.close()
+print(imported - start, opened - imported, queried - opened)
+"""
+
+
+def run_startup_probe(path, fresh=False):
+    """Returns (import, Database(), first query) times in ms from a new interpreter.
+
+    With fresh=True any existing file at `path` is removed first so the
+    first query has to create the whole schema.
+    """
+    if fresh and os.path.exists(path):
+        os.remove(path)
+    output = subprocess.run([sys.executable, "-c", STARTUP_PROBE, path], capture_output=True, text=True,
+                            check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+    return [float(value) * 1000 for value in output.split()]
+
+
+def bench_startup(products=100000, repeat=5):
+    """Measures cold start for the library import path and the CLI, fresh vs already-migrated databases."""
+    system = load_system()
+    db = temp_database(system)
+    seed_products(db, products)
+    db.close()
+    path = db.db_name
+    fresh = path + ".fresh"
+
+    print(f"Library start-up ({products} products, best of {repeat} new interpreters, ms)")
+    print(f"  {'database':<26} {'import':>8} {'Database()':>11} {'first query':>12}")
+    for label, target, is_fresh in (("new file (full migration)", fresh, True), ("current schema", path, False)):
+        runs = [run_startup_probe(target, is_fresh) for _ in range(repeat)]
+        times = [min(values) for values in zip(*runs)]
+        print(f"  {label:<26} {times[0]:8.1f} {times[1]:11.2f} {times[2]:12.2f}")
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA user_version = 0")  # Looks like a database made before versioning
+    conn.commit()
+    conn.close()
+    times = run_startup_probe(path)
+    print(f"  {'unversioned (one upgrade)':<26} {times[0]:8.1f} {times[1]:11.2f} {times[2]:12.2f}")
+
+    # The CLI: start the program, pick Exit, and time the whole process
+    folder = tempfile.mkdtemp()
+    shutil.copyfile(path, os.path.join(folder, "inventory_system.db"))
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Furfect Supplies.py")
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, script], input="11\n", capture_output=True, text=True, check=True, cwd=folder)
+        best = min(best, time.perf_counter() - start)
+    baseline = timed(lambda: subprocess.run([sys.executable, "-c", "pass"], check=True), repeat=repeat)
+    print(f"CLI start to exit: {best * 1000:.1f} ms (bare interpreter {baseline:.1f} ms)")
+    shutil.rmtree(folder)
+    for leftover in (path, fresh):
+        if os.path.exists(leftover):
+            os.remove(leftover)
+
+
+def bench_partitions(products=1000, sizes=(100000, 1000000, 3000000), months=24, keep_months=3):
+    """Compares date-range reads and backups on one live sales table with the same history archived by month."""
+    system = load_system()
+    print(f"Monthly sales partitions ({months} months of history, last {keep_months} kept live)")
+    print(f"  {'sales':>9} {'layout':<12} {'old month':>10} {'last month':>11} {'backup':>9} {'again':>9}")
+    for size in sizes:
+        db = temp_database(system)
+        seed_products(db, products)
+        seed_sales(db, size, products, days=months * 30)
+        db.close()
+        whole = db.db_name + ".whole.db"
+        shutil.copyfile(db.db_name, whole)
+        archived = system.Database(db.db_name)
+        start = time.perf_counter()
+        archived.sales_archive.archive_before(keep_months)
+        archive_seconds = time.perf_counter() - start
+
+        now = time.time()
+        old_month = time.strftime("%Y-%m", time.localtime(now - (months - 2) * 30 * 86400))
+        old_range = system.SalesArchive.month_bounds(old_month)
+        last_month = time.strftime("%Y-%m-%d", time.localtime(now - 30 * 86400)), time.strftime("%Y-%m-%d")
+        for label, target in (("one table", system.Database(whole)), ("partitioned", archived)):
+            sales = system.SalesManager(target)
+            old = timed(lambda: sum(1 for _ in sales.iter_sales(5000, *old_range)), repeat=3)
+            recent = timed(lambda: sum(1 for _ in sales.iter_sales(5000, *last_month)), repeat=3)
+            folder = tempfile.mkdtemp()
+            first = timed(target.sales_archive.backup, folder, repeat=1)
+            again = timed(target.sales_archive.backup, folder, repeat=1)
+            print(f"  {size:>9} {label:<12} {old:8.1f}ms {recent:9.1f}ms {first:7.0f}ms {again:7.0f}ms")
+            shutil.rmtree(folder)
+            target.close()
+        print(f"  {'':>9} archiving took {archive_seconds:.1f} s; live file "
+              f"{os.path.getsize(db.db_name) / 2 ** 20:.0f} MB vs {os.path.getsize(whole) / 2 ** 20:.0f} MB")
+        shutil.rmtree(archived.sales_archive.folder)
+        for leftover in (db.db_name, whole):
+            os.remove(leftover)
+
+
+def bench_analytics(products=10000, sizes=(100000, 1000000), new_sales=1000):
+    """Compares best-seller, velocity and stock-out queries run as SQL with the cached analytics, cold and warm."""
+    system = load_system()
+    print("Sales analytics, ms (SQL = GROUP BY over sales joined to products on every call)")
+    print(f"  {'sales':>9} {'query':<12} {'SQL':>9} {'cold':>9} {'warm':>9} {'+' + str(new_sales) + ' sales':>12}")
+    for size in sizes:
+        db = temp_database(system)
+        seed_products(db, products)
+        seed_sales(db, size, products, days=90)
+        since = time.strftime("%Y-%m-%d", time.localtime(time.time() - 6 * 86400))
+        velocity_since = time.strftime("%Y-%m-%d", time.localtime(time.time() - 27 * 86400))
+        sql = {
+            "top sellers": lambda: db.conn.execute("""
+                SELECT p.id, p.name, SUM(s.quantity), SUM(s.total_price)
+                FROM sales s JOIN products p ON s.product_id = p.id
+                WHERE s.sale_date >= ?
+                GROUP BY p.id ORDER BY SUM(s.quantity) DESC LIMIT 10
+            """, (since,)).fetchall(),
+            "velocity": lambda: db.conn.execute("""
+                SELECT product_id, SUM(quantity) / 28.0 FROM sales WHERE sale_date >= ? GROUP BY product_id
+            """, (velocity_since,)).fetchall(),
+            "stock-outs": lambda: db.conn.execute("""
+                SELECT p.id, p.stock * 7.0 / SUM(s.quantity) AS days_left
+                FROM sales s JOIN products p ON s.product_id = p.id
+                WHERE s.sale_date >= date('now', 'localtime', '-7 days') AND s.sale_date < date('now', 'localtime')
+                GROUP BY p.id ORDER BY days_left LIMIT 10
+            """).fetchall(),
+        }
+        cached = {
+            "top sellers": lambda analytics: analytics.top_sellers(7, 10),
+            "velocity": lambda analytics: analytics.velocities(28),
+            "stock-outs": lambda analytics: analytics.stockouts(10, 7),
+        }
+        sales = system.SalesManager(db)
+        for name, query in cached.items():
+            raw = timed(sql[name], repeat=3)
+            analytics = db.sales_analytics = system.SalesAnalytics(db)
+            cold = timed(query, analytics, repeat=1)
+            warm = timed(query, analytics)
+            for _ in range(new_sales):
+                sales.checkout([(random.randint(1, products), 1)])
+            refreshed = timed(query, analytics, repeat=1)
+            print(f"  {size:>9} {name:<12} {raw:9.1f} {cold:9.1f} {warm:9.3f} {refreshed:12.2f}")
+        db.close()
+        os.remove(db.db_name)
+
+
+BENCHMARKS = {
+    "checkout": bench_checkout,
+    "reports": bench_reports,
+    "paging": bench_paging,
+    "cache": bench_cache,
+    "import": bench_import_export,
+    "load": bench_load,
+    "service": bench_service,
+    "reorder": bench_reorder,
+    "journal": bench_journal,
+    "table": bench_product_table,
+    "search": bench_search,
+    "pricing": bench_pricing,
+    "metrics": bench_metrics,
+    "startup": bench_startup,
+    "partitions": bench_partitions,
+    "analytics": bench_analytics,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Furfect Supplies benchmarks")
+    parser.add_argument("names", nargs="*", help=f"benchmarks to run: suite, {', '.join(BENCHMARKS)} (default: all but suite)")
+    suite = parser.add_argument_group("suite options")
+    suite.add_argument("--products", type=int, default=10000, help="synthetic catalogue size")
+    suite.add_argument("--sales", type=int, default=100000, help="synthetic sales history size")
+    suite.add_argument("--ops", type=int, default=2000, help="operations per case")
+    suite.add_argument("--dataset", metavar="FILE", help="keep the seeded database in FILE and reuse it on later runs")
+    suite.add_argument("--save", metavar="FILE", help="write the results to FILE as a JSON baseline")
+    suite.add_argument("--baseline", metavar="FILE", help="compare with a saved baseline and exit 1 on regressions")
+    suite.add_argument("--threshold", type=float, default=0.2,
+                       help="allowed slowdown or memory growth before failing (default 0.2)")
+    args = parser.parse_args()
+
+    status = 0
+    for name in args.names or list(BENCHMARKS):
+        if name == "suite":
+            status |= bench_suite(args.products, args.sales, args.ops, args.save, args.baseline, args.threshold,
+                                  args.dataset)
+        elif name in BENCHMARKS:
+            BENCHMARKS[name]()
+        else:
+            print(f"Unknown benchmark '{name}'. Choose from: suite, {', '.join(BENCHMARKS)}")
+            sys.exit(1)
+        print()
+    sys.exit(status)
@@ -0,0 +1,11 @@
+"""Importable alias for 'Furfect Supplies.py', whose file name has a space in it.
+
+Lets other modules write `from furfect_supplies import Database, SalesManager`.
+The code is loaded through SourceFileLoader so its bytecode is cached in
+__pycache__ like any other module instead of being recompiled on every import.
+"""
+import os
+from importlib.machinery import SourceFileLoader
+
+_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Furfect Supplies.py")
+exec(SourceFileLoader(__name__, _path).get_code(__name__), globals())
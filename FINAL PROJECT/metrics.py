@@ -0,0 +1,261 @@
+"""Metrics and profiling hooks for the Furfect Supplies database and managers.
+
+Switch them on with `Database(..., metrics=True)` (or pass a shared Metrics
+instance). Every SQL statement then runs on an instrumented connection and
+every public InventoryManager/SalesManager method is timed. Per-operation
+counts, latency histograms and rows touched are kept, and statements slower
+than `slow_query_ms` are logged with their EXPLAIN QUERY PLAN output.
+
+With metrics off nothing is wrapped: connections are plain sqlite3 objects
+and the managers' methods are the class methods, so there is no overhead.
+"""
+import functools
+import inspect
+import json
+import re
+import sqlite3
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+
+# Latency histogram bucket upper bounds, in seconds
+HISTOGRAM_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+@functools.lru_cache(maxsize=1024)
+def normalize_sql(sql):
+    """Collapses whitespace and IN (?, ?, ...) lists so each statement shape is one operation."""
+    sql = " ".join(sql.split())
+    return re.sub(r"\?(?:\s*,\s*\?)+", "?, ...", sql)
+
+
+class OperationStats:
+    """Count, total time, rows touched and latency histogram for one operation."""
+
+    __slots__ = ("count", "seconds", "rows", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.rows = 0
+        self.buckets = [0] * (len(HISTOGRAM_BUCKETS) + 1)  # Last bucket is +Inf
+
+    def as_dict(self):
+        """Returns the stats as a JSON-friendly dict with cumulative bucket counts."""
+        cumulative, running = {}, 0
+        for bound, count in zip(HISTOGRAM_BUCKETS + ("+Inf",), self.buckets):
+            running += count
+            cumulative[str(bound)] = running
+        return {"count": self.count, "seconds": self.seconds, "rows": self.rows, "buckets": cumulative}
+
+
+class Metrics:
+    """Collects per-operation statistics for SQL statements and manager methods."""
+
+    def __init__(self, slow_query_ms=50, slow_log_size=100):
+        self.slow_query_seconds = slow_query_ms / 1000
+        self.lock = threading.Lock()
+        self.operations = {"sql": {}, "method": {}}
+        self.slow_queries = deque(maxlen=slow_log_size)
+
+    #FOR RECORDING
+    def record(self, kind, name, seconds, rows=0, timed=True):
+        """Adds one observation; timed=False only adds time and rows (e.g. fetching more rows)."""
+        with self.lock:
+            stats = self.operations[kind].get(name)
+            if stats is None:
+                stats = self.operations[kind][name] = OperationStats()
+            stats.seconds += seconds
+            stats.rows += rows
+            if timed:
+                stats.count += 1
+                stats.buckets[bisect_left(HISTOGRAM_BUCKETS, seconds)] += 1
+
+    def record_slow(self, sql, seconds, plan):
+        """Logs a slow statement with its query plan."""
+        with self.lock:
+            self.slow_queries.append({"sql": sql, "ms": round(seconds * 1000, 3), "plan": plan,
+                                      "at": time.strftime("%Y-%m-%d %H:%M:%S")})
+
+    def reset(self):
+        """Clears every statistic and the slow query log."""
+        with self.lock:
+            self.operations = {"sql": {}, "method": {}}
+            self.slow_queries.clear()
+
+    #FOR INSTRUMENTING MANAGERS
+    def instrument(self, manager):
+        """Replaces the manager's public methods, on this instance only, with timed wrappers."""
+        prefix = type(manager).__name__
+        for name, _ in inspect.getmembers(type(manager), inspect.isfunction):
+            if not name.startswith("_"):
+                setattr(manager, name, self.timed_method(f"{prefix}.{name}", getattr(manager, name)))
+
+    def timed_method(self, name, method):
+        """Wraps a bound method; generator methods are timed until they are exhausted or closed.
+
+        Rows touched are the rows a generator yields or the length of a returned list.
+        """
+        if inspect.isgeneratorfunction(method):
+            @functools.wraps(method)
+            def generator_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                rows = 0
+                try:
+                    for row in method(*args, **kwargs):
+                        rows += 1
+                        yield row
+                finally:
+                    self.record("method", name, time.perf_counter() - start, rows)
+            return generator_wrapper
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            result = None
+            try:
+                result = method(*args, **kwargs)
+                return result
+            finally:
+                self.record("method", name, time.perf_counter() - start, len(result) if type(result) is list else 0)
+        return wrapper
+
+    #FOR DUMPING
+    def snapshot(self):
+        """Returns every statistic and the slow query log as a dict."""
+        with self.lock:
+            snapshot = {kind: {name: stats.as_dict() for name, stats in table.items()}
+                        for kind, table in self.operations.items()}
+            snapshot["slow_queries"] = list(self.slow_queries)
+        return snapshot
+
+    def to_json(self):
+        """Returns the statistics as a JSON document."""
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self):
+        """Returns the statistics in the Prometheus text exposition format."""
+        lines = []
+        snapshot = self.snapshot()
+        for kind in ("sql", "method"):
+            metric = f"furfect_{kind}_duration_seconds"
+            lines.append(f"# HELP {metric} Latency of {'SQL statements' if kind == 'sql' else 'manager methods'}.")
+            lines.append(f"# TYPE {metric} histogram")
+            for name, stats in snapshot[kind].items():
+                label = name.replace("\\", "\\\\").replace('"', '\\"')
+                for bound, count in stats["buckets"].items():
+                    lines.append(f'{metric}_bucket{{{kind}="{label}",le="{bound}"}} {count}')
+                lines.append(f'{metric}_sum{{{kind}="{label}"}} {stats["seconds"]}')
+                lines.append(f'{metric}_count{{{kind}="{label}"}} {stats["count"]}')
+            rows = f"furfect_{kind}_rows_total"
+            lines.append(f"# HELP {rows} Rows touched by {'SQL statements' if kind == 'sql' else 'manager methods'}.")
+            lines.append(f"# TYPE {rows} counter")
+            for name, stats in snapshot[kind].items():
+                label = name.replace("\\", "\\\\").replace('"', '\\"')
+                lines.append(f'{rows}{{{kind}="{label}"}} {stats["rows"]}')
+        lines.append("# HELP furfect_slow_queries Slow statements currently in the slow query log.")
+        lines.append("# TYPE furfect_slow_queries gauge")
+        lines.append(f"furfect_slow_queries {len(snapshot['slow_queries'])}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        """Writes the statistics to a file: Prometheus text for .prom/.txt, JSON otherwise."""
+        text = self.to_prometheus() if path.endswith((".prom", ".txt")) else self.to_json()
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(text)
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that times every statement and counts the rows it touches."""
+
+    operation = None
+
+    def execute(self, sql, parameters=()):
+        self.operation = normalize_sql(sql)
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self.finish(sql, parameters, time.perf_counter() - start)
+
+    def executemany(self, sql, seq_of_parameters):
+        self.operation = normalize_sql(sql)
+        seq_of_parameters = list(seq_of_parameters)
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self.finish(sql, seq_of_parameters[0] if seq_of_parameters else (), time.perf_counter() - start)
+
+    def finish(self, sql, parameters, seconds):
+        """Records a statement and, if it was slow, its query plan."""
+        metrics = self.connection.metrics
+        metrics.record("sql", self.operation, seconds, max(self.rowcount, 0))
+        if seconds >= metrics.slow_query_seconds:
+            metrics.record_slow(self.operation, seconds, self.connection.explain(sql, parameters))
+
+    def fetched(self, rows, seconds):
+        """Adds rows read after execute (and the time spent stepping) to the statement."""
+        if self.operation is not None:
+            self.connection.metrics.record("sql", self.operation, seconds, rows, timed=False)
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self.fetched(row is not None, time.perf_counter() - start)
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self.fetched(len(rows), time.perf_counter() - start)
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self.fetched(len(rows), time.perf_counter() - start)
+        return rows
+
+    def __next__(self):
+        start = time.perf_counter()
+        row = super().__next__()
+        self.fetched(1, time.perf_counter() - start)
+        return row
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose cursors (including conn.execute's) are InstrumentedCursors.
+
+    Database sets `metrics` on each connection right after opening it.
+    """
+
+    metrics = None
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    # The C shortcuts make a plain cursor, so route them through cursor() explicitly
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def commit(self):
+        start = time.perf_counter()
+        try:
+            super().commit()
+        finally:
+            self.metrics.record("sql", "COMMIT", time.perf_counter() - start)
+
+    def explain(self, sql, parameters):
+        """Returns the EXPLAIN QUERY PLAN lines for a statement, or an empty list if it has none."""
+        if not sql.lstrip().upper().startswith(("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "REPLACE")):
+            return []
+        try:
+            plan = sqlite3.Cursor(self).execute("EXPLAIN QUERY PLAN " + sql, parameters).fetchall()
+        except sqlite3.Error:
+            return []
+        return [detail for _, _, _, detail in plan]
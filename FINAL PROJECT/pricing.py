@@ -0,0 +1,257 @@
+"""Rule-based pricing and discounts for Furfect Supplies checkouts.
+
+Rules are plain dicts (or a JSON list of them in a file):
+
+    {"type": "tier", "threshold": 5000, "rate": 0.10}
+        carts whose subtotal is above `threshold` get `rate` off the whole cart
+    {"type": "category", "category": "Food", "min_quantity": 10, "rate": 0.05}
+        lines of at least `min_quantity` units in `category` get `rate` off
+    {"type": "product", "product_id": 3, "min_quantity": 1, "rate": 0.20}
+        lines of at least `min_quantity` units of one product get `rate` off
+
+A line gets the better of its product and category rates (they do not
+stack), and the cart tier is then applied to the discounted subtotal with
+calculate_discount from Laboratory Activity 2.
+"""
+import importlib.util
+import json
+import os
+from bisect import bisect_right
+
+numpy = False  # Not imported yet; see load_numpy
+
+
+def load_numpy():
+    """Imports NumPy on first use and returns it, or None if it is not installed.
+
+    NumPy is optional (price_columns falls back to a per-line loop) and slow to
+    import, so checkouts that never price a batch do not pay for it.
+    """
+    global numpy
+    if numpy is False:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+    return numpy
+
+
+def load_lab2():
+    """Loads lab2_item2.py, whose folder name is not importable."""
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "Laboratory Activity 2 - 25-09-24", "lab2_item2.py")
+    spec = importlib.util.spec_from_file_location("lab2_item2", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+lab2_item2 = load_lab2()
+calculate_discount = lab2_item2.calculate_discount
+
+QUANTITY_SCALE = 2 ** 32  # Packs (rule key, min_quantity) into one sortable int64
+
+
+def compile_table(pairs):
+    """Compiles (threshold, rate) pairs into a sorted threshold list and rate list.
+
+    rates[i] applies from thresholds[i - 1] up, and rates[0] below the first
+    threshold. Rates are made non-decreasing so crossing a threshold never
+    costs the customer a discount they already had.
+    """
+    best = {}
+    for threshold, rate in pairs:
+        best[threshold] = max(rate, best.get(threshold, 0.0))
+    thresholds, rates = [], [0.0]
+    for threshold in sorted(best):
+        thresholds.append(threshold)
+        rates.append(max(rates[-1], best[threshold]))
+    return thresholds, rates
+
+
+def validate_rule(rule):
+    """Returns (type, key, threshold, rate) for a rule dict, or raises ValueError."""
+    kind = rule.get("type")
+    rate = float(rule["rate"])
+    if not 0 <= rate <= 1:
+        raise ValueError(f"Discount rate must be between 0 and 1, got {rate}.")
+    if kind == "tier":
+        return kind, None, float(rule["threshold"]), rate
+    if kind == "category":
+        key = str(rule["category"])
+    elif kind == "product":
+        key = int(rule["product_id"])
+    else:
+        raise ValueError(f"Unknown pricing rule type {kind!r}.")
+    min_quantity = int(rule.get("min_quantity", 1))
+    if min_quantity < 1:
+        raise ValueError(f"min_quantity must be at least 1, got {min_quantity}.")
+    return kind, key, min_quantity, rate
+
+
+class PricingEngine:
+    """Prices carts against tiered, per-category and per-product discount rules.
+
+    The rules are compiled once into sorted threshold tables: a cart tier
+    table searched with calculate_discount, and one (min_quantity, rate)
+    table per category and per product searched with bisect. With NumPy the
+    per-key tables are also flattened into single arrays so that whole
+    batches of carts are priced with searchsorted instead of a Python loop.
+    """
+
+    def __init__(self, rules=()):
+        tiers, grouped = [], {"category": {}, "product": {}}
+        for rule in rules:
+            kind, key, threshold, rate = validate_rule(rule)
+            if kind == "tier":
+                tiers.append((threshold, rate))
+            else:
+                grouped[kind].setdefault(key, []).append((threshold, rate))
+        self.rule_count = len(tiers) + sum(len(pairs) for table in grouped.values() for pairs in table.values())
+
+        # The tier table takes the place of the single 5000 threshold in calculate_discount
+        self.tier_thresholds, self.tier_rates = compile_table(tiers)
+        self.category_rules = {key: compile_table(pairs) for key, pairs in grouped["category"].items()}
+        self.product_rules = {key: compile_table(pairs) for key, pairs in grouped["product"].items()}
+        self.batch_ready = False  # The NumPy tables for price_columns are built on first use
+
+    def build_batch_tables(self):
+        """Flattens the per-key tables into the NumPy arrays price_columns searches."""
+        numpy = load_numpy()
+        self.category_codes = {key: code for code, key in enumerate(self.category_rules)}
+        self.product_keys = numpy.array(sorted(self.product_rules), dtype=numpy.int64)
+        self.category_table = self.flatten(list(self.category_rules.values()))
+        self.product_table = self.flatten([self.product_rules[key] for key in self.product_keys.tolist()])
+        self.batch_ready = True
+
+    @classmethod
+    def from_file(cls, path):
+        """Builds an engine from a JSON file holding a list of rule dicts."""
+        with open(path, encoding="utf-8") as file:
+            return cls(json.load(file))
+
+    @classmethod
+    def from_lab2(cls):
+        """Builds an engine with the cart tiers defined in Laboratory Activity 2."""
+        thresholds = [0] + list(lab2_item2.DISCOUNT_THRESHOLDS)
+        return cls({"type": "tier", "threshold": threshold, "rate": rate}
+                   for threshold, rate in zip(thresholds, lab2_item2.DISCOUNT_RATES))
+
+    @staticmethod
+    def flatten(tables):
+        """Packs per-key threshold tables into (sorted keys, rates) arrays for searchsorted.
+
+        Each entry's key is code * QUANTITY_SCALE + min_quantity, so one
+        search finds the highest threshold at or below a line's quantity,
+        and checking the code afterwards tells whether that key has a rule.
+        """
+        numpy = load_numpy()
+        keys, rates = [], []
+        for code, (thresholds, table_rates) in enumerate(tables):
+            for threshold, rate in zip(thresholds, table_rates[1:]):
+                keys.append(code * QUANTITY_SCALE + threshold)
+                rates.append(rate)
+        return numpy.array(keys, dtype=numpy.int64), numpy.array(rates, dtype=numpy.float64)
+
+    #FOR LOOKING UP A SINGLE LINE
+    @staticmethod
+    def quantity_rate(table, quantity):
+        """Returns the rate a (thresholds, rates) table gives for a quantity."""
+        if table is None:
+            return 0.0
+        thresholds, rates = table
+        return rates[bisect_right(thresholds, quantity)]
+
+    def line_rate(self, product_id, category, quantity):
+        """Returns the discount rate for one cart line."""
+        return max(self.quantity_rate(self.product_rules.get(product_id), quantity),
+                   self.quantity_rate(self.category_rules.get(category), quantity))
+
+    #FOR PRICING ONE CART
+    def price_cart(self, lines):
+        """Prices one cart of (product_id, category, quantity, unit_price) lines.
+
+        Returns (subtotal, line_totals, total): the undiscounted subtotal,
+        each line's net total with the cart discount spread over it pro rata,
+        and the amount to pay.
+        """
+        line_totals = [quantity * unit_price * (1 - self.line_rate(product_id, category, quantity))
+                       for product_id, category, quantity, unit_price in lines]
+        subtotal = sum(quantity * unit_price for _, _, quantity, unit_price in lines)
+        net = sum(line_totals)
+        _, total = calculate_discount(net, self.tier_thresholds, self.tier_rates)
+        if net:
+            scale = total / net
+            line_totals = [line_total * scale for line_total in line_totals]
+        return subtotal, line_totals, total
+
+    #FOR PRICING MANY CARTS AT ONCE
+    def price_carts(self, carts):
+        """Prices a batch of carts, each a list of (product_id, category, quantity, unit_price) lines.
+
+        Returns (subtotals, totals), one entry per cart.
+        """
+        cart_index, product_ids, categories, quantities, unit_prices = [], [], [], [], []
+        for index, lines in enumerate(carts):
+            for product_id, category, quantity, unit_price in lines:
+                cart_index.append(index)
+                product_ids.append(product_id)
+                categories.append(category)
+                quantities.append(quantity)
+                unit_prices.append(unit_price)
+        return self.price_columns(cart_index, product_ids, categories, quantities, unit_prices, len(carts))
+
+    def price_columns(self, cart_index, product_ids, categories, quantities, unit_prices, cart_count=None):
+        """Prices carts given as parallel columns, one entry per line.
+
+        `cart_index` says which cart (0 to cart_count - 1) each line belongs
+        to. Returns (subtotals, totals) as NumPy arrays when NumPy is
+        installed, otherwise as lists.
+        """
+        numpy = load_numpy()
+        if cart_count is None:
+            cart_count = max(cart_index, default=-1) + 1
+        if numpy is None:
+            subtotals, nets = [0.0] * cart_count, [0.0] * cart_count
+            for index, product_id, category, quantity, unit_price in zip(cart_index, product_ids, categories,
+                                                                         quantities, unit_prices):
+                amount = quantity * unit_price
+                subtotals[index] += amount
+                nets[index] += amount * (1 - self.line_rate(product_id, category, quantity))
+            return subtotals, [calculate_discount(net, self.tier_thresholds, self.tier_rates)[1] for net in nets]
+        if not self.batch_ready:
+            self.build_batch_tables()
+
+        cart_index = numpy.asarray(cart_index, dtype=numpy.int64)
+        quantities = numpy.asarray(quantities, dtype=numpy.int64)
+        amounts = quantities * numpy.asarray(unit_prices, dtype=numpy.float64)
+        capped = numpy.minimum(quantities, QUANTITY_SCALE - 1)
+
+        product_ids = numpy.asarray(product_ids, dtype=numpy.int64)
+        product_codes = numpy.searchsorted(self.product_keys, product_ids)
+        known = product_codes < len(self.product_keys)
+        known[known] = self.product_keys[product_codes[known]] == product_ids[known]
+        rates = self.lookup(self.product_table, numpy.where(known, product_codes, -1), capped)
+
+        category_codes = numpy.fromiter((self.category_codes.get(category, -1) for category in categories),
+                                        dtype=numpy.int64, count=len(amounts))
+        rates = numpy.maximum(rates, self.lookup(self.category_table, category_codes, capped))
+
+        subtotals = numpy.bincount(cart_index, weights=amounts, minlength=cart_count)
+        nets = numpy.bincount(cart_index, weights=amounts * (1 - rates), minlength=cart_count)
+        # Same bisect_left search calculate_discount does, over every cart at once
+        tier_rates = numpy.asarray(self.tier_rates)[numpy.searchsorted(self.tier_thresholds, nets, side="left")]
+        return subtotals, nets * (1 - tier_rates)
+
+    @staticmethod
+    def lookup(table, codes, quantities):
+        """Returns the rate for each (code, quantity) pair in a flattened table; code -1 means no rule."""
+        numpy = load_numpy()
+        keys, rates = table
+        if not len(keys):
+            return numpy.zeros(len(codes))
+        packed = codes * QUANTITY_SCALE + quantities
+        positions = numpy.searchsorted(keys, packed, side="right") - 1
+        found = (codes >= 0) & (positions >= 0)
+        found[found] = keys[positions[found]] // QUANTITY_SCALE == codes[found]
+        return numpy.where(found, rates[numpy.maximum(positions, 0)], 0.0)
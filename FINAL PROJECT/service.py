@@ -0,0 +1,279 @@
+"""Asyncio HTTP/JSON front-end for the Furfect Supplies inventory and sales managers.
+
+Run it with `python service.py --port 8080`. Endpoints:
+
+    GET    /products                     list products (category, low_stock, after, limit)
+    POST   /products                     add a product
+    GET    /products/<id>                fetch one product
+    POST   /products/<id>/stock          add to a product's stock ({"quantity": n})
+    DELETE /products/<id>                remove a product
+    POST   /checkout                     check out a cart ({"items": [[product_id, quantity], ...]})
+    GET    /sales                        list sales (start, end, after, limit)
+    GET    /reports/<product|category|date>  revenue reports (start, end)
+    GET    /analytics/top                best sellers (days, by=quantity|revenue, limit)
+    GET    /analytics/stockouts          soonest expected stock-outs (window, limit)
+    GET    /analytics/forecast/<id>      moving-average demand forecast (horizon, window, days)
+    POST   /batch                        run several requests in one round trip
+                                         ({"requests": [{"method": ..., "path": ..., "body": ...}]})
+    GET    /metrics                      Prometheus text, or JSON with ?format=json (needs --metrics)
+
+Blocking SQLite work runs on a bounded thread pool backed by a pooled
+Database. Once max_pending requests are in flight, new ones are answered
+with 503 straight away so clients can back off; so are requests that find
+the database locked or no pooled connection free. Unexpected errors are
+answered with 500 rather than dropping the connection.
+"""
+import argparse
+import asyncio
+import json
+import queue
+import sqlite3
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from furfect_supplies import (PRODUCT_FIELDS, SALE_FIELDS, CheckoutError, Database, InventoryManager,
+                              Product, SalesManager, is_busy_error, validate_product)
+from pricing import PricingEngine
+
+PRODUCT_KEYS = ("id",) + PRODUCT_FIELDS
+MAX_PAGE = 1000
+
+
+class HTTPError(Exception):
+    """Raised by a route to answer with an error status."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class InventoryService:
+    """Serves the inventory and sales managers over HTTP/JSON."""
+
+    def __init__(self, db_name="inventory_system.db", workers=4, max_pending=256, pricing=None, metrics=None):
+        # One pooled connection per worker thread
+        self.db = Database(db_name, pool_size=workers, metrics=metrics)
+        self.inventory = InventoryManager(self.db)
+        self.sales = SalesManager(self.db, pricing)
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.max_pending = max_pending
+        self.pending = 0
+        self.server = None
+        self.clients = {}  # Open connections: handler task -> stream writer
+
+    #FOR ROUTING REQUESTS (runs on a worker thread)
+    def dispatch(self, method, target, body):
+        """Runs one request and returns (status, payload)."""
+        try:
+            return self.route(method, target, body)
+        except HTTPError as error:
+            return error.status, {"error": str(error)}
+        except CheckoutError as error:
+            return 409, {"error": str(error)}
+        except (KeyError, TypeError, ValueError, OverflowError) as error:
+            return 400, {"error": f"Invalid request: {error}"}
+        except sqlite3.OperationalError as error:
+            if is_busy_error(error):
+                return 503, {"error": "Database busy, try again later."}
+            traceback.print_exc()
+            return 500, {"error": f"Database error: {error}"}
+        except queue.Empty:
+            # Every pooled connection stayed in use past the acquire timeout
+            return 503, {"error": "Server busy, try again later."}
+        except Exception as error:
+            # Anything unexpected still gets a response, so the keep-alive connection survives
+            traceback.print_exc()
+            return 500, {"error": f"Internal error: {error}"}
+
+    def route(self, method, target, body):
+        """Maps a method and path onto the managers."""
+        url = urlsplit(target)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        parts = [part for part in url.path.split("/") if part]
+        limit = min(int(query.get("limit", 100)), MAX_PAGE)
+
+        if parts == ["products"] and method == "GET":
+            rows = self.inventory.iter_products(limit, query.get("category"), query.get("low_stock") == "1",
+                                               limit, int(query.get("after", 0)))
+            return 200, {"products": [dict(zip(PRODUCT_KEYS, row)) for row in rows]}
+        if parts == ["products"] and method == "POST":
+            product_id = self.inventory.create_product(Product(*validate_product(body)))
+            return 201, {"id": product_id}
+        if len(parts) >= 2 and parts[0] == "products":
+            product_id = int(parts[1])
+            if len(parts) == 2 and method == "GET":
+                row = self.db.product_cache.get(product_id)
+                if row is None:
+                    raise HTTPError(404, "Invalid product ID.")
+                return 200, dict(zip(PRODUCT_KEYS, row))
+            if len(parts) == 2 and method == "DELETE":
+                if not self.inventory.delete_product(product_id):
+                    raise HTTPError(404, "Invalid product ID.")
+                return 200, {"deleted": product_id}
+            if parts[2:] == ["stock"] and method == "POST":
+                row = self.inventory.adjust_stock(product_id, int(body["quantity"]))
+                if row is None:
+                    raise HTTPError(404, "Invalid product ID.")
+                return 200, dict(zip(PRODUCT_KEYS, row))
+        if parts == ["checkout"] and method == "POST":
+            lines, total_price = self.sales.checkout([(int(product_id), int(quantity))
+                                                      for product_id, quantity in body["items"]])
+            return 200, {"lines": [dict(zip(("product_id", "name", "quantity", "price"), line)) for line in lines],
+                         "total_price": total_price}
+        if parts == ["sales"] and method == "GET":
+            rows = self.sales.iter_sales(limit, query.get("start"), query.get("end"), limit,
+                                         int(query.get("after", 0)))
+            return 200, {"sales": [dict(zip(SALE_FIELDS, row)) for row in rows]}
+        if len(parts) == 2 and parts[0] == "reports" and method == "GET":
+            reports = {"product": (self.sales.revenue_by_product, ("product_id", "name", "quantity", "revenue")),
+                       "category": (self.sales.revenue_by_category, ("category", "quantity", "revenue")),
+                       "date": (self.sales.revenue_by_date, ("day", "quantity", "revenue"))}
+            if parts[1] not in reports:
+                raise HTTPError(404, "Unknown report.")
+            report, keys = reports[parts[1]]
+            return 200, {"rows": [dict(zip(keys, row)) for row in report(query.get("start"), query.get("end"))]}
+        if len(parts) >= 2 and parts[0] == "analytics" and method == "GET":
+            analytics = self.db.sales_analytics
+            window = int(query.get("window", 7))
+            if parts[1:] == ["top"]:
+                rows = analytics.top_sellers(int(query.get("days", 7)), limit, query.get("by", "quantity"))
+                return 200, {"rows": [dict(zip(("product_id", "name", "quantity", "revenue"), row)) for row in rows]}
+            if parts[1:] == ["stockouts"]:
+                rows = analytics.stockouts(limit, window)
+                return 200, {"rows": [dict(zip(PRODUCT_KEYS, row), days_left=days_left, stockout_date=day)
+                                      for row, days_left, day in rows]}
+            if len(parts) == 3 and parts[1] == "forecast":
+                product_id = int(parts[2])
+                forecast = analytics.forecast(product_id, int(query.get("horizon", 14)), window)
+                return 200, {"product_id": product_id,
+                             "velocity": analytics.velocity(product_id, int(query.get("days", 28))),
+                             "stockout_date": analytics.stockout_date(product_id, window),
+                             "forecast": [{"day": day, "quantity": units} for day, units in forecast]}
+            raise HTTPError(404, "Unknown analytics query.")
+        if parts == ["metrics"] and method == "GET":
+            if self.db.metrics is None:
+                raise HTTPError(404, "Metrics are not enabled; start the service with --metrics.")
+            if query.get("format") == "json":
+                return 200, self.db.metrics.snapshot()
+            return 200, self.db.metrics.to_prometheus()
+        if parts == ["batch"] and method == "POST":
+            # Every sub-request runs on this worker, so a batch costs a single executor hop
+            results = []
+            for request in body["requests"]:
+                status, payload = self.dispatch(request["method"].upper(), request["path"], request.get("body", {}))
+                results.append({"status": status, "body": payload})
+            return 200, {"responses": results}
+        raise HTTPError(404, "Not found.")
+
+    #FOR HANDLING CONNECTIONS
+    async def respond(self, method, target, raw_body):
+        """Applies backpressure and hands the request to the worker pool."""
+        if self.pending >= self.max_pending:
+            return 503, {"error": "Server busy, try again later."}
+        try:
+            body = json.loads(raw_body) if raw_body else {}
+        except ValueError:
+            return 400, {"error": "Request body is not valid JSON."}
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, self.dispatch, method, target, body)
+        finally:
+            self.pending -= 1
+
+    async def send(self, writer, status, payload, keep_alive):
+        """Writes one response; routes answer with JSON, apart from plain-text bodies such as Prometheus metrics."""
+        if isinstance(payload, str):
+            data, content_type = payload.encode(), "text/plain; version=0.0.4"
+        else:
+            data, content_type = json.dumps(payload).encode(), "application/json"
+        extra = "Retry-After: 1\r\n" if status == 503 else ""
+        writer.write((f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+                      f"Content-Type: {content_type}\r\n"
+                      f"Content-Length: {len(data)}\r\n{extra}"
+                      f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode() + data)
+        await writer.drain()
+
+    async def handle_client(self, reader, writer):
+        """Serves HTTP/1.1 requests on one keep-alive connection."""
+        task = asyncio.current_task()
+        self.clients[task] = writer
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                    length = int(headers.get("content-length", 0))
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    # The body can't be framed, so answer and drop the connection
+                    await self.send(writer, 400, {"error": "Malformed request line or Content-Length."}, False)
+                    break
+                raw_body = await reader.readexactly(length) if length else b""
+
+                status, payload = await self.respond(method.upper(), target, raw_body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await self.send(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            self.clients.pop(task, None)
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=8080):
+        """Starts listening and returns the port actually bound."""
+        self.server = await asyncio.start_server(self.handle_client, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """Stops listening and releases the worker pool and database."""
+        if self.server is not None:
+            self.server.close()
+            # Close idle keep-alive connections so their handlers finish cleanly
+            for writer in self.clients.values():
+                writer.close()
+            await asyncio.gather(*self.clients, return_exceptions=True)
+            await self.server.wait_closed()
+        self.executor.shutdown()
+        self.db.close()
+
+
+async def serve(args):
+    """Runs the service until interrupted."""
+    pricing = PricingEngine.from_file(args.pricing) if args.pricing else None
+    service = InventoryService(args.db, args.workers, args.max_pending, pricing, args.metrics or None)
+    port = await service.start(args.host, args.port)
+    print(f"Furfect Supplies service listening on http://{args.host}:{port}")
+    try:
+        await service.server.serve_forever()
+    finally:
+        await service.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Furfect Supplies HTTP/JSON service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--db", default="inventory_system.db")
+    parser.add_argument("--workers", type=int, default=4, help="worker threads (and pooled connections)")
+    parser.add_argument("--max-pending", type=int, default=256, help="requests in flight before answering 503")
+    parser.add_argument("--pricing", help="JSON file of discount rules (see pricing.py)")
+    parser.add_argument("--metrics", action="store_true", help="time every query and operation, served at /metrics")
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,119 @@
+"""Benchmarks for the Laboratory Activity 3 items.
+
+Run a single benchmark by name, e.g. `python lab3_benchmarks.py roman`.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+import lab3_item1
+import lab3_item2
+
+
+def timed(function, *args, repeat=3):
+    """Returns the best wall-clock time in seconds over `repeat` calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def roman_to_integer_loop(roman):
+    """The original per-character loop, kept as the baseline."""
+    roman_values = {
+        'I': 1, 'V': 5, 'X': 10, 'L': 50,
+        'C': 100, 'D': 500, 'M': 1000
+    }
+    roman = roman.upper()
+    total = 0
+    prev_value = 0
+    for char in reversed(roman):
+        if char not in roman_values:
+            return None
+        current_value = roman_values[char]
+        if current_value < prev_value:
+            total -= current_value
+        else:
+            total += current_value
+        prev_value = current_value
+    return total
+
+
+def bench_roman(count=1000000, file_lines=5000000):
+    """Reports Roman numeral conversions/second for the loop, the lookup tables and file streaming."""
+    numbers = [random.randint(1, lab3_item1.MAX_ROMAN) for _ in range(count)]
+    numerals = [lab3_item1.ROMAN_NUMERALS[number] for number in numbers]
+
+    print(f"Roman numeral conversion ({count} values)")
+    seconds = timed(lambda: [roman_to_integer_loop(numeral) for numeral in numerals])
+    print(f"  decode, per-character loop   {count / seconds:12.0f} /s")
+    seconds = timed(lambda: [lab3_item1.roman_to_integer(numeral) for numeral in numerals])
+    print(f"  decode, lookup table         {count / seconds:12.0f} /s")
+    seconds = timed(lambda: [lab3_item1.integer_to_roman(number) for number in numbers])
+    print(f"  encode, lookup table         {count / seconds:12.0f} /s")
+
+    handle, source = tempfile.mkstemp(suffix=".txt")
+    with os.fdopen(handle, "w") as file:
+        for index in range(file_lines):
+            value = numerals[index % count] if index % 2 else str(numbers[index % count])
+            file.write(value + "\n")
+    target = source + ".out"
+    print(f"File streaming ({file_lines} lines, {os.path.getsize(source) / 2 ** 20:.0f} MB)")
+    for processes in (0, 2, 4):
+        seconds = timed(lab3_item1.convert_file, source, target, processes, repeat=1)
+        label = "single process" if processes == 0 else f"{processes} processes"
+        print(f"  {label:<28} {file_lines / seconds:12.0f} lines/s")
+    os.remove(source)
+    os.remove(target)
+
+
+def is_perfect_number_loop(n):
+    """The original trial division over range(1, n), kept as the baseline."""
+    if n < 1:
+        return False
+    return sum(i for i in range(1, n) if n % i == 0) == n
+
+
+def bench_perfect(scan=20000, large=(33550336, 8589869056), limit=10000000):
+    """Compares the original perfect-number check with the square-root check and the segmented sieve."""
+    print(f"Perfect numbers, scanning 1..{scan}")
+    seconds = timed(lambda: [n for n in range(1, scan + 1) if is_perfect_number_loop(n)], repeat=1)
+    print(f"  original trial division      {seconds * 1000:10.1f} ms")
+    seconds = timed(lambda: [n for n in range(1, scan + 1) if lab3_item2.is_perfect_number(n)])
+    print(f"  square-root divisor sum      {seconds * 1000:10.1f} ms")
+    seconds = timed(lab3_item2.classify_numbers, scan)
+    print(f"  sieve                        {seconds * 1000:10.1f} ms")
+
+    print("Single queries")
+    for n in large:
+        seconds = timed(lab3_item2.is_perfect_number, n)
+        print(f"  is_perfect_number({n}) {seconds * 1000:10.2f} ms")
+
+    print(f"Classifying 1..{limit} ({'NumPy' if lab3_item2.numpy is not None else 'pure Python'} sieve, "
+          f"{lab3_item2.SEGMENT_SIZE}-number segments)")
+    for processes in (0, 2, 4):
+        seconds = timed(lab3_item2.classify_numbers, limit, processes, repeat=1)
+        label = "single process" if processes == 0 else f"{processes} processes"
+        print(f"  {label:<28} {limit / seconds:12.0f} numbers/s")
+    summary = lab3_item2.classify_numbers(limit)
+    print(f"  perfect {summary['perfect']}, abundant {summary['abundant']}, deficient {summary['deficient']}")
+
+
+BENCHMARKS = {
+    "roman": bench_roman,
+    "perfect": bench_perfect,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark '{name}'. Choose from: {', '.join(BENCHMARKS)}")
+            continue
+        BENCHMARKS[name]()
+        print()
@@ -1,37 +1,157 @@
+import sys
+from itertools import islice
+from multiprocessing import Pool
+
+ROMAN_SYMBOLS = [
+    (1000, 'M'), (900, 'CM'), (500, 'D'), (400, 'CD'),
+    (100, 'C'), (90, 'XC'), (50, 'L'), (40, 'XL'),
+    (10, 'X'), (9, 'IX'), (5, 'V'), (4, 'IV'), (1, 'I')
+]
+MAX_ROMAN = 3999
+
+
+def build_roman_numerals():
+    """
+    Build the canonical numeral for every integer from 1 to 3999.
+    Index 0 holds an empty string so that ROMAN_NUMERALS[n] is the numeral for n.
+    """
+    numerals = [""]
+    for number in range(1, MAX_ROMAN + 1):
+        numeral = []
+        for value, symbol in ROMAN_SYMBOLS:
+            count, number = divmod(number, value)
+            numeral.append(symbol * count)
+        numerals.append("".join(numeral))
+    return numerals
+
+
+# Lookup tables built once: integer -> numeral, and numeral -> integer.
+# Only canonical numerals are keys, so "IIII", "VX" or "IC" are rejected.
+ROMAN_NUMERALS = build_roman_numerals()
+ROMAN_VALUES = {numeral: number for number, numeral in enumerate(ROMAN_NUMERALS) if numeral}
+
+
 def roman_to_integer(roman):
-    roman_values = {
-        'I': 1, 'V': 5, 'X': 10, 'L': 50,
-        'C': 100, 'D': 500, 'M': 1000
-    }
-
-    roman = roman.upper()
-    total = 0
-    prev_value = 0
-
-    for char in reversed(roman):
-        if char not in roman_values:
-            return None  
-        
-        current_value = roman_values[char]
-       
-        if current_value < prev_value:
-            total -= current_value
+    """
+    Convert a Roman numeral to an integer.
+    Returns None if the numeral is not a valid canonical numeral from I to MMMCMXCIX.
+    """
+    return ROMAN_VALUES.get(roman.upper())
+
+
+def integer_to_roman(number):
+    """
+    Convert an integer from 1 to 3999 to its Roman numeral.
+    Returns None if the number is out of range.
+    """
+    if 1 <= number <= MAX_ROMAN:
+        return ROMAN_NUMERALS[number]
+    return None
+
+
+def is_valid_roman(roman):
+    """Check if a string is a valid canonical Roman numeral."""
+    return roman.upper() in ROMAN_VALUES
+
+
+def convert_value(text):
+    """
+    Convert one value in either direction: digits are encoded to a numeral,
+    anything else is decoded to an integer. Returns None if the value is invalid.
+    """
+    text = text.strip()
+    if text.isascii() and text.isdigit():
+        # Anything over four digits is out of range; checking first also avoids
+        # int()'s ValueError on digit strings longer than 4300 characters
+        digits = text.lstrip("0")
+        return integer_to_roman(int(digits or "0")) if len(digits) <= 4 else None
+    return roman_to_integer(text)
+
+
+def convert_lines(lines):
+    """Convert each line and return a list of results (None for invalid lines)."""
+    return [convert_value(line) for line in lines]
+
+
+def iter_chunks(lines, size):
+    """Yield lists of up to `size` lines without reading the whole input."""
+    lines = iter(lines)
+    while True:
+        chunk = list(islice(lines, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def convert_stream(lines, chunk_size=10000):
+    """
+    Convert an iterable of lines (such as an open file) one chunk at a time,
+    yielding (line, result) pairs in input order.
+    """
+    for chunk in iter_chunks(lines, chunk_size):
+        yield from zip(chunk, convert_lines(chunk))
+
+
+def format_block(text):
+    """
+    Convert a block of newline-separated values and return the output lines as one string.
+    Workers take and return whole blocks so only two strings cross the process boundary per chunk.
+    """
+    output = []
+    # Split on "\n" only: splitlines() also breaks on \f, \v, \x85, \u2028 and
+    # friends, which would put the output rows out of step with the input lines.
+    lines = text.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    for line in lines:
+        line = line.removesuffix("\r")
+        result = convert_value(line)
+        output.append(f"{line.strip()}\t{'invalid' if result is None else result}\n")
+    return "".join(output)
+
+
+def convert_file(input_path, output_path, processes=0, chunk_size=10000):
+    """
+    Convert a file with one numeral or integer per line, writing each value
+    and its result (or "invalid") to output_path as tab-separated lines.
+    With processes > 1 the chunks are converted by a multiprocessing pool,
+    which only pays off for very large inputs.
+    Returns the number of lines converted.
+    """
+    count = 0
+    with open(input_path, encoding="utf-8") as source, open(output_path, "w", encoding="utf-8") as target:
+        blocks = ("".join(chunk) for chunk in iter_chunks(source, chunk_size))
+        if processes > 1:
+            with Pool(processes) as pool:
+                while True:
+                    # A few chunks per process at a time keeps memory bounded on huge files
+                    window = list(islice(blocks, processes * 4))
+                    if not window:
+                        break
+                    for block in pool.imap(format_block, window):
+                        target.write(block)
+                        count += block.count("\n")
         else:
-            total += current_value
-        
-        prev_value = current_value
+            for block in map(format_block, blocks):
+                target.write(block)
+                count += block.count("\n")
+    return count
 
-    return total
 
 def main():
     roman = input("Enter a Roman numeral: ")
-    
+
     result = roman_to_integer(roman)
-    
+
     if result is None:
         print("Invalid Roman numeral entered.")
     else:
         print(f"The integer value of '{roman.upper()}' is: {result}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if len(sys.argv) >= 3:
+        # python lab3_item1.py input.txt output.txt [processes]
+        processes = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+        print(f"Converted {convert_file(sys.argv[1], sys.argv[2], processes)} lines.")
+    else:
+        main()
@@ -1,19 +1,117 @@
+from concurrent.futures import ProcessPoolExecutor
+from math import isqrt
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional; the sieve falls back to plain lists
+    numpy = None
+
+SEGMENT_SIZE = 1 << 20
+
+
+def divisor_sum(n):
+    """
+    Return the sum of the proper divisors of n (all divisors except n itself).
+    Divisors come in pairs (i, n // i), so only i up to the square root of n is tried.
+    """
+    if n < 2:
+        return 0
+    total = 1
+    for i in range(2, isqrt(n) + 1):
+        if n % i == 0:
+            pair = n // i
+            total += i if pair == i else i + pair
+    return total
+
+
 def is_perfect_number(n):
     """
     Check if a number is a perfect number.
     A perfect number is a number that is equal to the sum of its proper divisors (excluding itself).
     """
     if n < 1:
-        return False  
-    
-    divisors_sum = sum(i for i in range(1, n) if n % i == 0)
-    
-    return divisors_sum == n
+        return False
+
+    return divisor_sum(n) == n
+
+
+def divisor_sums(start, stop):
+    """
+    Return the proper divisor sums of every number in [start, stop) using a sieve.
+    Each divisor d up to the square root of stop is added, together with its pair m // d,
+    to the multiples m of d from d * d up, so only this segment is held in memory.
+    Returns a NumPy int64 array when NumPy is installed, otherwise a list.
+    """
+    start = max(start, 1)
+    if stop <= start:
+        return numpy.zeros(0, dtype=numpy.int64) if numpy is not None else []
+    if numpy is not None:
+        sums = numpy.zeros(stop - start, dtype=numpy.int64)
+        for d in range(1, isqrt(stop - 1) + 1):
+            first = max(d * d, -(-start // d) * d)
+            if first >= stop:
+                continue
+            # Pairs: first // d, first // d + 1, ... for the multiples first, first + d, ...
+            pairs = numpy.arange(first // d, (stop - 1) // d + 1, dtype=numpy.int64)
+            sums[first - start::d] += d + pairs
+            if first == d * d:
+                sums[first - start] -= d  # d * d has d as its own pair
+        # Every number got itself as the pair of 1; proper divisors leave it out
+        sums -= numpy.arange(start, stop, dtype=numpy.int64)
+        return sums
+    sums = [0] * (stop - start)
+    for d in range(1, isqrt(stop - 1) + 1):
+        first = max(d * d, -(-start // d) * d)
+        for m in range(first, stop, d):
+            sums[m - start] += d + m // d
+        if first == d * d and first < stop:
+            sums[first - start] -= d
+    return [total - n for n, total in enumerate(sums, start)]
+
+
+def classify_segment(bounds):
+    """
+    Classify every number in [start, stop) as perfect, abundant or deficient.
+    Returns (perfect numbers, abundant count, deficient count).
+    """
+    start, stop = bounds
+    start = max(start, 1)
+    sums = divisor_sums(start, stop)
+    if numpy is not None:
+        numbers = numpy.arange(start, stop, dtype=numpy.int64)
+        perfect = (numbers[sums == numbers]).tolist()
+        abundant = int(numpy.count_nonzero(sums > numbers))
+    else:
+        perfect = [n for n, total in enumerate(sums, start) if total == n]
+        abundant = sum(1 for n, total in enumerate(sums, start) if total > n)
+    return perfect, abundant, (stop - start) - len(perfect) - abundant
+
+
+def classify_numbers(limit, processes=0, segment_size=SEGMENT_SIZE):
+    """
+    Classify every number from 1 to limit, one segment at a time.
+    With processes > 1 the segments are spread over a process pool.
+    Returns a dict with the list of perfect numbers and the abundant and deficient counts.
+    """
+    segments = [(start, min(start + segment_size, limit + 1)) for start in range(1, limit + 1, segment_size)]
+    if processes > 1:
+        with ProcessPoolExecutor(processes) as pool:
+            results = list(pool.map(classify_segment, segments))
+    else:
+        results = map(classify_segment, segments)
+
+    summary = {"perfect": [], "abundant": 0, "deficient": 0}
+    for perfect, abundant, deficient in results:
+        summary["perfect"].extend(perfect)
+        summary["abundant"] += abundant
+        summary["deficient"] += deficient
+    return summary
+
 
 def main():
     try:
         num = int(input("Enter a number: "))
-        
+
         if is_perfect_number(num):
             print(f"{num} is a perfect number.")
         else:
@@ -22,4 +120,4 @@ def main():
         print("Please enter a valid integer.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
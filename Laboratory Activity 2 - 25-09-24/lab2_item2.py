@@ -1,8 +1,12 @@
-def calculate_discount(purchase_amount):
-    if purchase_amount > 5000:
-        discount = 0.10
-    else:
-        discount = 0.05
+from bisect import bisect_left
+
+# Discount tiers as a sorted threshold table: amounts above DISCOUNT_THRESHOLDS[i]
+# get DISCOUNT_RATES[i + 1], and amounts up to the first threshold get DISCOUNT_RATES[0]
+DISCOUNT_THRESHOLDS = [5000]
+DISCOUNT_RATES = [0.05, 0.10]
+
+def calculate_discount(purchase_amount, thresholds=DISCOUNT_THRESHOLDS, rates=DISCOUNT_RATES):
+    discount = rates[bisect_left(thresholds, purchase_amount)]
     discount_amount = purchase_amount * discount
     final_amount = purchase_amount - discount_amount
     return discount_amount, final_amount
@@ -1,7 +1,45 @@
+from dataclasses import dataclass
+
+FIELDS = ("name", "gender", "age")
+GENDERS = ("M", "F")
+MAX_AGE = 2 ** 31 - 1  # The registry's age index stores ages as array("i")
+
+
+def check_age(value):
+    """Returns value as an int age, raising ValueError unless it is a whole number from 0 to MAX_AGE."""
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError(f"age must be a whole number, got {value!r}")
+    age = int(value)
+    if age < 0:
+        raise ValueError("age cannot be negative")
+    if age > MAX_AGE:
+        raise ValueError(f"age cannot be more than {MAX_AGE}")
+    return age
+
+
+@dataclass
 class Capybara:
-   
-    def __init__(self, name: str, gender: str, age: int):
+    """One capybara record. __slots__ drops the per-instance __dict__, so each record stays small."""
+
+    __slots__ = FIELDS
+
+    name: str
+    gender: str
+    age: int
+
+    @classmethod
+    def from_record(cls, record):
+        """Builds a Capybara from a dict with name, gender and age, raising ValueError if it is invalid."""
+        missing = [field for field in FIELDS if record.get(field) in (None, "")]
+        if missing:
+            raise ValueError(f"missing {', '.join(missing)}")
+        name = str(record["name"]).strip()
+        gender = str(record["gender"]).strip().upper()
+        age = check_age(record["age"])
+        if gender not in GENDERS:
+            raise ValueError(f"gender must be one of {', '.join(GENDERS)}, got {gender!r}")
+        return cls(name, gender, age)
 
-        self.name = name
-        self.gender = gender
-        self.age = age
\ No newline at end of file
+    def to_record(self):
+        """Returns the capybara as a dict for saving."""
+        return {"name": self.name, "gender": self.gender, "age": self.age}
@@ -0,0 +1,200 @@
+import csv
+import json
+from array import array
+from bisect import bisect_left, bisect_right
+
+from Capybara import FIELDS, Capybara, check_age
+
+
+def read_records(path):
+    """
+    Yield (line number, record) pairs from a CSV or JSONL file, one at a time.
+    CSV records are dicts; JSONL records are the raw line, decoded by the caller
+    so that a malformed line is reported like any other invalid row.
+    """
+    with open(path, newline="", encoding="utf-8") as file:
+        if path.lower().endswith(".jsonl"):
+            for line_number, line in enumerate(file, 1):
+                if line.strip():
+                    yield line_number, line
+        else:
+            reader = csv.DictReader(file)
+            for record in reader:
+                yield reader.line_num, record
+
+
+class CapybaraRegistry:
+    """
+    Holds many Capybara records with indexes for fast lookups.
+
+    Each record's ID is its position in `records`; removed records leave a
+    None behind so IDs never change. Names are indexed in a dict (one ID,
+    or a list of IDs for a shared name), and ages in two parallel arrays
+    sorted by age, so an age range is two bisects and a slice.
+    """
+
+    def __init__(self, capybaras=()):
+        self.records = []
+        self.names = {}  # name -> ID, or list of IDs when several capybaras share it
+        self.ages = array("i")  # Ages in sorted order...
+        self.age_ids = array("I")  # ...and the record ID for each
+        self.age_index_ready = True
+        self.removed = 0
+        self.extend(capybaras)
+
+    def __len__(self):
+        return len(self.records) - self.removed
+
+    def __iter__(self):
+        return (capybara for capybara in self.records if capybara is not None)
+
+    def __getitem__(self, record_id):
+        """Return the capybara with this ID, raising IndexError if there is none."""
+        capybara = self.records[record_id] if record_id >= 0 else None
+        if capybara is None:
+            raise IndexError(f"No capybara with ID {record_id}.")
+        return capybara
+
+    #FOR ADDING AND REMOVING
+    def add(self, capybara):
+        """Add one capybara and return its ID, raising ValueError (and adding nothing) if its age is invalid."""
+        check_age(capybara.age)
+        record_id = len(self.records)
+        self.records.append(capybara)
+        self.index_name(capybara.name, record_id)
+        if self.age_index_ready:
+            position = bisect_right(self.ages, capybara.age)
+            self.ages.insert(position, capybara.age)
+            self.age_ids.insert(position, record_id)
+        return record_id
+
+    def extend(self, capybaras):
+        """
+        Add many capybaras at once and return how many were added.
+        The age index is rebuilt with one sort on the next range query instead of one insert per record.
+        """
+        start, ready = len(self.records), self.age_index_ready
+        # Cleared up front so an error part-way through cannot leave added records out of a "ready" index
+        self.age_index_ready = False
+        for capybara in capybaras:
+            check_age(capybara.age)
+            record_id = len(self.records)
+            self.records.append(capybara)
+            self.index_name(capybara.name, record_id)
+        if len(self.records) == start:
+            self.age_index_ready = ready
+        return len(self.records) - start
+
+    def remove(self, record_id):
+        """Remove the capybara with this ID and return it."""
+        capybara = self[record_id]
+        self.records[record_id] = None
+        self.removed += 1
+        ids = self.names[capybara.name]
+        if isinstance(ids, list):
+            ids.remove(record_id)
+            if len(ids) == 1:
+                self.names[capybara.name] = ids[0]
+        else:
+            del self.names[capybara.name]
+        if self.age_index_ready:
+            start = bisect_left(self.ages, capybara.age)
+            position = self.age_ids.index(record_id, start, bisect_right(self.ages, capybara.age))
+            del self.ages[position]
+            del self.age_ids[position]
+        return capybara
+
+    def index_name(self, name, record_id):
+        """Add a record ID under its name."""
+        ids = self.names.get(name)
+        if ids is None:
+            self.names[name] = record_id
+        elif isinstance(ids, list):
+            ids.append(record_id)
+        else:
+            self.names[name] = [ids, record_id]
+
+    def build_age_index(self):
+        """Sort every record ID by age (ties in ID order) into the age arrays."""
+        ids = sorted((record_id for record_id, capybara in enumerate(self.records) if capybara is not None),
+                     key=lambda record_id: self.records[record_id].age)
+        self.age_ids = array("I", ids)
+        self.ages = array("i", (self.records[record_id].age for record_id in ids))
+        self.age_index_ready = True
+
+    #FOR QUERYING
+    def find_by_name(self, name):
+        """Return a list of the capybaras with exactly this name."""
+        ids = self.names.get(name)
+        if ids is None:
+            return []
+        if isinstance(ids, list):
+            return [self.records[record_id] for record_id in ids]
+        return [self.records[ids]]
+
+    def age_bounds(self, min_age=None, max_age=None):
+        """Return the slice of the age index holding ages from min_age to max_age (inclusive)."""
+        if not self.age_index_ready:
+            self.build_age_index()
+        start = 0 if min_age is None else bisect_left(self.ages, min_age)
+        stop = len(self.ages) if max_age is None else bisect_right(self.ages, max_age)
+        return start, max(start, stop)
+
+    def age_range(self, min_age=None, max_age=None):
+        """Yield the capybaras aged min_age to max_age (inclusive), youngest first."""
+        start, stop = self.age_bounds(min_age, max_age)
+        records = self.records
+        for record_id in self.age_ids[start:stop]:
+            yield records[record_id]
+
+    def count_age_range(self, min_age=None, max_age=None):
+        """Return how many capybaras are aged min_age to max_age (inclusive)."""
+        start, stop = self.age_bounds(min_age, max_age)
+        return stop - start
+
+    #FOR LOADING AND SAVING
+    def load(self, path):
+        """
+        Stream capybaras from a CSV or JSONL file into the registry.
+        Returns (number loaded, list of (line number, message) for invalid rows).
+        """
+        errors = []
+
+        def valid_records():
+            for line_number, record in read_records(path):
+                try:
+                    if isinstance(record, str):
+                        record = json.loads(record)
+                        if not isinstance(record, dict):
+                            raise ValueError("record is not an object")
+                    yield Capybara.from_record(record)
+                except (TypeError, ValueError, OverflowError) as error:
+                    errors.append((line_number, str(error)))
+
+        return self.extend(valid_records()), errors
+
+    @classmethod
+    def from_file(cls, path):
+        """Build a registry from a CSV or JSONL file, raising ValueError on the first invalid row."""
+        registry = cls()
+        _, errors = registry.load(path)
+        if errors:
+            line_number, message = errors[0]
+            raise ValueError(f"{path}, line {line_number}: {message}")
+        return registry
+
+    def save(self, path):
+        """Write every capybara to a CSV or JSONL file, one record at a time. Returns the number written."""
+        count = 0
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            if path.lower().endswith(".jsonl"):
+                for capybara in self:
+                    file.write(json.dumps(capybara.to_record()) + "\n")
+                    count += 1
+            else:
+                writer = csv.writer(file)
+                writer.writerow(FIELDS)
+                for capybara in self:
+                    writer.writerow((capybara.name, capybara.gender, capybara.age))
+                    count += 1
+        return count
@@ -0,0 +1,121 @@
+"""Benchmarks for the Capybara record store.
+
+Run a single benchmark by name, e.g. `python capybara_benchmarks.py memory`.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from Capybara import Capybara
+from CapybaraRegistry import CapybaraRegistry
+
+NAMES = ["Biscoff", "Mochi", "Churro", "Pebble", "Nugget", "Latte", "Waffle", "Tofu"]
+
+
+class PlainCapybara:
+    """The original attribute class (one __dict__ per instance), kept as the baseline."""
+
+    def __init__(self, name, gender, age):
+        self.name = name
+        self.gender = gender
+        self.age = age
+
+
+def timed(function, *args, repeat=3):
+    """Returns the best wall-clock time in seconds over `repeat` calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def make_records(count):
+    """Returns (name, gender, age) tuples with unique names, e.g. "Mochi 1234"."""
+    return [(f"{random.choice(NAMES)} {i}", random.choice("MF"), random.randint(0, 15)) for i in range(count)]
+
+
+def traced_bytes(function):
+    """Returns what `function` returns and the bytes it left allocated."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = function()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def bench_memory(count=500000):
+    """Reports bytes per record for the plain class, the slotted dataclass and the indexed registry."""
+    records = make_records(count)
+    print(f"Memory per record ({count} records, names and ages shared with the input)")
+    _, plain = traced_bytes(lambda: [PlainCapybara(*record) for record in records])
+    print(f"  plain class in a list          {plain / count:8.1f} bytes")
+    capybaras, slotted = traced_bytes(lambda: [Capybara(*record) for record in records])
+    print(f"  slotted dataclass in a list    {slotted / count:8.1f} bytes")
+    registry, indexed = traced_bytes(lambda: CapybaraRegistry(capybaras))
+    _, age_index = traced_bytes(registry.build_age_index)
+    print(f"  registry indexes               {(indexed + age_index) / count:8.1f} bytes "
+          f"(name {indexed / count:.1f}, age {age_index / count:.1f})")
+
+
+def bench_lookups(count=500000, queries=200000):
+    """Compares name lookups and age range queries against scanning a list."""
+    capybaras = [Capybara(*record) for record in make_records(count)]
+    registry = CapybaraRegistry(capybaras)
+    names = [capybaras[random.randrange(count)].name for _ in range(queries)]
+    print(f"Lookups ({count} records)")
+
+    scans = names[:20]
+    seconds = timed(lambda: [[c for c in capybaras if c.name == name] for name in scans], repeat=1)
+    print(f"  name, list scan                {len(scans) / seconds:12.0f} /s")
+    seconds = timed(lambda: [registry.find_by_name(name) for name in names])
+    print(f"  name, hash index               {queries / seconds:12.0f} /s")
+
+    ranges = [(age, age + 1) for age in (random.randint(0, 14) for _ in range(1000))]
+    seconds = timed(lambda: [sum(1 for c in capybaras if low <= c.age <= high) for low, high in ranges[:20]], repeat=1)
+    print(f"  age range count, list scan     {20 / seconds:12.0f} /s")
+    registry.build_age_index()
+    seconds = timed(lambda: [registry.count_age_range(low, high) for low, high in ranges])
+    print(f"  age range count, sorted index  {len(ranges) / seconds:12.0f} /s")
+    seconds = timed(lambda: [sum(1 for _ in registry.age_range(low, low)) for low, _ in ranges[:20]])
+    print(f"  age range rows, sorted index   {20 * count / 16 / seconds:12.0f} rows/s")
+
+    seconds = timed(lambda: [registry.add(Capybara(f"New {i}", "F", i % 16)) for i in range(10000)], repeat=1)
+    print(f"  add with age index kept sorted {10000 / seconds:12.0f} /s")
+
+
+def bench_files(count=500000):
+    """Reports streaming save and bulk load throughput for CSV and JSONL."""
+    registry = CapybaraRegistry(Capybara(*record) for record in make_records(count))
+    print(f"Bulk load and save ({count} records)")
+    for suffix in (".csv", ".jsonl"):
+        handle, path = tempfile.mkstemp(suffix=suffix)
+        os.close(handle)
+        seconds = timed(registry.save, path, repeat=1)
+        print(f"  save {suffix:<6}                   {count / seconds:12.0f} records/s")
+        seconds = timed(lambda: CapybaraRegistry.from_file(path), repeat=1)
+        print(f"  load {suffix:<6}                   {count / seconds:12.0f} records/s "
+              f"({os.path.getsize(path) / 2 ** 20:.0f} MB)")
+        os.remove(path)
+
+
+BENCHMARKS = {
+    "memory": bench_memory,
+    "lookups": bench_lookups,
+    "files": bench_files,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark '{name}'. Choose from: {', '.join(BENCHMARKS)}")
+            continue
+        BENCHMARKS[name]()
+        print()
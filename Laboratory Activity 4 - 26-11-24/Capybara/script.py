@@ -1,20 +1,31 @@
-from Capybara import Capybara
+import sys
 
-def main():
-    capybara1 = Capybara("Biscoff", "M", 5)
+from Capybara import Capybara
+from CapybaraRegistry import CapybaraRegistry
 
-    capybara_list = [capybara1]
+def main(path=None):
+    if path:
+        # python script.py capybaras.csv (or .jsonl) loads the test cases from a file
+        registry = CapybaraRegistry()
+        loaded, errors = registry.load(path)
+        print(f"Loaded {loaded} capybara(s) from '{path}'.")
+        for line_number, message in errors[:5]:
+            print(f"Line {line_number}: {message}")
+    else:
+        registry = CapybaraRegistry([Capybara("Biscoff", "M", 5)])
 
     try:
         test_case_number = int(input("Enter the test case number: "))
-        if test_case_number == 1:
-            selected_capybara = capybara_list[0]
+        if 1 <= test_case_number <= len(registry.records):
+            selected_capybara = registry[test_case_number - 1]
             print(f"Test Case {test_case_number}: Name: {selected_capybara.name}, "
                   f"Gender: {selected_capybara.gender}, Age: {selected_capybara.age} years old")
-        else:
+        elif len(registry.records) == 1:
             print("Invalid test case number. Please select 1.")
+        else:
+            print(f"Invalid test case number. Please select 1 to {len(registry.records)}.")
     except ValueError:
         print("Invalid input. Please enter a valid integer.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,137 @@
+"""Benchmarks for lab4_item2's array ingestion modes.
+
+Run a single benchmark by name, e.g. `python lab4_benchmarks.py ingest`.
+Each mode runs in a fresh interpreter so its peak RSS is measured on its own
+(VmHWM from /proc, which unlike ru_maxrss does not inherit the parent's peak).
+"""
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import lab4_item2
+
+FOLDER = os.path.dirname(os.path.abspath(__file__))
+
+PROBE = """
+import contextlib, io, json, random, sys, time
+sys.path.insert(0, {folder!r})
+import lab4_item2
+
+def peak_rss_mb():
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+
+mode, path, count = sys.argv[1], sys.argv[2], int(sys.argv[3])
+result = {{}}
+indexes = [random.randrange(count) for _ in range(100000)] if mode == "mmap" else []
+start = time.perf_counter()
+if mode == "input":
+    with open(path) as sys.stdin, contextlib.redirect_stdout(io.StringIO()):
+        lab4_item2.main()
+elif mode == "text":
+    with open(path) as file:
+        values = lab4_item2.read_values(file)[0]
+elif mode == "convert":
+    lab4_item2.convert_file(path, path + ".bin")
+elif mode == "mmap":
+    values = lab4_item2.map_values(path)
+    result["open_ms"] = (time.perf_counter() - start) * 1000
+    result["open_rss_mb"] = peak_rss_mb()
+    lookup_start = time.perf_counter()
+    for index in indexes:
+        values[index]
+    result["lookups_per_second"] = len(indexes) / (time.perf_counter() - lookup_start)
+result["seconds"] = time.perf_counter() - start
+result["rss_mb"] = peak_rss_mb()
+print(json.dumps(result))
+"""
+
+
+def run_probe(mode, path, count):
+    """Runs one ingestion mode in a new interpreter and returns its measurements."""
+    output = subprocess.run([sys.executable, "-c", PROBE.format(folder=FOLDER), mode, path, str(count)],
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+
+def write_numbers(path, count, header=False, block=1000000):
+    """Writes `count` random numbers one per line, repeating a block of `block` to keep generation fast."""
+    lines = [f"{random.uniform(-1e6, 1e6):.4f}\n" for _ in range(min(block, count))]
+    numbers = "".join(lines)
+    with open(path, "w", encoding="utf-8") as file:
+        if header:
+            file.write(f"{count}\n")
+        for _ in range(count // block):
+            file.write(numbers)
+        file.write("".join(lines[:count % block]))
+        if header:
+            file.write("0\n")
+
+
+def bench_ingest(count=10 ** 8, baseline=10 ** 6):
+    """Reports ingest rate and peak RSS for input() per element, chunked text parsing and memory-mapping."""
+    folder = tempfile.mkdtemp()
+    print("Array ingestion (rate, peak RSS of a fresh interpreter)")
+
+    path = os.path.join(folder, "baseline.txt")
+    write_numbers(path, baseline, header=True)
+    result = run_probe("input", path, baseline)
+    print(f"  input() per element, list   {baseline:>11} {baseline / result['seconds']:12.0f} /s "
+          f"{result['rss_mb']:8.0f} MB")
+    os.remove(path)
+
+    path = os.path.join(folder, "numbers.txt")
+    write_numbers(path, count)
+    print(f"  ({os.path.getsize(path) / 2 ** 30:.1f} GB text file)")
+    result = run_probe("text", path, count)
+    print(f"  chunked text -> array('d')  {count:>11} {count / result['seconds']:12.0f} /s "
+          f"{result['rss_mb']:8.0f} MB")
+    result = run_probe("convert", path, count)
+    print(f"  text -> binary file         {count:>11} {count / result['seconds']:12.0f} /s "
+          f"{result['rss_mb']:8.0f} MB")
+    os.remove(path)
+
+    result = run_probe("mmap", path + ".bin", count)
+    print(f"  memory-mapped binary        {count:>11} {'opened in':>9} {result['open_ms']:.2f} ms "
+          f"{result['open_rss_mb']:8.0f} MB")
+    print(f"    100000 random lookups     {'':>11} {result['lookups_per_second']:12.0f} /s "
+          f"{result['rss_mb']:8.0f} MB")
+    os.remove(path + ".bin")
+    os.rmdir(folder)
+
+
+def bench_slices(count=10 ** 7, width=10 ** 6, repeat=100):
+    """Compares copying a range out of a list with a zero-copy memoryview slice."""
+    values = lab4_item2.array("d", range(count))
+    as_list = values.tolist()
+    print(f"Range slices ({width} of {count} elements)")
+    start = time.perf_counter()
+    for _ in range(repeat):
+        as_list[count // 2:count // 2 + width]
+    print(f"  list slice (copy)            {(time.perf_counter() - start) / repeat * 1e6:10.1f} us")
+    start = time.perf_counter()
+    for _ in range(repeat):
+        lab4_item2.element_range(values, count // 2, count // 2 + width)
+    print(f"  memoryview slice (no copy)   {(time.perf_counter() - start) / repeat * 1e6:10.1f} us")
+
+
+BENCHMARKS = {
+    "ingest": bench_ingest,
+    "slices": bench_slices,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark '{name}'. Choose from: {', '.join(BENCHMARKS)}")
+            continue
+        BENCHMARKS[name]()
+        print()
@@ -1,3 +1,151 @@
+import mmap
+import sys
+from array import array
+
+CHUNK_SIZE = 1 << 20  # Characters of text read at a time
+
+
+def iter_tokens(stream, chunk_size=CHUNK_SIZE):
+    """
+    Yield lists of whitespace-separated tokens from a text stream, reading chunk_size characters at a time.
+    A number cut in half at the end of a chunk is carried over to the next one.
+    """
+    carry = ""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        tokens = (carry + chunk).split()
+        carry = "" if chunk[-1].isspace() or not tokens else tokens.pop()
+        yield tokens
+    if carry:
+        yield [carry]
+
+
+def read_values(stream, count=None, chunk_size=CHUNK_SIZE):
+    """
+    Read numbers from a text stream into a typed array('d') (8 bytes per element)
+    in large chunks, instead of one input() call per element.
+    With count set, stops after that many numbers.
+    Returns (values, rest), where rest is the list of tokens after the last number read.
+    Raises ValueError if a token is not a number or count is negative.
+    """
+    if count is not None and count < 0:
+        raise ValueError("count must not be negative")
+    values = array("d")
+    blocks = iter_tokens(stream, chunk_size)
+    rest = []
+    for tokens in blocks:
+        if count is not None and len(values) + len(tokens) >= count:
+            take = count - len(values)
+            values.extend(map(float, tokens[:take]))
+            rest = tokens[take:]
+            for more in blocks:
+                rest.extend(more)
+            break
+        values.extend(map(float, tokens))
+    return values, rest
+
+
+def convert_file(text_path, binary_path, chunk_size=CHUNK_SIZE):
+    """
+    Convert a text file of numbers into a binary file of doubles that map_values can memory-map.
+    Only one chunk is held in memory at a time. Returns the number of values written.
+    """
+    count = 0
+    with open(text_path, encoding="utf-8") as source, open(binary_path, "wb") as target:
+        for tokens in iter_tokens(source, chunk_size):
+            block = array("d", map(float, tokens))
+            block.tofile(target)
+            count += len(block)
+    return count
+
+
+def map_values(path):
+    """
+    Memory-map a binary file of doubles without reading it.
+    Returns a read-only memoryview of the numbers; the OS only reads the pages that are touched.
+    """
+    with open(path, "rb") as file:
+        file.seek(0, 2)
+        size = file.tell()
+        if size % 8:
+            raise ValueError(f"{path} is not a whole number of 8-byte doubles.")
+        if size == 0:
+            return memoryview(array("d"))
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(mapped).cast("d")
+
+
+def element_range(values, start, stop):
+    """
+    Return values[start:stop] as a memoryview over the same memory, without copying.
+    Raises IndexError if the range is not inside the array, like a single bad index.
+    """
+    view = memoryview(values)
+    if not 0 <= start <= stop <= len(view):
+        raise IndexError(f"Range {start}:{stop} is outside an array of {len(view)} elements.")
+    return view[start:stop]
+
+
+def print_selection(values, text):
+    """Print the element at an index ("5", "-1") or every element in a range ("10:20")."""
+    try:
+        if ":" in text:
+            start, stop = (int(part) for part in text.split(":"))
+            for index, value in enumerate(element_range(values, start, stop), start):
+                print(f"Element at index {index}: {value:.2f}")
+        else:
+            index = int(text)
+            print(f"Element at index {index}: {values[index]:.2f}")
+    except IndexError:
+        print(f"Index {text.strip()} is invalid.")
+    except ValueError:
+        print("Invalid input. Please enter numeric values.")
+
+
+def bulk_main(args):
+    """
+    python lab4_item2.py --stdin                      size, elements and index from stdin, read in one pass
+    python lab4_item2.py --file numbers.txt [index]   whitespace-separated numbers from a text file
+    python lab4_item2.py --mmap numbers.bin [index]   binary doubles, memory-mapped
+    python lab4_item2.py --convert numbers.txt numbers.bin
+    An index can also be a range such as 10:20.
+    """
+    mode = args[0]
+    if len(args) < {"--file": 2, "--mmap": 2, "--convert": 3}.get(mode, 1):
+        print(f"Missing file name for {mode}.")
+        print(bulk_main.__doc__)
+        return
+    try:
+        if mode == "--stdin":
+            size = int(sys.stdin.readline())
+            if size < 0:
+                raise ValueError("size must not be negative")
+            values, rest = read_values(sys.stdin, size)
+            if len(values) < size or not rest:
+                raise ValueError("not enough input")
+            print_selection(values, rest[0])
+            return
+        if mode == "--convert":
+            print(f"Converted {convert_file(args[1], args[2])} values.")
+            return
+        if mode == "--file":
+            with open(args[1], encoding="utf-8") as file:
+                values = memoryview(read_values(file)[0])
+        elif mode == "--mmap":
+            values = map_values(args[1])
+        else:
+            print(bulk_main.__doc__)
+            return
+        print(f"Loaded {len(values)} elements.")
+        print_selection(values, args[2] if len(args) > 2 else input("Enter the index of the element to print: "))
+    except ValueError:
+        print("Invalid input. Please enter numeric values.")
+    except OSError as error:
+        print(f"Could not open the file: {error}")
+
+
 def main():
     try:
         size = int(input("Enter the size of the array: "))
@@ -10,11 +158,14 @@ def main():
         index = int(input("Enter the index of the element to print: "))
 
         print(f"Element at index {index}: {arr[index]:.2f}")
-    
+
     except IndexError:
         print(f"Index {index} is invalid.")
     except ValueError:
         print("Invalid input. Please enter numeric values.")
 
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1:
+        bulk_main(sys.argv[1:])
+    else:
+        main()